@@ -0,0 +1,135 @@
+"""
+Microbenchmark: FixtureClassifier vs. the previous per-call fixture checks.
+
+Classifies a synthetic, in-memory tree of file paths (100k by default) the
+way a walk does, pruning directories and then checking each file, and
+verifies that both implementations reach identical decisions.
+
+Usage:
+    python benchmarks/bench_fixtures.py [--files 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enforcer.fixtures import FixtureClassifier  # noqa: E402
+
+CONFIG = {
+    "check_fixtures": False,
+    "custom_fixture_patterns": {
+        "directories": ["golden", "snapshots"],
+        "files": ["recorded"],
+    },
+}
+
+
+def legacy_is_fixture_directory(config, dirname, parent_path):
+    """The pre-classifier implementation, kept here as the reference."""
+    if config.get("check_fixtures", False):
+        return False
+    fixture_patterns = {
+        "testdata",
+        "test_fixtures",
+        "fixtures",
+        "__fixtures__",
+        "mocks",
+        "TestData",
+        "Fixtures",
+        "Resources",
+    }
+    for pattern in config.get("custom_fixture_patterns", {}).get("directories", []):
+        fixture_patterns.add(pattern)
+    dirname_lower = dirname.lower()
+    if dirname_lower in {p.lower() for p in fixture_patterns}:
+        return True
+    parent_path_lower = parent_path.lower()
+    is_in_test_dir = any(
+        marker in parent_path_lower
+        for marker in ["test", "tests", "spec", "specs", "__test__", "__tests__"]
+    )
+    if is_in_test_dir:
+        if any(
+            pattern in dirname_lower
+            for pattern in ["fixture", "testdata", "mock", "stub", "data"]
+        ):
+            return True
+    return False
+
+
+def legacy_is_fixture_file(config, file_path):
+    if config.get("check_fixtures", False):
+        return False
+    file_name = os.path.basename(file_path).lower()
+    dir_path = os.path.dirname(file_path)
+    if legacy_is_fixture_directory(
+        config, os.path.basename(dir_path), os.path.dirname(dir_path)
+    ):
+        return True
+    patterns = ["fixture", "mock", "stub", "testdata", "__fixtures__"]
+    patterns += ["sample", "example", "demo"]
+    patterns.extend(config.get("custom_fixture_patterns", {}).get("files", []))
+    if any(m in file_name for m in ["test_", "_test", ".test.", ".spec.", "_spec"]):
+        return False
+    return any(pattern in file_name for pattern in patterns)
+
+
+def synthetic_paths(total_files):
+    dir_names = ["src", "tests", "lib", "spec", "app"]
+    sub_names = ["core", "fixtures", "data", "mocks", "utils", "golden", "models"]
+    file_names = ["module", "test_module", "sample", "helper", "mock_api", "recorded"]
+    paths = []
+    i = 0
+    while len(paths) < total_files:
+        top = dir_names[i % len(dir_names)]
+        sub = sub_names[(i // 5) % len(sub_names)]
+        directory = os.path.join("/repo", top, f"pkg{i % 200}", sub)
+        for j in range(50):
+            name = file_names[j % len(file_names)]
+            paths.append(os.path.join(directory, f"{name}{j}.py"))
+        i += 1
+    return paths[:total_files]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.files)
+    directories = sorted({os.path.dirname(p) for p in paths})
+    print(f"Synthetic tree: {len(directories)} dirs, {len(paths)} files")
+
+    def legacy():
+        for d in directories:
+            legacy_is_fixture_directory(CONFIG, os.path.basename(d), os.path.dirname(d))
+        return [legacy_is_fixture_file(CONFIG, p) for p in paths]
+
+    def compiled():
+        classifier = FixtureClassifier.from_config(CONFIG)
+        for d in directories:
+            classifier.is_fixture_directory(os.path.basename(d), os.path.dirname(d))
+        return [classifier.is_fixture_file(p) for p in paths]
+
+    results = {}
+    for label, func in (("legacy", legacy), ("FixtureClassifier", compiled)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[label] = func()
+            best = min(best, time.perf_counter() - start)
+        excluded = sum(results[label])
+        print(f"  {label:<20} {best * 1000:9.1f} ms  ({excluded} fixtures)")
+
+    if results["legacy"] != results["FixtureClassifier"]:
+        print("  MISMATCH: implementations disagree")
+        sys.exit(1)
+    print("  Decisions identical.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: compiled IgnoreMatcher vs. the gitignore_parser matcher.
+
+Builds a synthetic tree on disk, then times a full pruning walk with each
+matcher, the same way Enforcer.scan_files consults it.
+
+Usage:
+    python benchmarks/bench_ignore.py [--dirs 400] [--files-per-dir 50]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enforcer.ignore import IgnoreMatcher  # noqa: E402
+
+GITIGNORE = """\
+# Typical Python + JS project rules
+__pycache__/
+*.py[cod]
+*.log
+build/
+dist/
+.venv/
+node_modules/
+/coverage
+*.min.js
+docs/_build/
+!important.log
+"""
+
+
+def build_tree(root, dirs, files_per_dir):
+    with open(os.path.join(root, ".gitignore"), "w") as f:
+        f.write(GITIGNORE)
+    for d in range(dirs):
+        pkg = os.path.join(root, f"pkg{d % 20}", f"mod{d}")
+        os.makedirs(pkg, exist_ok=True)
+        for i in range(files_per_dir):
+            ext = (".py", ".js", ".log", ".pyc", ".min.js")[i % 5]
+            open(os.path.join(pkg, f"file{i}{ext}"), "w").close()
+        if d % 10 == 0:
+            os.makedirs(os.path.join(pkg, "build"), exist_ok=True)
+            open(os.path.join(pkg, "build", "out.py"), "w").close()
+
+
+def walk(root, matcher, pass_is_dir):
+    kept = 0
+    for current, dirs, files in os.walk(root):
+        if pass_is_dir:
+            dirs[:] = [d for d in dirs if not matcher(os.path.join(current, d), True)]
+        else:
+            dirs[:] = [d for d in dirs if not matcher(os.path.join(current, d))]
+        for name in files:
+            path = os.path.join(current, name)
+            if pass_is_dir:
+                ignored = matcher(path, False)
+            else:
+                ignored = matcher(path)
+            if not ignored:
+                kept += 1
+    return kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dirs", type=int, default=400)
+    parser.add_argument("--files-per-dir", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="enforcer-bench-")
+    try:
+        build_tree(root, args.dirs, args.files_per_dir)
+        total = args.dirs * args.files_per_dir
+        print(f"Synthetic tree: {args.dirs} dirs, {total} files")
+
+        def run(label, factory, pass_is_dir):
+            best = float("inf")
+            kept = 0
+            for _ in range(args.repeat):
+                matcher = factory()
+                start = time.perf_counter()
+                kept = walk(root, matcher, pass_is_dir)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {label:<20} {best * 1000:9.1f} ms  ({kept} files kept)")
+
+        run("IgnoreMatcher", lambda: IgnoreMatcher(root), True)
+        try:
+            from gitignore_parser import parse_gitignore  # type: ignore
+        except ImportError:
+            print("  gitignore_parser     not installed, skipped")
+        else:
+            run(
+                "gitignore_parser",
+                lambda: parse_gitignore(os.path.join(root, ".gitignore"), root),
+                False,
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
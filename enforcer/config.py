@@ -1,6 +1,9 @@
 import json
 import os
 
+# * Files Enforcer keeps in .enforcer/ for its own state, not tool configs
+STATE_FILES = {"inventory.json", "fingerprints.json", "history.json", "imports.json"}
+
 
 def load_config(root_path):
     enforcer_dir = os.path.join(root_path, ".enforcer")
@@ -49,7 +52,7 @@ def load_config(root_path):
     # Optionally load tool-specific configs from .enforcer/
     config["tool_configs"] = {}
     for file in os.listdir(enforcer_dir):
-        if file.endswith(".json") and file != "config.json":
+        if file.endswith(".json") and file != "config.json" and file not in STATE_FILES:
             tool = file[:-5]
             with open(os.path.join(enforcer_dir, file), "r") as f:
                 config["tool_configs"][tool] = json.load(f)
@@ -1,16 +1,171 @@
+import asyncio
+import collections
+import contextlib
 import datetime
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import os
+import queue
 import shutil
+import stat
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from multiprocessing import Queue
 from typing import Optional
 
-from .plugins import load_plugins
+from . import __version__
+from .depgraph import DependencyGraph
+from .discovery import (
+    DISCOVERY_MODES,
+    ParallelWalker,
+    ScanStats,
+    SubmoduleIndex,
+    git_ls_files,
+    read_shebang_interpreter,
+)
+from .fingerprints import FingerprintIndex
+from .fixtures import FixtureClassifier
+from .guard import FileGuard
+from .history import (
+    DEFAULT_TOOL_TIMEOUT,
+    REGRESSION_FACTOR,
+    TIMEOUT_FACTOR,
+    ToolHistory,
+)
+from .ignore import IgnoreMatcher
+from .inventory import INVENTORY_FILENAME, DirectoryInventory
+from .limits import ResourceLimitExceeded, ResourceLimits
+from .lint_cache import LintCache, scope_key
+from .plugins import build_language_maps, load_plugins
 from .presenter import Presenter
+from .profiles import get_profile, tool_enabled
+from .steps import ToolStep, run_steps
+from .syntax import check_files as check_syntax
+from .utils import (
+    CancelToken,
+    CommandCancelled,
+    bind_thread_context,
+    cancel_scope,
+    command_loop,
+    command_timeout,
+    resource_limits,
+    set_job_scheduler,
+)
+from .vendor import VendorDetector
+
+
+def _available_memory_mb():
+    """Returns the memory available for new processes in MB, or None if unknown."""
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class JobScheduler:
+    """
+    Process-wide job slots shared by every subprocess started through
+    utils.run_command.
+
+    A job declares a weight: the cores it keeps busy and a rough memory
+    footprint. It waits until that many slots are free. When adaptive, the
+    usable slots shrink while the one-minute load average, minus the
+    scheduler's own jobs, leaves fewer idle cores, and jobs wait while
+    their memory would exceed what the system reports as available. At
+    least one job is always admitted, so a busy machine slows checks down
+    but never stalls them.
+    """
+
+    # * Seconds between load and memory samples, also the re-check interval
+    # of waiting jobs
+    SAMPLE_INTERVAL = 1.0
+
+    def __init__(self, slots: Optional[int] = None, adaptive: bool = True):
+        self._cond = threading.Condition()
+        self.in_use = 0
+        self.running = 0
+        self.memory_reserved_mb = 0
+        self._sampled_at = None
+        self._load = None
+        self._available_mb = None
+        self.configure(slots, adaptive)
+
+    def configure(self, slots: Optional[int] = None, adaptive: bool = True):
+        with self._cond:
+            self.slots = max(1, slots or os.cpu_count() or 1)
+            self.adaptive = adaptive
+            self._cond.notify_all()
+
+    def _sample(self):
+        now = time.monotonic()
+        if (
+            self._sampled_at is not None
+            and now - self._sampled_at < self.SAMPLE_INTERVAL
+        ):
+            return
+        self._sampled_at = now
+        try:
+            self._load = os.getloadavg()[0]
+        except (AttributeError, OSError):
+            # * Not available on Windows
+            self._load = None
+        self._available_mb = _available_memory_mb()
+
+    def capacity(self) -> int:
+        """Returns the number of cores jobs may occupy right now."""
+        if not self.adaptive:
+            return self.slots
+        self._sample()
+        capacity = self.slots
+        if self._load is not None:
+            # * The load average includes our own jobs, only yield to the rest
+            external_load = max(0.0, self._load - self.in_use)
+            capacity = min(capacity, int((os.cpu_count() or 1) - external_load))
+        return max(1, capacity)
+
+    def _fits(self, cores: int, memory_mb: int) -> bool:
+        if self.running == 0:
+            return True
+        if self.in_use + cores > self.capacity():
+            return False
+        if memory_mb and self.adaptive and self._available_mb is not None:
+            return self.memory_reserved_mb + memory_mb <= self._available_mb
+        return True
+
+    @contextmanager
+    def slot(self, cores: int = 1, memory_mb: int = 0):
+        """Holds job slots for the weight of one job while the block runs."""
+        cores = max(1, min(cores, self.slots))
+        with self._cond:
+            while not self._fits(cores, memory_mb):
+                self._cond.wait(self.SAMPLE_INTERVAL)
+            self.in_use += cores
+            self.running += 1
+            self.memory_reserved_mb += memory_mb
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= cores
+                self.running -= 1
+                self.memory_reserved_mb -= memory_mb
+                self._cond.notify_all()
+
+
+# * The scheduler of this process; Enforcer instances configure it
+JOB_SCHEDULER = JobScheduler()
+set_job_scheduler(JOB_SCHEDULER)
 
 
 # * Core class for Agent Enforcer
@@ -35,10 +190,22 @@ class Enforcer:
 
         self.config = config or {}
         self.verbose = verbose
+        JOB_SCHEDULER.configure(
+            self.config.get("job_slots"), self.config.get("adaptive_jobs", True)
+        )
         self.gitignore_path = os.path.join(self.root_path, ".gitignore")
         self.gitignore = self._load_gitignore()
         self.submodules = self._load_submodules()
+        self.submodule_index = SubmoduleIndex(self.submodules)
+        self.fixture_classifier = FixtureClassifier.from_config(self.config)
+        self.vendor_detector = VendorDetector.from_config(self.config)
+        self.file_guard = FileGuard.from_config(self.config)
+        # * Pruned vendor directories and why, reported once per scan
+        self.vendor_directories = {}
+        self.scan_stats = ScanStats()
         self.plugins = load_plugins()
+        self.extension_map, self.interpreter_map = build_language_maps(self.plugins)
+        self.detect_shebang = self.config.get("detect_shebang", False)
         self.presenter = Presenter(verbose=self.verbose)
         self.warned_missing: set[str] = set()
 
@@ -49,13 +216,26 @@ class Enforcer:
             self.enforcer_dir, "Enforcer_last_check.log"
         )
         self.stats_log_path = os.path.join(self.enforcer_dir, "Enforcer_stats.log")
+        self.inventory = None
+        # * Shared with plugins, which get it via FingerprintIndex.for_root
+        self.fingerprints = FingerprintIndex.for_root(self.root_path)
+        self.history = ToolHistory.for_root(self.root_path)
+        # * Batches can be checked outside run_checks, so a run always exists
+        self._start_run()
+        self.lint_cache = LintCache.from_config(self.root_path, self.config)
+        self.profile = get_profile(self.config)
+        self.dependency_graph = (
+            DependencyGraph.for_root(self.root_path)
+            if self.config.get("incremental", False)
+            else None
+        )
 
     def _load_gitignore(self):
-        if os.path.exists(self.gitignore_path):
-            from gitignore_parser import parse_gitignore  # type: ignore
-
-            return parse_gitignore(self.gitignore_path, self.root_path)
-        return lambda x: False
+        """
+        Compile .git/info/exclude, the root .gitignore and any nested
+        .gitignore files into a single hierarchical matcher.
+        """
+        return IgnoreMatcher(self.root_path)
 
     def _load_submodules(self):
         """Load git submodule paths from .gitmodules file."""
@@ -88,23 +268,10 @@ class Enforcer:
     def _is_in_submodule(self, path):
         """Check if a path is within a git submodule."""
         # ! Include submodules in checking if configured to do so
-        if self.config.get("check_submodules", False):
+        if self.config.get("check_submodules", False) or not self.submodule_index:
             return False
 
-        abs_path = os.path.abspath(path)
-
-        # Check if the path is within any known submodule
-        for submodule_path in self.submodules:
-            try:
-                # Check if abs_path is under submodule_path
-                rel_path = os.path.relpath(abs_path, submodule_path)
-                if not rel_path.startswith(".."):
-                    return True
-            except ValueError:
-                # Different drives on Windows, skip
-                continue
-
-        return False
+        return self.submodule_index.contains(path)
 
     def setup_logging(self):
         # Detailed log for the last check
@@ -130,243 +297,464 @@ class Enforcer:
     def scan_files(self):
         files_by_lang = {}
         messages = []
+        for lang, files in self.scan_files_iter(messages):
+            files_by_lang.setdefault(lang, []).extend(files)
+        return files_by_lang, messages
+
+    def scan_files_iter(self, messages, batch_size=None):
+        """
+        Yields (language, files) batches of accepted files while discovery runs.
+
+        A language's batch is yielded as soon as batch_size new files have been
+        found for it, and whatever is left is flushed once a target directory
+        has been fully walked. Without batch_size, each language is yielded
+        once after all targets are scanned, exactly as scan_files returns it.
+        Files within a batch are sorted, and no file is yielded twice even if
+        target paths overlap. Files rejected by the file guard (too large,
+        minified or generated) and other warnings are appended to messages.
+        """
+        self.scan_stats = stats = ScanStats()
+        scan_started = time.perf_counter_ns()
+        pending = {}
+        seen = set()
+        reported_vendor = set()
+
+        def add(lang, file_path):
+            if file_path in seen:
+                return None
+            seen.add(file_path)
+            # * Runs after discovery so inventory listings never hide a
+            # file whose contents changed
+            reason = self._run_filter("guard", False, self.file_guard.reason, file_path)
+            if reason:
+                rel_path = os.path.relpath(file_path, self.root_path)
+                messages.append(f"Skipped file: {rel_path} ({reason})")
+                return None
+            stats.accept(lang)
+            files = pending.setdefault(lang, [])
+            files.append(file_path)
+            if batch_size and len(files) >= batch_size:
+                return lang, sorted(pending.pop(lang))
+            return None
+
+        def flush():
+            for lang in list(pending):
+                yield lang, sorted(pending.pop(lang))
+
+        discovery_mode = self.config.get("discovery_mode", "walk")
+        if discovery_mode not in DISCOVERY_MODES:
+            messages.append(
+                f"Unknown discovery_mode '{discovery_mode}', falling back to 'walk'."
+            )
 
         for path in self.target_paths:
-            if not os.path.exists(path):
+            # * A single stat answers exists/isfile/isdir for the target
+            try:
+                mode = os.stat(path).st_mode
+            except OSError:
                 messages.append(f"Path does not exist: {path}")
                 continue
-            if os.path.isfile(path):
-                if self.gitignore(path):
-                    continue
-                if self._is_fixture_file(path):
-                    continue
-                if self._is_in_submodule(path):
+            if stat.S_ISREG(mode):
+                if self._is_excluded_file(path):
                     continue
                 lang = self.get_language(path)
                 if lang:
-                    files_by_lang.setdefault(lang, []).append(path)
+                    batch = add(lang, path)
+                    if batch:
+                        yield batch
                 else:
                     messages.append(f"No supported language for file: {path}")
-            elif os.path.isdir(path):
+            elif stat.S_ISDIR(mode):
+                if self._is_in_submodule(path):
+                    # * The whole target lies inside a submodule, skip enumerating it
+                    messages.append(f"No supported files in directory: {path}")
+                    continue
                 has_files = False
-                for root, dirs, files in os.walk(path):
-                    # Prune directories based on .gitignore, fixture patterns, and submodules
-                    dirs[:] = [
-                        d
-                        for d in dirs
-                        if not self.gitignore(os.path.join(root, d))
-                        and not self._is_fixture_directory(d, root)
-                        and not self._is_in_submodule(os.path.join(root, d))
-                    ]
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        if self.gitignore(file_path):
-                            continue
-                        if self._is_fixture_file(file_path):
-                            continue
-                        if self._is_in_submodule(file_path):
-                            continue
-                        lang = self.get_language(file_path)
-                        if lang:
-                            files_by_lang.setdefault(lang, []).append(file_path)
-                            has_files = True
+                for file_path, lang in self._walk_directory(path):
+                    has_files = True
+                    batch = add(lang, file_path)
+                    if batch:
+                        yield batch
                 if not has_files:
                     messages.append(f"No supported files in directory: {path}")
+                self._report_vendor_directories(messages, reported_vendor)
+                if batch_size:
+                    # * This subtree is exhausted, start tools on the remainder
+                    yield from flush()
+
+        if self.inventory is not None:
+            self.inventory.save()
+            stats.inventory = {
+                "hits": self.inventory.hits,
+                "misses": self.inventory.misses,
+            }
+        stats.duration_ns = time.perf_counter_ns() - scan_started
 
-        # Remove duplicates if paths overlap
-        for lang in files_by_lang:
-            files_by_lang[lang] = sorted(list(set(files_by_lang[lang])))
+        yield from flush()
 
-        return files_by_lang, messages
+    def _stream_batches(self, messages, batch_size):
+        """
+        Runs scan_files_iter on a background thread and yields its batches,
+        so the directory walk keeps going while tools run on earlier batches.
+        """
+        batches = queue.Queue()
+        done = object()
 
-    def _is_fixture_directory(self, dirname, parent_path):
+        def produce():
+            try:
+                for batch in self.scan_files_iter(messages, batch_size):
+                    batches.put(batch)
+            except Exception as e:
+                batches.put(e)
+            finally:
+                batches.put(done)
+
+        producer = threading.Thread(
+            target=produce, name="enforcer-discovery", daemon=True
+        )
+        producer.start()
+        while True:
+            item = batches.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        producer.join()
+
+    def _iter_language_batches(self, messages):
         """
-        Check if a directory should be excluded as a test fixture directory.
-        This method identifies common fixture directories across different languages.
+        Yields the (language, files) batches to check. Discovery is streamed
+        when the "stream_batch_size" config key is set, and completed up
+        front otherwise.
         """
-        # ! Include fixtures in checking if configured to do so
-        if self.config.get("check_fixtures", False):
-            return False
+        batch_size = self.config.get("stream_batch_size", 0)
+        if batch_size:
+            yield from self._stream_batches(messages, batch_size)
+            return
+        files_by_lang, scan_messages = self.scan_files()
+        messages.extend(scan_messages)
+        yield from files_by_lang.items()
+
+    def _walk_directory(self, path):
+        """
+        Yields (file_path, language) pairs for every accepted file under path,
+        using the walker selected by the "discovery_mode" config key.
+        """
+        mode = self.config.get("discovery_mode", "walk")
+        if mode == "git":
+            listed = self._walk_git(path)
+            if listed is not None:
+                yield from listed
+                return
+            # * Not a git checkout, fall back to os.walk
+
+        inventory = self._get_inventory()
+        if mode == "scandir" or inventory is not None:
+            # * os.walk always lists every directory, so cached listings
+            # from the inventory are served through the scandir walker
+            walker = ParallelWalker(
+                self._is_pruned_directory,
+                self._classify_file,
+                max_workers=self.config.get("discovery_workers"),
+                inventory=inventory,
+                signature=self.gitignore.signature,
+            )
+            yield from walker.iter_walk(path)
+            self.scan_stats.visit(walker.directories_visited)
+            return
+
+        for root, dirs, files in os.walk(path):
+            self.scan_stats.visit()
+            # Prune directories based on .gitignore, fixture patterns, and submodules
+            dirs[:] = [d for d in dirs if not self._is_pruned_directory(root, d)]
+            for file in files:
+                file_path = os.path.join(root, file)
+                lang = self._classify_file(file_path)
+                if lang:
+                    yield file_path, lang
+
+    def _get_inventory(self):
+        """Load the persistent directory inventory if "inventory_cache" is enabled."""
+        if not self.config.get("inventory_cache", False):
+            return None
+        if self.inventory is None:
+            self.inventory = DirectoryInventory.load(
+                self.root_path,
+                os.path.join(self.enforcer_dir, INVENTORY_FILENAME),
+                self._inventory_fingerprint(),
+            )
+        return self.inventory
 
-        # * Common fixture directory patterns across languages
-        fixture_patterns = {
-            # Python patterns
-            "testdata",
-            "test_fixtures",
-            "fixtures",
-            # JavaScript/TypeScript patterns
-            "__fixtures__",
-            "mocks",
-            # Kotlin patterns (already covered by testdata/fixtures)
-            # C# patterns
-            "TestData",
-            "Fixtures",
-            "Resources",
+    def _inventory_fingerprint(self):
+        """
+        Hash of every input besides directory contents and ignore files that
+        affects how files are classified. Any change invalidates the inventory.
+        """
+        gitmodules = ""
+        try:
+            with open(
+                os.path.join(self.root_path, ".gitmodules"), "r", encoding="utf-8"
+            ) as f:
+                gitmodules = f.read()
+        except OSError:
+            pass
+        inputs = {
+            "enforcer": __version__,
+            "gitmodules": gitmodules,
+            "check_fixtures": self.config.get("check_fixtures", False),
+            "check_submodules": self.config.get("check_submodules", False),
+            "custom_fixture_patterns": self.config.get("custom_fixture_patterns", {}),
+            "check_vendor": self.config.get("check_vendor", False),
+            "vendor_patterns": self.config.get("vendor_patterns", {}),
+            "detect_shebang": self.detect_shebang,
+            "extensions": self.extension_map,
+            "interpreters": self.interpreter_map,
         }
+        encoded = json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha1(encoded).hexdigest()
 
-        # * Add custom user-defined patterns
-        custom_patterns = self.config.get("custom_fixture_patterns", {}).get(
-            "directories", []
-        )
-        for pattern in custom_patterns:
-            fixture_patterns.add(pattern)
+    def _walk_git(self, path):
+        """
+        Classify the files git reports for path. Returns None outside git.
 
-        dirname_lower = dirname.lower()
+        git already applies .gitignore, so only fixture, submodule and
+        language filters run here. Fixture and submodule decisions for the
+        directories between path and each file are cached for the call.
+        """
+        listed = git_ls_files(path)
+        if listed is None:
+            return None
+
+        pruned_dirs = {path: False}
+
+        def is_pruned(dir_path):
+            decision = pruned_dirs.get(dir_path)
+            if decision is None:
+                parent, name = os.path.split(dir_path)
+                if parent == dir_path or len(dir_path) < len(path):
+                    decision = False
+                else:
+                    self.scan_stats.visit()
+                    decision = (
+                        is_pruned(parent)
+                        or self._run_filter(
+                            "fixture", True, self._is_fixture_directory, name, parent
+                        )
+                        or self._run_filter(
+                            "submodule", True, self._is_in_submodule, dir_path
+                        )
+                        or self._run_filter(
+                            "vendor", True, self._is_vendor_directory, name, parent
+                        )
+                    )
+                pruned_dirs[dir_path] = decision
+            return decision
+
+        accepted = []
+        for file_path in listed:
+            if is_pruned(os.path.dirname(file_path)):
+                continue
+            if self.submodule_index.is_root(file_path):
+                # * git lists a submodule as a single gitlink entry
+                if self.config.get("check_submodules", False):
+                    accepted.extend(self._walk_directory(file_path))
+                continue
+            if self._run_filter(
+                "fixture", False, self._is_fixture_file, file_path
+            ) or self._run_filter("submodule", False, self._is_in_submodule, file_path):
+                continue
+            lang = self._detect_language(file_path)
+            if lang:
+                accepted.append((file_path, lang))
+        return accepted
+
+    def _run_filter(self, name, is_dir, check, *args):
+        """Runs one discovery filter, recording its time and outcome in scan_stats."""
+        started = time.perf_counter_ns()
+        result = check(*args)
+        self.scan_stats.record(
+            name, is_dir, time.perf_counter_ns() - started, bool(result)
+        )
+        return result
+
+    def _is_pruned_directory(self, root, dirname):
+        """Check if a directory found during a walk should not be entered."""
+        dir_path = os.path.join(root, dirname)
+        return (
+            self._run_filter("gitignore", True, self.gitignore, dir_path, True)
+            or self._run_filter(
+                "fixture", True, self._is_fixture_directory, dirname, root
+            )
+            or self._run_filter("submodule", True, self._is_in_submodule, dir_path)
+            or self._run_filter(
+                "vendor", True, self._is_vendor_directory, dirname, root
+            )
+        )
 
-        # * Direct name matches (case-insensitive)
-        if dirname_lower in {p.lower() for p in fixture_patterns}:
-            return True
+    def _is_vendor_directory(self, dirname, parent_path):
+        """Check if a directory holds vendored dependencies or build output."""
+        reason = self.vendor_detector.reason(parent_path, dirname)
+        if reason:
+            self.vendor_directories.setdefault(
+                os.path.join(parent_path, dirname), reason
+            )
+        return reason is not None
 
-        # * Pattern matches for nested fixture directories
-        # Check if we're inside a test directory and this looks like fixtures
-        parent_path_lower = parent_path.lower()
-        is_in_test_dir = any(
-            test_marker in parent_path_lower
-            for test_marker in [
-                "test",
-                "tests",
-                "spec",
-                "specs",
-                "__test__",
-                "__tests__",
-            ]
+    def _report_vendor_directories(self, messages, reported):
+        for dir_path in sorted(self.vendor_directories):
+            if dir_path in reported:
+                continue
+            reported.add(dir_path)
+            rel_path = os.path.relpath(dir_path, self.root_path)
+            reason = self.vendor_directories[dir_path]
+            messages.append(f"Skipped vendored directory: {rel_path} ({reason})")
+
+    def _is_excluded_file(self, file_path):
+        """Check if a file is excluded by .gitignore, fixture or submodule rules."""
+        return (
+            self._run_filter("gitignore", False, self.gitignore, file_path, False)
+            or self._run_filter("fixture", False, self._is_fixture_file, file_path)
+            or self._run_filter("submodule", False, self._is_in_submodule, file_path)
         )
 
-        if is_in_test_dir:
-            # Additional patterns when we're already in test directories
-            if any(
-                pattern in dirname_lower
-                for pattern in ["fixture", "testdata", "mock", "stub", "data"]
-            ):
-                return True
+    def _classify_file(self, file_path):
+        """Return the language of an accepted file, or None if it is skipped."""
+        if self._is_excluded_file(file_path):
+            return None
+        return self._detect_language(file_path)
+
+    def _detect_language(self, file_path):
+        """get_language, counted as the "language" filter when it finds none."""
+        started = time.perf_counter_ns()
+        lang = self.get_language(file_path)
+        self.scan_stats.record(
+            "language", False, time.perf_counter_ns() - started, lang is None
+        )
+        return lang
 
-        return False
+    def _is_fixture_directory(self, dirname, parent_path):
+        """
+        Check if a directory should be excluded as a test fixture directory.
+        This method identifies common fixture directories across different languages.
+        """
+        return self.fixture_classifier.is_fixture_directory(dirname, parent_path)
 
     def _is_fixture_file(self, file_path):
         """
         Check if a file should be excluded as a test fixture file.
         """
-        # ! Include fixtures in checking if configured to do so
-        if self.config.get("check_fixtures", False):
-            return False
-
-        file_name = os.path.basename(file_path).lower()
-        dir_path = os.path.dirname(file_path)
-
-        # * If the file is in a fixture directory, exclude it
-        if self._is_fixture_directory(
-            os.path.basename(dir_path), os.path.dirname(dir_path)
-        ):
-            return True
+        return self.fixture_classifier.is_fixture_file(file_path)
 
-        # * Common fixture file patterns
-        fixture_file_patterns = [
-            # Python fixtures
-            "fixture",
-            "mock",
-            "stub",
-            "testdata",
-            # JavaScript/TypeScript fixtures
-            "__fixtures__",
-            # General patterns
-            "sample",
-            "example",
-            "demo",
-        ]
+    def get_language(self, file_path):
+        ext = os.path.splitext(file_path)[1].lower()
+        lang = self.extension_map.get(ext)
+        if lang is None and not ext and self.detect_shebang:
+            interpreter = read_shebang_interpreter(file_path)
+            if interpreter:
+                lang = self.interpreter_map.get(interpreter)
+        return lang
+
+    def run_checks(self, deadline=None):
+        """Runs all checks and returns the report as text, see run_checks_async."""
+        return self._run_sync(self._run_checks, deadline)
+
+    def run_checks_structured(self, deadline=None):
+        """
+        Runs all checks and returns them as a dict, see
+        run_checks_structured_async.
+        """
+        return self._run_sync(self._run_checks_structured, deadline)
 
-        # * Add custom user-defined file patterns
-        custom_patterns = self.config.get("custom_fixture_patterns", {}).get(
-            "files", []
-        )
-        fixture_file_patterns.extend(custom_patterns)
+    def _run_sync(self, check, deadline):
+        """
+        Runs a check pipeline to completion. Called from a thread that is
+        already running an event loop, where asyncio.run is not allowed, it
+        runs on the calling thread and starts its tools with Popen instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._orchestrate(check, deadline))
+        self._start_run(deadline)
+        return check()
+
+    async def run_checks_async(self, deadline=None):
+        """
+        Runs all checks and returns the report as text. deadline is an
+        optional time.monotonic() timestamp, see run_checks_structured_async.
+        """
+        return await self._orchestrate(self._run_checks, deadline)
 
-        # * Check if filename contains fixture patterns (but not test patterns)
-        has_test_pattern = any(
-            test_marker in file_name
-            for test_marker in ["test_", "_test", ".test.", ".spec.", "_spec"]
-        )
+    async def run_checks_structured_async(self, deadline=None):
+        """
+        Runs all checks and returns errors, warnings and messages as a dict.
 
-        # * If it's clearly a test file, don't exclude it
-        if has_test_pattern:
-            return False
+        deadline is an optional time.monotonic() timestamp. Lint steps then
+        run cheapest first by their historical duration, steps that cannot
+        finish in time are skipped, and tools still running at the deadline
+        are terminated. The result then has "partial": True and lists what
+        did not run under "skipped_steps".
+        """
+        return await self._orchestrate(self._run_checks_structured, deadline)
 
-        # * Check for fixture patterns in filename
-        return any(pattern in file_name for pattern in fixture_file_patterns)
+    async def _orchestrate(self, check, deadline):
+        """
+        Runs a check pipeline without blocking the event loop.
 
-    def get_language(self, file_path):
-        ext = os.path.splitext(file_path)[1].lower()
-        for plugin in self.plugins.values():
-            if ext in plugin.extensions:
-                # * Make path relative for presenter display
-                plugin.relative_path = os.path.relpath(file_path, self.root_path)
-                return plugin.language
-        return None
-
-    def run_checks(self):
+        Discovery, parsing and presentation run on a worker thread, while
+        every tool is started on this loop with asyncio.create_subprocess_exec
+        (see utils.command_loop). Cancelling the awaiting task cancels the
+        run: tools that are still running are killed, no new ones start, and
+        CancelledError propagates once the pipeline has wound down.
+        """
+        self._start_run(deadline)
+        loop = asyncio.get_running_loop()
+
+        def run():
+            with command_loop(loop):
+                return check()
+
+        future = loop.run_in_executor(None, run)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self.cancel_token.cancel("cancelled")
+            with contextlib.suppress(Exception):
+                await future
+            raise
+
+    def _run_checks(self):
         self.detailed_logger, self.stats_logger = self.setup_logging()
         timestamp = datetime.datetime.now().isoformat()
         self.presenter.separator("Agent Enforcer")
         self.stats_logger.info(f"--- Check started at {timestamp} ---")
 
-        files_by_lang, messages = self.scan_files()
+        messages = []
+        batches = self._iter_language_batches(messages)
+        first_batch = next(batches, None)
         if messages:
             self.presenter.status("\n".join(messages), "warning")
-        if not files_by_lang:
+        if first_batch is None:
             if messages:
                 self.presenter.status("\n".join(messages), "warning")
             else:
                 self.presenter.status("No files to check.", "warning")
+            self._end_run()
+            self._log_scan_stats()
             return self.presenter.get_output()
 
         total_errors_list = []
         total_warnings_list = []
+        shown_messages = len(messages)
+        severities = self.config.get("severity_overrides", {})
 
-        for lang, files in files_by_lang.items():
-            self.presenter.separator(f"Language: {lang}")
-            plugin = self.plugins.get(lang)
-
-            if not plugin or not self.check_tools(plugin):
-                self.presenter.status(
-                    f"Skipping {lang} due to missing plugin or tools.", "warning"
-                )
+        for lang, result in self._check_batches(
+            itertools.chain([first_batch], batches), present=True
+        ):
+            if result is None:
                 continue
-
-            # Autofix
-            self.presenter.status("Running auto-fixers...")
-            fix_result = plugin.autofix_style(
-                files,
-                self.config.get("tool_configs", {}),
-            )
-            changed_count = fix_result.get("changed_count", 0)
-            self.presenter.status(
-                f"Formatted {changed_count} files."
-                if changed_count > 0
-                else "No style changes needed."
-            )
-
-            # Lint
-            self.presenter.status("Running linters and static analysis...")
-            disabled = self.config.get("disabled_rules", {})
-            severities = self.config.get("severity_overrides", {})
-            lint_result = plugin.lint(
-                files,
-                disabled.get(lang, []) + disabled.get("global", []),
-                self.config.get("tool_configs", {}),
-                root_path=self.root_path,
-            )
-            # * Presenter needs relative paths, so we convert them here.
-            for issue in lint_result.get("errors", []) + lint_result.get(
-                "warnings", []
-            ):
-                if "file" in issue and os.path.isabs(issue["file"]):
-                    try:
-                        issue["file"] = os.path.relpath(issue["file"], self.root_path)
-                    except ValueError:
-                        # Keep absolute if it's on a different drive or other error
-                        pass
-
-            lang_errors = lint_result.get("errors", [])
-            lang_warnings = lint_result.get("warnings", [])
+            lang_errors, lang_warnings, _ = result
 
             final_errors, final_warnings = self.presenter.display_results(
                 lang_errors, lang_warnings, lang, severities
@@ -374,19 +762,34 @@ class Enforcer:
             total_errors_list.extend(final_errors)
             total_warnings_list.extend(final_warnings)
 
-            self.log_issues(lang, lang_errors, lang_warnings)
+        self._report_cancellation(messages)
+        self._report_slow_steps(messages)
+        if len(messages) > shown_messages:
+            # * Streaming discovery may report problems after checks started
+            self.presenter.status("\n".join(messages[shown_messages:]), "warning")
 
         self.presenter.final_summary(total_errors_list, total_warnings_list)
+        self.fingerprints.save()
+        self.history.save()
+        self.lint_cache.prune()
+        if self.dependency_graph is not None:
+            self.dependency_graph.save()
+        self._end_run()
+        self._log_scan_stats()
 
         return self.presenter.get_output()
 
-    def run_checks_structured(self):
+    def _run_checks_structured(self):
         self.detailed_logger, self.stats_logger = self.setup_logging()
         timestamp = datetime.datetime.now().isoformat()
         self.stats_logger.info(f"--- Check started at {timestamp} ---")
 
-        files_by_lang, messages = self.scan_files()
-        if not files_by_lang:
+        messages = []
+        batches = self._iter_language_batches(messages)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            self._end_run()
+            self._log_scan_stats()
             return {
                 "errors": [],
                 "warnings": [],
@@ -397,50 +800,663 @@ class Enforcer:
         total_warnings_list = []
         total_formatted_files = 0
 
-        for lang, files in files_by_lang.items():
-            plugin = self.plugins.get(lang)
+        for lang, result in self._check_batches(
+            itertools.chain([first_batch], batches), present=False
+        ):
+            if result is None:
+                continue
+            lang_errors, lang_warnings, changed_count = result
+            total_formatted_files += changed_count
+            total_errors_list.extend(lang_errors)
+            total_warnings_list.extend(lang_warnings)
+
+        self._report_cancellation(messages)
+        self._report_slow_steps(messages)
+        self.fingerprints.save()
+        self.history.save()
+        self.lint_cache.prune()
+        if self.dependency_graph is not None:
+            self.dependency_graph.save()
+        self._end_run()
+        result = {
+            "errors": total_errors_list,
+            "warnings": total_warnings_list,
+            "messages": messages,
+            "formatted_files": total_formatted_files,
+            "scan_stats": self._log_scan_stats(),
+        }
+        if self.partial:
+            result["partial"] = True
+            result["skipped_steps"] = list(self.skipped_steps)
+        return result
 
+    def _check_batches(self, batches, present):
+        """
+        Autofixes and lints each (language, files) batch, yielding
+        (language, result) in batch order. result is (errors, warnings,
+        formatted file count) with file paths relative to the root, or None
+        if the language cannot be checked.
+
+        Up to "language_workers" batches run concurrently, since tools of
+        different languages share nothing. Presenter output and logs are
+        only written here, in batch order, so they do not depend on which
+        pipeline finishes first. Output is reported through the presenter
+        only when present is set.
+        """
+        workers = max(1, self.config.get("language_workers", 1))
+        skipped = set()
+        pending = collections.deque()
+        checked = {}
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="enforcer-lang"
+        ) as pool:
+            for lang, files in batches:
+                plugin, tool_output = self._prepare_language(lang, skipped)
+                future = None
+                if plugin:
+                    future = pool.submit(
+                        bind_thread_context(self._run_language), plugin, lang, files
+                    )
+                    checked.setdefault(lang, (plugin, []))[1].extend(files)
+                pending.append((lang, tool_output, future, False))
+                # * Finish completed batches in order, and wait for the oldest
+                # one once all workers are busy
+                while pending and (
+                    len(pending) > workers
+                    or pending[0][2] is None
+                    or pending[0][2].done()
+                ):
+                    yield self._finish_language(*pending.popleft(), present)
+            # * Builds and test suites cover the whole project, so they run
+            # once per language after its last batch, not with every batch
+            for lang, (plugin, files) in checked.items():
+                if self._project_steps(plugin, lang, files):
+                    future = pool.submit(
+                        bind_thread_context(self._run_project), plugin, lang, files
+                    )
+                    pending.append((lang, None, future, True))
+            while pending:
+                yield self._finish_language(*pending.popleft(), present)
+
+    def _prepare_language(self, lang, skipped):
+        """
+        Returns the plugin to check a batch of lang with, or None if the
+        language is skipped, together with the presenter lines written while
+        checking its tools so they can be replayed in batch order.
+        """
+        buffer = self.presenter.output_buffer
+        self.presenter.output_buffer = []
+        try:
+            if lang in skipped:
+                return None, None
+            plugin = self.plugins.get(lang)
             if not plugin or not self.check_tools(plugin):
-                continue
+                skipped.add(lang)
+                self.presenter.status(
+                    f"Skipping {lang} due to missing plugin or tools.", "warning"
+                )
+                return None, self.presenter.output_buffer
+            return plugin, self.presenter.output_buffer
+        finally:
+            self.presenter.output_buffer = buffer
+
+    def _finish_language(self, lang, tool_output, future, project, present):
+        result = future.result() if future else None
+        if present:
+            title = "Project checks" if project else "Language"
+            self.presenter.separator(f"{title}: {lang}")
+            self.presenter.output_buffer.extend(tool_output or [])
+        if result is None:
+            return lang, None
+
+        lang_errors, lang_warnings, changed_count = result
+        if present and project:
+            self.presenter.status("Running builds and tests...")
+        elif present:
+            self.presenter.status("Running auto-fixers...")
+            self.presenter.status(
+                f"Formatted {changed_count} files."
+                if changed_count > 0
+                else "No style changes needed."
+            )
+            self.presenter.status("Running linters and static analysis...")
+        self.log_issues(lang, lang_errors, lang_warnings)
+        return lang, result
 
-            # Autofix
-            fix_result = plugin.autofix_style(
-                files,
-                self.config.get("tool_configs", {}),
+    def _run_language(self, plugin, lang, files):
+        """
+        Autofixes and lints one batch of files. Runs on a worker thread.
+        Returns None if the check was cancelled before the batch started.
+        """
+        with cancel_scope(self.cancel_token):
+            if self.cancel_token.cancelled:
+                self._skip_step(lang, "all", self.cancel_token.reason)
+                return None
+            try:
+                return self._autofix_and_lint(plugin, lang, files)
+            except CommandCancelled:
+                # * Raised by plugins that run their tools without run_steps
+                self._skip_step(lang, "lint", self.cancel_token.reason)
+                return None
+
+    def _run_project(self, plugin, lang, files):
+        """
+        Runs the project-wide steps of a language over all its checked files.
+        Runs on a worker thread and returns a result like _run_language.
+        """
+        with cancel_scope(self.cancel_token):
+            if self.cancel_token.cancelled:
+                self._skip_step(lang, "project", self.cancel_token.reason)
+                return None
+            return self._run_project_steps(plugin, lang, files), [], 0
+
+    def _autofix_and_lint(self, plugin, lang, files):
+        # * Files that do not parse only make every tool fail noisily, so
+        # they get one syntax diagnostic and are left out of the tool runs
+        broken = self._syntax_gate(plugin, files)
+        syntax_errors = list(broken.values())
+        if syntax_errors:
+            files = [f for f in files if f not in broken]
+            self._count_issues({"errors": syntax_errors})
+            for issue in syntax_errors:
+                issue["file"] = os.path.relpath(issue["file"], self.root_path)
+            if self.cancel_token.cancelled:
+                return syntax_errors, [], 0
+
+        # Autofix
+        changed_count = 0
+        autofix_failures = []
+        if files:
+            timeout = self.config.get("tool_timeout", DEFAULT_TOOL_TIMEOUT) or None
+            limits = ResourceLimits.from_config(self.config, "autofix")
+            try:
+                with command_timeout(timeout), resource_limits(limits):
+                    fix_result = plugin.autofix_style(
+                        files,
+                        self.config.get("tool_configs", {}),
+                    )
+                changed_count = fix_result.get("changed_count", 0)
+            except ResourceLimitExceeded as e:
+                autofix_failures.append(self._tool_failure("autofix", e))
+                self._count_issues({"errors": autofix_failures})
+
+        # Lint
+        disabled = self.config.get("disabled_rules", {})
+        disabled_rules = disabled.get(lang, []) + disabled.get("global", [])
+        tool_configs = self.config.get("tool_configs", {})
+
+        # * Only files without cached results are passed to the linters
+        scope = self._lint_cache_scope(plugin, lang, disabled_rules, tool_configs)
+        digests = {}
+        cached = {}
+        misses = files
+        if scope is not None:
+            misses, digests, cached = self._lookup_lint_cache(
+                plugin, lang, scope, files
+            )
+
+        lint_args = (misses, disabled_rules, tool_configs)
+        complete = True
+        uncached_tools = set()
+        if getattr(type(plugin), "lint_steps", None) is not None:
+            steps = []
+            if misses:
+                steps = [
+                    step
+                    for step in plugin.lint_steps(*lint_args, root_path=self.root_path)
+                    if tool_enabled(self.profile, lang, step.tool)
+                ]
+            if files and scope is not None and self.dependency_graph is None:
+                # ! An edit can break a file the edit did not touch, so unless
+                # incremental mode keys entries by their import closure, type
+                # checkers see every file and their results are never cached
+                whole_program = [
+                    step
+                    for step in plugin.lint_steps(
+                        files, disabled_rules, tool_configs, root_path=self.root_path
+                    )
+                    if step.whole_program
+                    and tool_enabled(self.profile, lang, step.tool)
+                ]
+                steps = [step for step in steps if not step.whole_program]
+                steps += whole_program
+                uncached_tools = {step.tool for step in whole_program}
+            steps, priorities, finished, skipped = self._schedule_steps(
+                lang, steps, misses
+            )
+            # * Formatting is done, so the plugin's linters can run side by side,
+            # in the order _schedule_steps chose
+            lint_result = run_steps(
+                steps,
+                max_workers=self.config.get("tool_workers"),
+                on_result=self._count_issues,
+                priority=lambda step: priorities[step.tool],
             )
-            total_formatted_files += fix_result.get("changed_count", 0)
-
-            # Lint
-            disabled = self.config.get("disabled_rules", {})
-            lint_result = plugin.lint(
-                files,
-                disabled.get(lang, []) + disabled.get("global", []),
-                self.config.get("tool_configs", {}),
-                root_path=self.root_path,
+            for step in steps:
+                if step.tool not in finished:
+                    complete = False
+                    if step.tool not in skipped:
+                        self._skip_step(lang, step.tool, self.cancel_token.reason)
+        elif not misses:
+            lint_result = {}
+        else:
+            lint_result = plugin.lint(*lint_args, root_path=self.root_path)
+            self._count_issues(lint_result)
+
+        lang_errors = syntax_errors + autofix_failures + lint_result.get("errors", [])
+        lang_warnings = lint_result.get("warnings", [])
+
+        # * Presenter needs relative paths, so we convert them here.
+        for issue in lang_errors + lang_warnings:
+            if "file" in issue and os.path.isabs(issue["file"]):
+                try:
+                    issue["file"] = os.path.relpath(issue["file"], self.root_path)
+                except ValueError:
+                    # Keep absolute if it's on a different drive or other error
+                    pass
+
+        if scope is not None:
+            if complete and not self.cancel_token.cancelled:
+                # * Results of cancelled or skipped steps are incomplete
+                self._store_lint_results(
+                    scope,
+                    misses,
+                    digests,
+                    [e for e in lang_errors if e.get("tool") not in uncached_tools],
+                    [w for w in lang_warnings if w.get("tool") not in uncached_tools],
+                )
+            # * Project-wide tools like tsc may report on cached files again
+            seen = {json.dumps(i, sort_keys=True) for i in lang_errors + lang_warnings}
+            for file_path in files:
+                entry = cached.get(file_path, {})
+                for kind, target in (
+                    ("errors", lang_errors),
+                    ("warnings", lang_warnings),
+                ):
+                    for issue in entry.get(kind, []):
+                        if json.dumps(issue, sort_keys=True) not in seen:
+                            target.append(issue)
+                self._count_issues(entry)
+
+        return lang_errors, lang_warnings, changed_count
+
+    def _project_steps(self, plugin, lang, files):
+        """Returns the plugin's compile and test steps the profile asks for."""
+        steps = []
+        if self.profile.get("compile") and hasattr(type(plugin), "compile"):
+            steps.append(
+                ToolStep(
+                    f"{lang}-compile",
+                    functools.partial(plugin.compile, files),
+                    cores=2,
+                    memory_mb=1024,
+                )
             )
+        if self.profile.get("test") and hasattr(type(plugin), "test"):
+            steps.append(
+                ToolStep(
+                    f"{lang}-test",
+                    functools.partial(plugin.test, self.root_path),
+                    cores=2,
+                    memory_mb=1024,
+                )
+            )
+        return steps
 
-            lang_errors = lint_result.get("errors", [])
-            lang_warnings = lint_result.get("warnings", [])
+    def _run_project_steps(self, plugin, lang, files):
+        """
+        Runs the plugin's compile and test steps when the profile asks for
+        them, returning their failures as errors. They are not cached.
+        """
+        steps = self._project_steps(plugin, lang, files)
+        if not steps:
+            return []
+
+        def as_issues(step):
+            # * compile() and test() return failures as issue dicts or lines
+            failures = step.run() or []
+            errors = [
+                (
+                    {"file": "unknown", "line": 0, **failure}
+                    if isinstance(failure, dict)
+                    else {
+                        "tool": step.tool,
+                        "file": "unknown",
+                        "line": 0,
+                        "message": str(failure),
+                    }
+                )
+                for failure in failures
+                if failure
+            ]
+            return {"errors": errors, "warnings": []}
 
-            # Convert absolute to relative paths
-            for issue in lang_errors + lang_warnings:
-                if "file" in issue and os.path.isabs(issue["file"]):
-                    try:
-                        issue["file"] = os.path.relpath(issue["file"], self.root_path)
-                    except ValueError:
-                        pass
+        steps = [
+            step._replace(run=functools.partial(as_issues, step)) for step in steps
+        ]
+        steps, priorities, _, _ = self._schedule_steps(lang, steps, files)
+        result = run_steps(
+            steps,
+            max_workers=self.config.get("tool_workers"),
+            on_result=self._count_issues,
+            priority=lambda step: priorities[step.tool],
+        )
+        return result["errors"]
 
-            total_errors_list.extend(lang_errors)
-            total_warnings_list.extend(lang_warnings)
+    def _syntax_gate(self, plugin, files):
+        """
+        Returns the syntax error of each file that does not parse, by path.
+        Plugins opt in by naming their syntax_dialect.
+        """
+        dialect = getattr(type(plugin), "syntax_dialect", None)
+        if dialect is None or not self.config.get("syntax_gate", True):
+            return {}
+        return check_syntax(dialect, files)
 
-            self.log_issues(lang, lang_errors, lang_warnings)
+    def _schedule_steps(self, lang, steps, files):
+        """
+        Wraps lint steps so they are timed into the tool history, run with an
+        adaptive timeout, and skipped when their historical duration exceeds
+        the time left until the deadline. Returns the wrapped steps, their
+        start priorities, and the sets of steps that finished and that were
+        skipped for the deadline.
+
+        Without a deadline the longest steps start first, so the slowest
+        tool does not start last and stretch the check. With one, the
+        cheapest start first, so the deadline cuts off the expensive ones.
+        Steps without history are treated as the longest.
+        """
+        priorities = {}
+        finished = set()
+        skipped = set()
+        wrapped = []
+        for step in steps:
+            estimate = self.history.estimate(step.tool, len(files), step.whole_program)
+            if self.deadline is not None:
+                priorities[step.tool] = float("inf") if estimate is None else estimate
+            else:
+                priorities[step.tool] = -float("inf") if estimate is None else -estimate
+
+            def run(step=step, estimate=estimate):
+                if self.deadline is not None:
+                    remaining = self.deadline - time.monotonic()
+                    if remaining <= 0 or (
+                        estimate is not None and estimate > remaining
+                    ):
+                        skipped.add(step.tool)
+                        self._skip_step(lang, step.tool, "deadline")
+                        return {}
+                timeout = self._step_timeout(step, len(files))
+                limits = ResourceLimits.from_config(self.config, step.tool)
+                started = time.monotonic()
+                stopped = False
+                try:
+                    with command_timeout(timeout), resource_limits(limits):
+                        result = step.run()
+                except ResourceLimitExceeded as e:
+                    result = {"errors": [self._tool_failure(step.tool, e)]}
+                    stopped = True
+                elapsed = time.monotonic() - started
+                if not self.cancel_token.cancelled:
+                    # * A run cut off by its timeout or limits says nothing
+                    # about the tool's usual duration
+                    if not stopped and (timeout is None or elapsed < timeout):
+                        usual = self.history.record_step(
+                            step.tool, len(files), elapsed, step.whole_program
+                        )
+                        if usual is not None:
+                            self._flag_slow_step(lang, step.tool, elapsed, usual)
+                    finished.add(step.tool)
+                return result
+
+            wrapped.append(step._replace(run=run))
+        return wrapped, priorities, finished, skipped
+
+    @staticmethod
+    def _tool_failure(tool, error):
+        return {"tool": tool, "file": "unknown", "line": 0, "message": str(error)}
+
+    def _step_timeout(self, step, file_count):
+        """
+        Returns the timeout of each command of a lint step: a multiple of the
+        tool's p95 duration once it has enough history, else "tool_timeout".
+        """
+        factor = self.config.get("timeout_factor", TIMEOUT_FACTOR)
+        timeout = None
+        if factor:
+            timeout = self.history.timeout(
+                step.tool, file_count, factor, step.whole_program
+            )
+        if timeout is None:
+            timeout = self.config.get("tool_timeout", DEFAULT_TOOL_TIMEOUT) or None
+        return timeout
+
+    def _flag_slow_step(self, lang, tool, seconds, usual):
+        with self.issue_lock:
+            self.slow_steps.append(
+                {
+                    "language": lang,
+                    "tool": tool,
+                    "seconds": round(seconds, 1),
+                    "p95_seconds": round(usual, 1),
+                }
+            )
 
-        return {
-            "errors": total_errors_list,
-            "warnings": total_warnings_list,
-            "messages": messages,
-            "formatted_files": total_formatted_files,
+    def _skip_step(self, lang, tool, reason):
+        with self.issue_lock:
+            self.skipped_steps.append(
+                {"language": lang, "tool": tool, "reason": reason or "cancelled"}
+            )
+
+    def _count_issues(self, result):
+        """
+        Counts the issues of a finished tool step and cancels the check once
+        fail_fast sees an error or max_issues is reached.
+        """
+        fail_fast = self.config.get("fail_fast", False)
+        max_issues = self.config.get("max_issues", 0)
+        if not (fail_fast or max_issues):
+            return
+        errors = len(result.get("errors", []))
+        with self.issue_lock:
+            self.error_count += errors
+            self.issue_count += errors + len(result.get("warnings", []))
+            if fail_fast and self.error_count:
+                self.cancel_token.cancel("fail_fast")
+            elif max_issues and self.issue_count >= max_issues:
+                self.cancel_token.cancel("max_issues")
+
+    def _start_run(self, deadline=None):
+        self.cancel_token = CancelToken()
+        self.issue_lock = threading.Lock()
+        self.error_count = 0
+        self.issue_count = 0
+        self.skipped_steps = []
+        self.slow_steps = []
+        self.deadline = deadline
+        self.deadline_timer = None
+        if deadline is not None:
+            # * Tools still running at the deadline are terminated
+            self.deadline_timer = threading.Timer(
+                max(0.0, deadline - time.monotonic()),
+                self.cancel_token.cancel,
+                ["deadline"],
+            )
+            self.deadline_timer.daemon = True
+            self.deadline_timer.start()
+
+    def _end_run(self):
+        if self.deadline_timer is not None:
+            self.deadline_timer.cancel()
+
+    @property
+    def partial(self):
+        return self.cancel_token.cancelled or bool(self.skipped_steps)
+
+    def _report_cancellation(self, messages):
+        if self.cancel_token.cancelled:
+            messages.append(
+                f"Check stopped early ({self.cancel_token.reason}): remaining "
+                "tools were cancelled, so results are incomplete."
+            )
+        elif self.skipped_steps:
+            skipped = ", ".join(
+                f"{s['language']}/{s['tool']}" for s in self.skipped_steps
+            )
+            messages.append(
+                f"Skipped tools that could not finish before the deadline: {skipped}."
+            )
+
+    def _report_slow_steps(self, messages):
+        for step in self.slow_steps:
+            messages.append(
+                f"{step['language']}/{step['tool']} took {step['seconds']}s, more "
+                f"than {REGRESSION_FACTOR:g}x its usual {step['p95_seconds']}s (p95). "
+                "Check the tool's configuration or the recent changes."
+            )
+
+    def _file_key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.root_path).replace(
+            os.sep, "/"
+        )
+
+    def _nested_config_digest(self, plugin, directory, memo):
+        """
+        Returns a digest of the plugin's config files in directory and its
+        parents below the root, whose own config files are part of the scope.
+        """
+        if directory in memo:
+            return memo[directory]
+        parent = os.path.dirname(directory)
+        if not directory.startswith(self.root_path + os.sep) or parent == directory:
+            memo[directory] = ""
+            return ""
+        found = []
+        for name in getattr(plugin, "config_files", []):
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                found.append(f"{name}={self.fingerprints.fingerprint(path)}")
+        digest = self._nested_config_digest(plugin, parent, memo)
+        if found:
+            key = f"{self._file_key(directory)}\0{';'.join(found)}\0{digest}"
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        memo[directory] = digest
+        return digest
+
+    def _lookup_lint_cache(self, plugin, lang, scope, files):
+        """
+        Splits files into cached results and files that must be linted.
+
+        A file's key covers the config files of its own directory and the
+        directories between it and the root, since linters apply the nearest
+        ones. In incremental mode a file's key also covers everything it imports,
+        and known importers of the files are linted too when their own
+        results are out of date, so type errors caused by an edit surface
+        even when only the edited files were targeted.
+        """
+        # * Hashed after autofix, so keys match what the linters will read
+        digests = self.fingerprints.fingerprints(files)
+        candidates = list(files)
+        if self.dependency_graph is not None:
+            self.dependency_graph.update(digests)
+            targeted = set(files)
+            dependents = [
+                path
+                for path in self.dependency_graph.dependents(files)
+                if path not in targeted and self.get_language(path) == lang
+            ]
+            digests.update(self.fingerprints.fingerprints(dependents))
+            self.dependency_graph.update(digests)
+            candidates += dependents
+            for file_path in candidates:
+                if digests[file_path] is not None:
+                    closure = self.dependency_graph.closure_digest(
+                        file_path, self.fingerprints.fingerprint
+                    )
+                    digests[file_path] = f"{digests[file_path]}:{closure}"
+
+        memo = {}
+        for file_path in candidates:
+            if digests[file_path] is not None:
+                directory = os.path.dirname(os.path.abspath(file_path))
+                nested = self._nested_config_digest(plugin, directory, memo)
+                if nested:
+                    digests[file_path] = f"{digests[file_path]}:{nested}"
+
+        cached = {}
+        misses = []
+        for file_path in candidates:
+            entry = None
+            if digests[file_path] is not None:
+                entry = self.lint_cache.get(
+                    scope, self._file_key(file_path), digests[file_path]
+                )
+            if entry is None:
+                misses.append(file_path)
+            elif file_path in files:
+                cached[file_path] = entry
+        return misses, digests, cached
+
+    def _lint_cache_scope(self, plugin, lang, disabled_rules, tool_configs):
+        """
+        Returns the lint cache scope of a plugin run, or None when its results
+        must not be cached. Plugins opt in by reporting their tool versions.
+        """
+        if not self.lint_cache.enabled:
+            return None
+        tool_versions = getattr(type(plugin), "tool_versions", None)
+        if tool_versions is None:
+            return None
+        versions = plugin.tool_versions(self.root_path)
+        if versions is None:
+            return None
+        config_files = {}
+        for name in getattr(plugin, "config_files", []):
+            path = os.path.join(self.root_path, name)
+            if os.path.isfile(path):
+                config_files[name] = self.fingerprints.fingerprint(path)
+        # * Results depend on which tools the profile runs, and entries only
+        # hold type checker issues in incremental mode
+        tools = self.profile.get("tools", {}).get(lang)
+        return scope_key(
+            __version__,
+            lang,
+            versions,
+            config_files,
+            disabled_rules,
+            tool_configs,
+            tools,
+            self.dependency_graph is not None,
+        )
+
+    def _store_lint_results(self, scope, files, digests, errors, warnings):
+        by_file = {
+            self._file_key(f): {"errors": [], "warnings": []}
+            for f in files
+            if digests.get(f) is not None
         }
+        for kind, issues in (("errors", errors), ("warnings", warnings)):
+            for issue in issues:
+                file_path = issue.get("file")
+                entry = by_file.get(self._file_key(file_path)) if file_path else None
+                if entry is None:
+                    # * Tool failures are not tied to a file, so the results of
+                    # this run may be incomplete and are not cached
+                    if file_path in (None, "unknown", "config", "parser"):
+                        return
+                    continue
+                entry[kind].append(issue)
+        for file_path in files:
+            digest = digests.get(file_path)
+            if digest is not None:
+                key = self._file_key(file_path)
+                self.lint_cache.put(scope, key, digest, by_file[key])
+
+    def _log_scan_stats(self):
+        """Writes the counters of the last scan to the stats log and returns them."""
+        scan_stats = self.scan_stats.as_dict()
+        self.stats_logger.info(f"scan_stats: {json.dumps(scan_stats)}")
+        return scan_stats
 
     def log_issues(self, lang, errors, warnings):
         # Detailed log
@@ -0,0 +1,304 @@
+import ast
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEPGRAPH_FILENAME = "imports.json"
+DEPGRAPH_VERSION = 2
+
+PYTHON_EXTENSIONS = (".py",)
+JS_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+# * Source roots tried for absolute Python imports, besides the importer's
+# own directory
+PYTHON_SOURCE_ROOTS = ("", "src")
+
+_JS_IMPORT_RE = re.compile(
+    r"""(?:\bimport\s*(?:[\w*${}\s,]+\s*from\s*)?|\bexport\s*[\w*${}\s,]*\s*from\s*"""
+    r"""|\brequire\s*\(\s*|\bimport\s*\(\s*)(["'])([^"'\n]+)\1"""
+)
+
+
+def python_imports(source: str) -> List[tuple]:
+    """
+    Returns the imports of a Python module as (level, module, names) tuples.
+
+    ``level`` is the number of leading dots of a relative import and
+    ``names`` the names of a ``from`` import, which may be submodules.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append((0, alias.name, []))
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.name for alias in node.names if alias.name != "*"]
+            imports.append((node.level, node.module or "", names))
+    return imports
+
+
+def js_imports(source: str) -> List[str]:
+    """Returns the specifiers of import, export-from and require() statements."""
+    return [match.group(2) for match in _JS_IMPORT_RE.finditer(source)]
+
+
+class DependencyGraph:
+    """
+    Persistent graph of imports between project files, stored in .enforcer/.
+
+    Python imports are parsed with ``ast`` and JS/TS imports from
+    ``import``/``export``/``require`` statements; only imports that resolve
+    to files inside the project become edges. Each entry keeps the content
+    digest it was parsed from and the candidate paths that did not exist
+    when its imports were resolved, so a file is only reparsed when it
+    changes or one of those paths appears.
+
+    The graph lets per-file results of type checkers stay valid: a file's
+    ``closure_digest`` changes whenever anything it transitively imports
+    changes or a module it failed to import is created, and ``dependents``
+    finds the importers that must be rechecked after an edit.
+    """
+
+    _shared: Dict[str, "DependencyGraph"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root_path: str, path: str):
+        self.root_path = os.path.abspath(root_path)
+        self.path = path
+        self.files: Dict[str, list] = {}
+        self.loaded = False
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_root(cls, root_path: str) -> "DependencyGraph":
+        """Returns the shared graph of root_path, loaded lazily on first use."""
+        root_path = os.path.abspath(root_path)
+        with cls._shared_lock:
+            graph = cls._shared.get(root_path)
+            if graph is None:
+                path = os.path.join(root_path, ".enforcer", DEPGRAPH_FILENAME)
+                graph = cls._shared[root_path] = cls(root_path, path)
+        return graph
+
+    @staticmethod
+    def supports(file_path: str) -> bool:
+        return file_path.endswith(PYTHON_EXTENSIONS + JS_EXTENSIONS)
+
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == DEPGRAPH_VERSION:
+                    self.files = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+            self.loaded = True
+
+    def _key(self, file_path: str) -> str:
+        return os.path.relpath(os.path.abspath(file_path), self.root_path).replace(
+            os.sep, "/"
+        )
+
+    def _exists(self, key: str) -> bool:
+        return os.path.isfile(os.path.join(self.root_path, key))
+
+    def _resolve_python(
+        self, key: str, level: int, module: str, names, missing: Set[str]
+    ) -> Set[str]:
+        package = key.rsplit("/", 1)[0] if "/" in key else ""
+        if level:
+            parts = package.split("/") if package else []
+            if level - 1 > len(parts):
+                return set()
+            base_dirs = ["/".join(parts[: len(parts) - (level - 1)])]
+        else:
+            base_dirs = list(PYTHON_SOURCE_ROOTS) + [package]
+
+        resolved = set()
+        module_path = module.replace(".", "/")
+        for base in dict.fromkeys(base_dirs):
+            prefix = "/".join(p for p in (base, module_path) if p)
+            targets = [prefix] + [
+                f"{prefix}/{name}" if prefix else name for name in names
+            ]
+            for target in targets:
+                if not target:
+                    continue
+                for candidate in (f"{target}.py", f"{target}/__init__.py"):
+                    if self._exists(candidate):
+                        resolved.add(candidate)
+                        break
+                    missing.add(candidate)
+        resolved.discard(key)
+        return resolved
+
+    def _resolve_js(self, key: str, specifier: str, missing: Set[str]) -> Set[str]:
+        if not specifier.startswith("."):
+            # * Packages from node_modules are not part of the project
+            return set()
+        base = os.path.normpath(os.path.join(os.path.dirname(key), specifier)).replace(
+            os.sep, "/"
+        )
+        candidates = [base] + [base + ext for ext in JS_EXTENSIONS]
+        candidates += [f"{base}/index{ext}" for ext in JS_EXTENSIONS]
+        if base.endswith(".js"):
+            # * TypeScript sources are imported with the emitted .js extension
+            candidates += [base[:-3] + ".ts", base[:-3] + ".tsx"]
+        for candidate in candidates:
+            if candidate.startswith("../"):
+                continue
+            if self._exists(candidate):
+                return {candidate}
+            missing.add(candidate)
+        return set()
+
+    def _parse(self, file_path: str, key: str) -> Tuple[List[str], List[str]]:
+        """
+        Returns the keys a file imports, and the candidate paths of its
+        imports that do not exist.
+        """
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                source = f.read()
+        except OSError:
+            return [], []
+        deps: Set[str] = set()
+        missing: Set[str] = set()
+        if file_path.endswith(PYTHON_EXTENSIONS):
+            for level, module, names in python_imports(source):
+                deps |= self._resolve_python(key, level, module, names, missing)
+        else:
+            for specifier in js_imports(source):
+                deps |= self._resolve_js(key, specifier, missing)
+        return sorted(deps), sorted(missing)
+
+    def _appeared(self, key: str) -> List[str]:
+        """Returns the paths a file failed to import that exist by now."""
+        entry = self.files.get(key)
+        missing = entry[2] if entry else []
+        return [candidate for candidate in missing if self._exists(candidate)]
+
+    def update(self, digests: Dict[str, Optional[str]]):
+        """Reparses the files whose digest differs from the recorded one."""
+        self._ensure_loaded()
+        for file_path, digest in digests.items():
+            if digest is None or not self.supports(file_path):
+                continue
+            key = self._key(file_path)
+            entry = self.files.get(key)
+            if entry is not None and entry[0] == digest and not self._appeared(key):
+                continue
+            deps, missing = self._parse(file_path, key)
+            with self._lock:
+                self.files[key] = [digest, deps, missing]
+                self.dirty = True
+
+    def _deps(self, key: str) -> List[str]:
+        entry = self.files.get(key)
+        return entry[1] if entry else []
+
+    def dependencies(self, file_path: str) -> Set[str]:
+        """Returns the keys of all files file_path transitively imports."""
+        self._ensure_loaded()
+        start = self._key(file_path)
+        seen = {start}
+        stack = [start]
+        while stack:
+            for dep in self._deps(stack.pop()):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        seen.discard(start)
+        return seen
+
+    def dependents(self, file_paths: Iterable[str]) -> List[str]:
+        """
+        Returns the absolute paths of known files that transitively import
+        any of file_paths.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            entries = list(self.files.items())
+        reverse: Dict[str, List[str]] = {}
+        for key, (_, deps, _) in entries:
+            for dep in deps:
+                reverse.setdefault(dep, []).append(key)
+        start = {self._key(path) for path in file_paths}
+        seen = set(start)
+        stack = list(start)
+        while stack:
+            for importer in reverse.get(stack.pop(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    stack.append(importer)
+        return [
+            os.path.join(self.root_path, key)
+            for key in sorted(seen - start)
+            if self._exists(key)
+        ]
+
+    def closure_digest(self, file_path: str, fingerprint) -> str:
+        """
+        Returns a digest of the contents of everything file_path transitively
+        imports, using fingerprint(path) to hash each dependency.
+
+        Dependencies that were never parsed or changed since are reparsed on
+        the way, so the closure is current even for files outside the batch.
+        Imports that resolve to no file count too: the digest covers which of
+        their candidate paths exist, so creating a missing module changes it.
+        """
+        self._ensure_loaded()
+        start = self._key(file_path)
+        seen = {start}
+        stack = [start]
+        digests = {}
+        appeared = {start: self._appeared(start)}
+        while stack:
+            for dep in self._deps(stack.pop()):
+                if dep in seen:
+                    continue
+                seen.add(dep)
+                dep_path = os.path.join(self.root_path, dep)
+                digests[dep] = fingerprint(dep_path)
+                self.update({dep_path: digests[dep]})
+                appeared[dep] = self._appeared(dep)
+                stack.append(dep)
+
+        digest = hashlib.sha1()
+        for dep in sorted(digests):
+            digest.update(f"{dep}\0{digests[dep]}\0".encode("utf-8"))
+        for key in sorted(appeared):
+            for candidate in appeared[key]:
+                digest.update(f"{key}\0+{candidate}\0".encode("utf-8"))
+        return digest.hexdigest()
+
+    def save(self):
+        """Writes the graph if it changed, replacing the file atomically."""
+        if not self.dirty:
+            return
+        with self._lock:
+            # * Drop entries of deleted files
+            self.files = {k: v for k, v in self.files.items() if self._exists(k)}
+            data = {"version": DEPGRAPH_VERSION, "files": self.files}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                # * The graph is rebuilt from sources, a failed write is not fatal
+                pass
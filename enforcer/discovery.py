@@ -0,0 +1,337 @@
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .inventory import DirectoryInventory
+from .utils import get_git_root, run_command
+
+# * Supported values of the "discovery_mode" config key
+DISCOVERY_MODES = ("walk", "scandir", "git")
+
+# * Upper bound for git calls made during discovery, in seconds
+GIT_TIMEOUT = 30
+
+# * Bytes read from an extensionless file when looking for a shebang line
+SHEBANG_READ_BYTES = 256
+
+# * Trailing interpreter version, e.g. "python3.11" -> "python"
+_INTERPRETER_VERSION = re.compile(r"[\d.]+$")
+
+
+def read_shebang_interpreter(path: str) -> Optional[str]:
+    """
+    Returns the interpreter named by a file's shebang line, without any
+    version suffix, or None. Only the first SHEBANG_READ_BYTES are read.
+
+    Both "#!/usr/bin/python3" and "#!/usr/bin/env -S python3 -u" yield "python".
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(SHEBANG_READ_BYTES)
+    except OSError:
+        return None
+    if not head.startswith(b"#!"):
+        return None
+
+    line = head[2:].split(b"\n", 1)[0].decode("utf-8", errors="ignore")
+    words = line.split()
+    if not words:
+        return None
+    command = os.path.basename(words[0])
+    if command == "env":
+        # * Skip env options and VAR=value assignments to reach the command
+        args = [w for w in words[1:] if not w.startswith("-") and "=" not in w]
+        if not args:
+            return None
+        command = os.path.basename(args[0])
+    return _INTERPRETER_VERSION.sub("", command) or None
+
+
+class ScanStats:
+    """
+    Counters for one scan: directories visited and pruned per rule, files
+    excluded per rule, files accepted per language and the time spent in
+    each filter. Safe to update from walker threads.
+    """
+
+    def __init__(self):
+        self.directories_visited = 0
+        self.directories_pruned: Dict[str, int] = {}
+        self.files_excluded: Dict[str, int] = {}
+        self.files_by_language: Dict[str, int] = {}
+        self.filter_time_ns: Dict[str, int] = {}
+        self.duration_ns = 0
+        # * Hit and miss counts when the directory inventory is enabled
+        self.inventory: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def record(self, name: str, is_dir: bool, elapsed_ns: int, matched: bool):
+        """Records one evaluation of the named filter on a directory or file."""
+        with self._lock:
+            self.filter_time_ns[name] = self.filter_time_ns.get(name, 0) + elapsed_ns
+            if matched:
+                counts = self.directories_pruned if is_dir else self.files_excluded
+                counts[name] = counts.get(name, 0) + 1
+
+    def visit(self, count: int = 1):
+        with self._lock:
+            self.directories_visited += count
+
+    def accept(self, lang: str):
+        with self._lock:
+            self.files_by_language[lang] = self.files_by_language.get(lang, 0) + 1
+
+    def as_dict(self) -> dict:
+        """Returns the counters as JSON-ready data, with times in milliseconds."""
+        data = {
+            "duration_ms": round(self.duration_ns / 1e6, 3),
+            "directories_visited": self.directories_visited,
+            "directories_pruned": dict(sorted(self.directories_pruned.items())),
+            "files_excluded": dict(sorted(self.files_excluded.items())),
+            "files_by_language": dict(sorted(self.files_by_language.items())),
+            "filter_time_ms": {
+                name: round(elapsed / 1e6, 3)
+                for name, elapsed in sorted(self.filter_time_ns.items())
+            },
+        }
+        if self.inventory is not None:
+            data["inventory"] = dict(self.inventory)
+        return data
+
+
+class SubmoduleIndex:
+    """
+    Path-component trie over submodule roots.
+
+    A lookup walks the components of the queried path once, so it costs
+    O(path depth) no matter how many submodules the repository declares.
+    """
+
+    _END = None
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._trie: dict = {}
+        for path in paths:
+            node = self._trie
+            for part in self._parts(path):
+                node = node.setdefault(part, {})
+            node[self._END] = True
+
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        return os.path.normcase(os.path.abspath(path)).split(os.sep)
+
+    def __bool__(self):
+        return bool(self._trie)
+
+    def contains(self, path: str) -> bool:
+        """Check if path is a submodule root or lies anywhere inside one."""
+        node = self._trie
+        for part in self._parts(path):
+            if self._END in node:
+                return True
+            node = node.get(part)
+            if node is None:
+                return False
+        return self._END in node
+
+    def is_root(self, path: str) -> bool:
+        """Check if path is exactly a submodule root."""
+        node = self._trie
+        for part in self._parts(path):
+            node = node.get(part)
+            if node is None:
+                return False
+        return self._END in node
+
+
+class ParallelWalker:
+    """
+    Directory walker built on os.scandir that fans subtrees out to a thread pool.
+
+    It mirrors ``os.walk(top)`` semantics as used by ``Enforcer.scan_files``:
+    directories rejected by ``prune_dir`` are never entered, symlinked
+    directories are not followed, and every other entry is offered to
+    ``classify_file``. Entry types come from the cached ``DirEntry`` data, so
+    no extra stat call is made per entry on platforms that report it.
+    """
+
+    def __init__(
+        self,
+        prune_dir: Callable[[str, str], bool],
+        classify_file: Callable[[str], Optional[str]],
+        max_workers: Optional[int] = None,
+        inventory: Optional[DirectoryInventory] = None,
+        signature: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        self.prune_dir = prune_dir
+        self.classify_file = classify_file
+        self.max_workers = max_workers
+        # * Optional persistent cache of listings, validated by directory
+        # mtime and by the ignore-file signature returned from signature()
+        self.inventory = inventory
+        self.signature = signature
+        self.directories_visited = 0
+        self._visit_lock = threading.Lock()
+
+    def _scan(self, path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """Returns the accepted files and subdirectories to visit of one directory."""
+        with self._visit_lock:
+            self.directories_visited += 1
+        if self.inventory is None:
+            accepted, subdirs, _ = self._list(path)
+            return accepted, subdirs
+
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+        signature = self.signature(path) if self.signature else None
+        cached = self.inventory.lookup(path, mtime_ns, signature)
+        if cached is not None:
+            accepted, subdirs, pruned = cached
+            return accepted, self._reprune(path, subdirs, pruned)
+        listed_at_ns = time.time_ns()
+        accepted, subdirs, pruned = self._list(path)
+        self.inventory.store(
+            path, mtime_ns, signature, accepted, subdirs, pruned, listed_at_ns
+        )
+        return accepted, subdirs
+
+    def _reprune(self, path: str, subdirs: List[str], pruned: List[str]) -> List[str]:
+        """
+        Prunes the subdirectories of a cached listing again, since vendor
+        marker files inside them can appear or vanish without changing the
+        mtime of path.
+        """
+        visit = []
+        for subdir in subdirs:
+            if not self.prune_dir(path, os.path.basename(subdir)):
+                visit.append(subdir)
+        for subdir in pruned:
+            if (
+                os.path.isdir(subdir)
+                and not os.path.islink(subdir)
+                and not self.prune_dir(path, os.path.basename(subdir))
+            ):
+                visit.append(subdir)
+        return visit
+
+    def _list(self, path: str) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
+        """
+        Lists one directory, returning its accepted files, the subdirectories
+        to visit and the pruned ones.
+        """
+        accepted = []
+        subdirs = []
+        pruned = []
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            # * os.walk silently skips unreadable directories, so do we
+            return accepted, subdirs, pruned
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                if self.prune_dir(path, entry.name):
+                    pruned.append(entry.path)
+                    continue
+                try:
+                    is_symlink = entry.is_symlink()
+                except OSError:
+                    is_symlink = False
+                if not is_symlink:
+                    subdirs.append(entry.path)
+                continue
+            lang = self.classify_file(entry.path)
+            if lang:
+                accepted.append((entry.path, lang))
+        return accepted, subdirs, pruned
+
+    def iter_walk(self, top: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (file_path, language) pairs found under top as soon as their
+        directory has been listed. The order depends on thread scheduling.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="enforcer-walk"
+        ) as pool:
+            pending = {pool.submit(self._scan, top)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    accepted, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(pool.submit(self._scan, subdir))
+                    yield from accepted
+
+    def walk(self, top: str) -> List[Tuple[str, str]]:
+        """Returns a sorted list of (file_path, language) pairs found under top."""
+        return sorted(self.iter_walk(top))
+
+
+def git_ls_files(
+    path: str, timeout: Optional[int] = GIT_TIMEOUT
+) -> Optional[List[str]]:
+    """
+    Lists tracked and untracked, non-ignored files under path with a single
+    ``git ls-files`` call. Files deleted from the working tree are dropped.
+
+    Returns None when path is not inside a git checkout or git is unavailable,
+    so the caller can fall back to walking the directory.
+    """
+    if not get_git_root(cwd=path, timeout=timeout):
+        return None
+    try:
+        result = run_command(
+            [
+                "git",
+                "ls-files",
+                "-z",
+                "-t",
+                "--cached",
+                "--others",
+                "--deleted",
+                "--exclude-standard",
+            ],
+            return_output=True,
+            check=True,
+            cwd=path,
+            timeout=timeout,
+        )
+    except (
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+        FileNotFoundError,
+    ):
+        return None
+
+    listed = []
+    deleted = set()
+    for record in result.stdout.split("\0"):
+        if not record:
+            continue
+        # * Each record is "<status tag> <path relative to cwd>"
+        tag, _, rel_path = record.partition(" ")
+        if rel_path.endswith("/"):
+            # Untracked nested repository, git does not list its contents
+            continue
+        if tag == "R":
+            deleted.add(rel_path)
+        else:
+            listed.append(rel_path)
+
+    return [
+        os.path.normpath(os.path.join(path, rel_path))
+        for rel_path in listed
+        if rel_path not in deleted
+    ]
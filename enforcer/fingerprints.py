@@ -0,0 +1,148 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from .inventory import RACY_WINDOW_NS
+
+FINGERPRINTS_FILENAME = "fingerprints.json"
+FINGERPRINTS_VERSION = 1
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Returns the SHA-1 hex digest of a file's contents, read through mmap."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                # * hashlib releases the GIL on large buffers, so threads hashing
+                # mapped files run in parallel
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    digest.update(data)
+    except (OSError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+class FingerprintIndex:
+    """
+    Persistent map from files to content hashes, stored in .enforcer/.
+
+    Each entry keeps the (size, mtime_ns, inode) stat tuple the hash was
+    computed for, so a file is only rehashed when its stat tuple changes.
+    Like git's index, an entry whose mtime falls within RACY_WINDOW_NS of
+    the moment it was hashed is "racily clean": a same-tick write could
+    leave the stat tuple unchanged, so such entries are never trusted and
+    are rehashed on every lookup until they age out of the window.
+
+    Use ``FingerprintIndex.for_root`` to get the instance shared by the
+    Enforcer and plugins for a project root.
+    """
+
+    _shared: Dict[str, "FingerprintIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root_path: str, path: str, max_workers: Optional[int] = None):
+        self.root_path = os.path.abspath(root_path)
+        self.path = path
+        self.max_workers = max_workers
+        self.entries: Dict[str, list] = {}
+        self.loaded = False
+        self.dirty = False
+        self.hashed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_root(cls, root_path: str) -> "FingerprintIndex":
+        """Returns the shared index of root_path, loaded lazily on first use."""
+        root_path = os.path.abspath(root_path)
+        with cls._shared_lock:
+            index = cls._shared.get(root_path)
+            if index is None:
+                path = os.path.join(root_path, ".enforcer", FINGERPRINTS_FILENAME)
+                index = cls._shared[root_path] = cls(root_path, path)
+        return index
+
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if (
+                    isinstance(data, dict)
+                    and data.get("version") == FINGERPRINTS_VERSION
+                ):
+                    self.entries = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+            self.loaded = True
+
+    def _key(self, file_path: str) -> str:
+        return os.path.relpath(os.path.abspath(file_path), self.root_path).replace(
+            os.sep, "/"
+        )
+
+    def _lookup(self, file_path: str) -> Optional[str]:
+        """Returns the digest of file_path, hashing it only when needed."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        key = self._key(file_path)
+        stat_tuple = [st.st_size, st.st_mtime_ns, st.st_ino]
+        entry = self.entries.get(key)
+        if entry is not None and entry[:3] == stat_tuple:
+            return entry[3]
+
+        hashed_at_ns = time.time_ns()
+        digest = hash_file(file_path)
+        with self._lock:
+            self.hashed += 1
+            if digest is None or st.st_mtime_ns >= hashed_at_ns - RACY_WINDOW_NS:
+                # * Racily clean, rehash next time instead of trusting the stat
+                if self.entries.pop(key, None) is not None:
+                    self.dirty = True
+            else:
+                self.entries[key] = stat_tuple + [digest]
+                self.dirty = True
+        return digest
+
+    def fingerprint(self, file_path: str) -> Optional[str]:
+        """Returns the content hash of a file, or None if it cannot be read."""
+        self._ensure_loaded()
+        return self._lookup(file_path)
+
+    def fingerprints(self, file_paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Returns content hashes for many files, hashing on a thread pool."""
+        self._ensure_loaded()
+        file_paths = list(file_paths)
+        if len(file_paths) < 2:
+            return {path: self._lookup(path) for path in file_paths}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="enforcer-hash"
+        ) as pool:
+            return dict(zip(file_paths, pool.map(self._lookup, file_paths)))
+
+    def save(self):
+        """Writes the index if it changed, replacing the file atomically."""
+        if not self.dirty:
+            return
+        with self._lock:
+            data = {"version": FINGERPRINTS_VERSION, "files": self.entries}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                # * The index is only a cache, a failed write is not fatal
+                pass
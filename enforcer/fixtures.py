@@ -0,0 +1,129 @@
+import os
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+# * Common fixture directory patterns across languages
+FIXTURE_DIRECTORY_PATTERNS = (
+    # Python patterns
+    "testdata",
+    "test_fixtures",
+    "fixtures",
+    # JavaScript/TypeScript patterns
+    "__fixtures__",
+    "mocks",
+    # Kotlin patterns (already covered by testdata/fixtures)
+    # C# patterns
+    "TestData",
+    "Fixtures",
+    "Resources",
+)
+
+# * Parent path markers that indicate we're inside a test directory
+TEST_DIRECTORY_MARKERS = ("test", "tests", "spec", "specs", "__test__", "__tests__")
+
+# * Additional directory name fragments treated as fixtures inside test directories
+NESTED_FIXTURE_FRAGMENTS = ("fixture", "testdata", "mock", "stub", "data")
+
+# * Common fixture file patterns
+FIXTURE_FILE_PATTERNS = (
+    # Python fixtures
+    "fixture",
+    "mock",
+    "stub",
+    "testdata",
+    # JavaScript/TypeScript fixtures
+    "__fixtures__",
+    # General patterns
+    "sample",
+    "example",
+    "demo",
+)
+
+# * File name markers of real test files, which are never treated as fixtures
+TEST_FILE_MARKERS = ("test_", "_test", ".test.", ".spec.", "_spec")
+
+
+def _substring_regex(fragments: Iterable[str]):
+    """Compiles "any fragment occurs in the string" into a single regex search."""
+    return re.compile("|".join(re.escape(fragment) for fragment in fragments))
+
+
+class FixtureClassifier:
+    """
+    Decides whether directories and files are test fixtures.
+
+    All pattern sets are compiled once from the configuration, and directory
+    decisions are memoized, so classifying every file in a directory costs
+    one lookup for the directory plus one regex search on the file name.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        custom_directories: Iterable[str] = (),
+        custom_files: Iterable[str] = (),
+    ):
+        # * When disabled (check_fixtures=True), nothing is a fixture
+        self.enabled = enabled
+        self._directory_names = frozenset(
+            pattern.lower()
+            for pattern in list(FIXTURE_DIRECTORY_PATTERNS) + list(custom_directories)
+        )
+        self._test_directory = _substring_regex(TEST_DIRECTORY_MARKERS)
+        self._nested_fixture = _substring_regex(NESTED_FIXTURE_FRAGMENTS)
+        self._test_file = _substring_regex(TEST_FILE_MARKERS)
+        self._fixture_file = _substring_regex(
+            list(FIXTURE_FILE_PATTERNS) + list(custom_files)
+        )
+        self._directory_cache: Dict[Tuple[str, str], bool] = {}
+        self._parent_cache: Dict[str, bool] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "FixtureClassifier":
+        config = config or {}
+        custom = config.get("custom_fixture_patterns", {})
+        return cls(
+            enabled=not config.get("check_fixtures", False),
+            custom_directories=custom.get("directories", []),
+            custom_files=custom.get("files", []),
+        )
+
+    def is_fixture_directory(self, dirname: str, parent_path: str) -> bool:
+        """Check if a directory should be excluded as a test fixture directory."""
+        if not self.enabled:
+            return False
+
+        key = (dirname, parent_path)
+        decision = self._directory_cache.get(key)
+        if decision is None:
+            dirname_lower = dirname.lower()
+            # * Direct name matches (case-insensitive), or fixture-like names
+            # nested inside a test directory
+            decision = dirname_lower in self._directory_names or bool(
+                self._test_directory.search(parent_path.lower())
+                and self._nested_fixture.search(dirname_lower)
+            )
+            self._directory_cache[key] = decision
+        return decision
+
+    def is_fixture_file(self, file_path: str) -> bool:
+        """Check if a file should be excluded as a test fixture file."""
+        if not self.enabled:
+            return False
+
+        dir_path, file_name = os.path.split(file_path)
+        # * If the file is in a fixture directory, exclude it
+        in_fixture_dir = self._parent_cache.get(dir_path)
+        if in_fixture_dir is None:
+            in_fixture_dir = self.is_fixture_directory(
+                os.path.basename(dir_path), os.path.dirname(dir_path)
+            )
+            self._parent_cache[dir_path] = in_fixture_dir
+        if in_fixture_dir:
+            return True
+
+        file_name = file_name.lower()
+        # * If it's clearly a test file, don't exclude it
+        if self._test_file.search(file_name):
+            return False
+        return bool(self._fixture_file.search(file_name))
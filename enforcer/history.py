@@ -0,0 +1,228 @@
+import json
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+HISTORY_FILENAME = "history.json"
+HISTORY_VERSION = 1
+
+# * Weight of the newest sample in the per-file cost moving average
+SMOOTHING = 0.3
+
+# * Lint step durations kept per tool, newest last
+MAX_SAMPLES = 50
+
+# * Comparable samples needed before percentiles set timeouts or flag
+# regressions
+MIN_SAMPLES = 5
+
+# * Samples count as comparable when their file count is within this factor
+# of the current run's
+COMPARABLE_FILE_RATIO = 4
+
+# * Adaptive timeouts are this multiple of the p95 duration, and never
+# shorter than MIN_TIMEOUT_SECONDS
+TIMEOUT_FACTOR = 4.0
+MIN_TIMEOUT_SECONDS = 60.0
+
+# * Timeout of tools without enough history, and of the auto-fixers
+DEFAULT_TOOL_TIMEOUT = 1800
+
+# * A step regressed when it took this multiple of its p95, and at least
+# REGRESSION_MIN_SECONDS, so that noise on quick tools is not flagged
+REGRESSION_FACTOR = 2.0
+REGRESSION_MIN_SECONDS = 1.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Returns the nearest-rank q-th percentile (0-100) of values."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class ToolHistory:
+    """
+    Persistent per-tool run statistics, stored in .enforcer/.
+
+    For every tool it keeps an exponential moving average of the seconds
+    spent per input file and command run, which the sharding layer uses to
+    size shards, and the durations of the last MAX_SAMPLES lint steps with
+    their file counts. The core uses the p50 of the step durations to order
+    steps and to skip steps that cannot finish before a deadline, the p95 to
+    set adaptive timeouts, and flags steps that take much longer than usual.
+    Timeouts and regressions only use samples of a comparable file count,
+    and durations of per-file tools are scaled by file count.
+    Use ``ToolHistory.for_root`` to get the instance shared by the
+    Enforcer and plugins for a project root.
+    """
+
+    _shared: Dict[str, "ToolHistory"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tools: Dict[str, dict] = {}
+        self.loaded = False
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_root(cls, root_path: str) -> "ToolHistory":
+        """Returns the shared history of root_path, loaded lazily on first use."""
+        root_path = os.path.abspath(root_path)
+        with cls._shared_lock:
+            history = cls._shared.get(root_path)
+            if history is None:
+                path = os.path.join(root_path, ".enforcer", HISTORY_FILENAME)
+                history = cls._shared[root_path] = cls(path)
+        return history
+
+    def _ensure_loaded(self):
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == HISTORY_VERSION:
+                    self.tools = data.get("tools", {})
+            except (OSError, ValueError):
+                pass
+            self.loaded = True
+
+    def cost(self, tool: str) -> Optional[float]:
+        """Returns the average seconds per file of a tool, or None if never run."""
+        self._ensure_loaded()
+        return self.tools.get(tool, {}).get("seconds_per_file")
+
+    def record(self, tool: str, file_count: int, seconds: float):
+        """Adds a run of tool over file_count files that took seconds in total."""
+        if file_count <= 0:
+            return
+        self._ensure_loaded()
+        sample = seconds / file_count
+        with self._lock:
+            entry = self.tools.setdefault(tool, {})
+            previous = entry.get("seconds_per_file")
+            entry["seconds_per_file"] = (
+                sample
+                if previous is None
+                else SMOOTHING * sample + (1 - SMOOTHING) * previous
+            )
+            entry["runs"] = entry.get("runs", 0) + 1
+            self.dirty = True
+
+    def _step_durations(
+        self, tool: str, file_count: int, whole_program: bool = False
+    ) -> Tuple[List[float], List[float]]:
+        """
+        Returns the durations of past steps of tool rescaled to file_count
+        files, as those of runs over a comparable file count and all of them.
+
+        Whole-program steps check the project whichever files they are given,
+        so their durations are taken as they are rather than per file.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            samples = list(self.tools.get(tool, {}).get("step_samples", []))
+        file_count = max(file_count, 1)
+
+        def duration(count, seconds):
+            return seconds if whole_program else seconds / max(count, 1) * file_count
+
+        comparable = [
+            duration(count, seconds)
+            for count, seconds in samples
+            if file_count / COMPARABLE_FILE_RATIO
+            <= count
+            <= file_count * COMPARABLE_FILE_RATIO
+        ]
+        return comparable, [duration(count, seconds) for count, seconds in samples]
+
+    def step_percentile(
+        self,
+        tool: str,
+        file_count: int,
+        q: float,
+        min_samples: int = 1,
+        whole_program: bool = False,
+    ) -> Optional[float]:
+        """
+        Returns the q-th percentile of the duration of a lint step of tool
+        over file_count files, or None with fewer than min_samples runs of a
+        comparable file count.
+        """
+        comparable, _ = self._step_durations(tool, file_count, whole_program)
+        if len(comparable) < max(min_samples, 1):
+            return None
+        return percentile(comparable, q)
+
+    def estimate(
+        self, tool: str, file_count: int, whole_program: bool = False
+    ) -> Optional[float]:
+        """
+        Returns the expected (p50) seconds of a lint step over file_count
+        files, from all past runs when none had a comparable file count.
+        """
+        comparable, durations = self._step_durations(tool, file_count, whole_program)
+        if not durations:
+            return None
+        return percentile(comparable or durations, 50)
+
+    def timeout(
+        self,
+        tool: str,
+        file_count: int,
+        factor: float = TIMEOUT_FACTOR,
+        whole_program: bool = False,
+    ) -> Optional[float]:
+        """
+        Returns the adaptive timeout of a lint step of tool over file_count
+        files, or None until it has run MIN_SAMPLES times over a comparable
+        file count.
+        """
+        p95 = self.step_percentile(tool, file_count, 95, MIN_SAMPLES, whole_program)
+        return None if p95 is None else max(MIN_TIMEOUT_SECONDS, factor * p95)
+
+    def record_step(
+        self, tool: str, file_count: int, seconds: float, whole_program: bool = False
+    ) -> Optional[float]:
+        """
+        Adds a finished lint step of tool over file_count files. Returns the
+        step's previous p95 duration if this run regressed sharply from it,
+        else None.
+        """
+        p95 = self.step_percentile(tool, file_count, 95, MIN_SAMPLES, whole_program)
+        with self._lock:
+            entry = self.tools.setdefault(tool, {})
+            samples = entry.setdefault("step_samples", [])
+            samples.append([file_count, round(seconds, 3)])
+            del samples[:-MAX_SAMPLES]
+            self.dirty = True
+        if (
+            p95 is not None
+            and seconds >= REGRESSION_MIN_SECONDS
+            and seconds > REGRESSION_FACTOR * p95
+        ):
+            return p95
+        return None
+
+    def save(self):
+        """Writes the history if it changed, replacing the file atomically."""
+        if not self.dirty:
+            return
+        with self._lock:
+            data = {"version": HISTORY_VERSION, "tools": self.tools}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError:
+                # * History only tunes performance, a failed write is not fatal
+                pass
@@ -0,0 +1,311 @@
+import os
+import re
+import stat
+from typing import Dict, List, Optional, Tuple
+
+# * Names that git itself never descends into, regardless of ignore rules
+ALWAYS_IGNORED_DIRS = {".git"}
+
+
+def _translate(pattern: str) -> str:
+    """
+    Translates a single gitignore glob (without negation, anchoring or
+    directory markers) into a regular expression source string.
+    """
+    i, n = 0, len(pattern)
+    res = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            at_segment_start = i == 0 or pattern[i - 1] == "/"
+            if pattern.startswith("**", i) and at_segment_start:
+                if i + 2 == n:
+                    # Trailing "/**" matches everything inside
+                    res.append(".*")
+                    i += 2
+                    continue
+                if pattern[i + 2] == "/":
+                    # Leading "**/" or middle "/**/" matches zero or more directories
+                    res.append("(?:.*/)?")
+                    i += 3
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            res.append("[^/]*")
+            continue
+        if c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                # No closing bracket, treat literally
+                res.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                res.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            res.append(re.escape(pattern[i]))
+        else:
+            res.append(re.escape(c))
+        i += 1
+    return "".join(res)
+
+
+def parse_rule(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Parses one line of an ignore file.
+
+    Returns a tuple of (regex source, negated, directory_only) or None for
+    blank lines and comments.
+    """
+    line = line.rstrip("\n").rstrip("\r")
+    # * Trailing spaces are ignored unless escaped with a backslash
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negated = False
+    if line.startswith("!"):
+        negated = True
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    if dir_only:
+        line = line.rstrip("/")
+    if not line:
+        return None
+
+    # * A separator at the beginning or middle anchors the pattern to the
+    # directory of the ignore file; otherwise it matches at any depth.
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return regex, negated, dir_only
+
+
+class RuleSet:
+    """
+    The compiled rules of a single ignore source.
+
+    Consecutive rules with the same polarity are merged into one alternation
+    regex, so matching costs one regex call per polarity run instead of one
+    per pattern. Runs are evaluated from last to first, which preserves the
+    "last matching pattern wins" semantics of gitignore.
+    """
+
+    def __init__(self, base: str, rules: List[Tuple[str, bool, bool]]):
+        # * base is the root-relative directory of the ignore source ("" for root)
+        self.base = base
+        self.prefix = base + "/" if base else ""
+        self.file_runs = self._compile_runs([r for r in rules if not r[2]])
+        self.dir_runs = self._compile_runs(rules)
+
+    @staticmethod
+    def _compile_runs(rules):
+        runs: List[Tuple[bool, List[str]]] = []
+        for regex, negated, _ in rules:
+            if runs and runs[-1][0] == negated:
+                runs[-1][1].append(regex)
+            else:
+                runs.append((negated, [regex]))
+        compiled = [
+            (negated, re.compile("(?:" + "|".join(regexes) + r")\Z", re.DOTALL))
+            for negated, regexes in runs
+        ]
+        compiled.reverse()
+        return compiled
+
+    def __bool__(self):
+        return bool(self.dir_runs)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Returns True if ignored, False if explicitly re-included, and None
+        if no rule of this source matches the path.
+        """
+        if self.prefix:
+            if not rel_path.startswith(self.prefix):
+                return None
+            rel_path = rel_path[len(self.prefix) :]
+        for negated, regex in self.dir_runs if is_dir else self.file_runs:
+            if regex.match(rel_path):
+                return not negated
+        return None
+
+    @classmethod
+    def from_file(cls, path: str, base: str) -> "RuleSet":
+        rules = []
+        try:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    rule = parse_rule(line)
+                    if rule:
+                        rules.append(rule)
+        except OSError:
+            pass
+        return cls(base, rules)
+
+
+class IgnoreMatcher:
+    """
+    Hierarchical, compiled replacement for a single-file gitignore matcher.
+
+    Sources are applied with git's precedence: ``.git/info/exclude`` first,
+    then the root ``.gitignore``, then every nested ``.gitignore`` down to the
+    directory containing the path, where deeper files override shallower
+    ones. Nested ignore files are loaded lazily the first time their
+    directory is consulted, and both the per-directory rule chains and the
+    per-directory ignore decisions are cached, so a walk pays for each
+    directory once instead of once per file it contains.
+
+    Instances are callable with a path, matching the interface of the
+    ``gitignore_parser`` matcher they replace.
+    """
+
+    def __init__(self, root_path: str, ignore_filename: str = ".gitignore"):
+        self.root_path = os.path.abspath(root_path)
+        self.ignore_filename = ignore_filename
+        self._rulesets: Dict[str, Optional[RuleSet]] = {}
+        self._chains: Dict[str, Tuple[RuleSet, ...]] = {}
+        self._dir_decisions: Dict[str, bool] = {}
+        # * (mtime_ns, size) of the ignore file in each directory, or None
+        self._source_stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._signatures: Dict[str, str] = {}
+
+        root_chain = []
+        exclude_path = os.path.join(self.root_path, ".git", "info", "exclude")
+        exclude_stat = self._stat_source(exclude_path)
+        if exclude_stat:
+            exclude = RuleSet.from_file(exclude_path, "")
+            if exclude:
+                root_chain.append(exclude)
+        root_rules = self._ruleset_for("")
+        if root_rules:
+            root_chain.append(root_rules)
+        self._chains[""] = tuple(root_chain)
+        self._dir_decisions[""] = False
+        self._signatures[""] = f"{exclude_stat}:{self._source_stats['']}"
+
+    @staticmethod
+    def _stat_source(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _ruleset_for(self, rel_dir: str) -> Optional[RuleSet]:
+        if rel_dir in self._rulesets:
+            return self._rulesets[rel_dir]
+        path = os.path.join(self.root_path, rel_dir, self.ignore_filename)
+        ruleset = None
+        source_stat = self._stat_source(path)
+        if source_stat:
+            ruleset = RuleSet.from_file(path, rel_dir.replace(os.sep, "/"))
+            if not ruleset:
+                ruleset = None
+        self._source_stats[rel_dir] = source_stat
+        self._rulesets[rel_dir] = ruleset
+        return ruleset
+
+    def _chain_for(self, rel_dir: str) -> Tuple[RuleSet, ...]:
+        chain = self._chains.get(rel_dir)
+        if chain is None:
+            parent = os.path.dirname(rel_dir)
+            chain = self._chain_for(parent)
+            ruleset = self._ruleset_for(rel_dir)
+            if ruleset:
+                chain = chain + (ruleset,)
+            self._chains[rel_dir] = chain
+        return chain
+
+    def _signature_for(self, rel_dir: str) -> str:
+        signature = self._signatures.get(rel_dir)
+        if signature is None:
+            parent_signature = self._signature_for(os.path.dirname(rel_dir))
+            self._ruleset_for(rel_dir)
+            own = self._source_stats[rel_dir]
+            signature = f"{parent_signature}|{own}" if own else parent_signature
+            self._signatures[rel_dir] = signature
+        return signature
+
+    def signature(self, dir_path: str) -> Optional[str]:
+        """
+        Returns a string that changes whenever any ignore file applying to
+        entries of dir_path is created, edited or removed, or None for
+        directories outside the root. Used to validate cached listings.
+        """
+        rel_dir = self._relative(dir_path)
+        if rel_dir is None:
+            return None
+        return self._signature_for(rel_dir)
+
+    def _relative(self, path: str) -> Optional[str]:
+        abs_path = os.path.abspath(path)
+        if abs_path == self.root_path:
+            return ""
+        root_prefix = self.root_path.rstrip(os.sep) + os.sep
+        if not abs_path.startswith(root_prefix):
+            return None
+        return abs_path[len(root_prefix) :]
+
+    def _match_in_chain(self, rel_path: str, rel_dir: str, is_dir: bool) -> bool:
+        posix_path = rel_path.replace(os.sep, "/") if os.sep != "/" else rel_path
+        # * Deeper sources take precedence, so evaluate the chain bottom-up
+        for ruleset in reversed(self._chain_for(rel_dir)):
+            decision = ruleset.match(posix_path, is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    def _is_dir_ignored(self, rel_dir: str) -> bool:
+        decision = self._dir_decisions.get(rel_dir)
+        if decision is None:
+            parent, name = os.path.split(rel_dir)
+            if name in ALWAYS_IGNORED_DIRS or self._is_dir_ignored(parent):
+                decision = True
+            else:
+                decision = self._match_in_chain(rel_dir, parent, True)
+            self._dir_decisions[rel_dir] = decision
+        return decision
+
+    def match(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """
+        Checks whether a path is ignored.
+
+        Pass ``is_dir`` when the caller already knows the entry type (as a
+        directory walk does) to avoid an extra stat call.
+        """
+        rel_path = self._relative(path)
+        if not rel_path:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        if is_dir:
+            return self._is_dir_ignored(rel_path)
+        parent = os.path.dirname(rel_path)
+        if self._is_dir_ignored(parent):
+            return True
+        return self._match_in_chain(rel_path, parent, False)
+
+    def __call__(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        return self.match(path, is_dir)
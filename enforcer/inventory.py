@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+INVENTORY_FILENAME = "inventory.json"
+INVENTORY_VERSION = 2
+
+# ! Directories modified this close to the time they are listed are not
+# cached: a change landing in the same mtime tick would otherwise be missed
+# (the "racy clean" problem git solves the same way for its index).
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class DirectoryInventory:
+    """
+    Persistent cache of classified directory listings, stored in .enforcer/.
+
+    Each entry maps a root-relative directory to its mtime, the signature of
+    the ignore files that apply to it, the subdirectories a walk descends
+    into, the subdirectories it pruned, and its accepted files grouped by
+    language. A walk may reuse an entry instead of listing the directory
+    when both the mtime and the ignore signature still match, but it prunes
+    the subdirectories again: creating or deleting a vendor marker file in
+    a subdirectory does not change the mtime of its parent.
+
+    The whole inventory is discarded when its ``fingerprint`` differs,
+    which callers derive from everything else that affects classification
+    (.gitmodules, fixture settings, registered languages, etc.).
+    """
+
+    def __init__(self, root_path: str, path: str, fingerprint: str):
+        self.root_path = os.path.abspath(root_path)
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, dict] = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        # * Walkers call lookup/store from several threads
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, root_path: str, path: str, fingerprint: str) -> "DirectoryInventory":
+        inventory = cls(root_path, path, fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return inventory
+        if (
+            isinstance(data, dict)
+            and data.get("version") == INVENTORY_VERSION
+            and data.get("fingerprint") == fingerprint
+        ):
+            inventory.entries = data.get("directories", {})
+        else:
+            # * Stale inventory, rewrite it on save
+            inventory.dirty = True
+        return inventory
+
+    def _key(self, dir_path: str) -> Optional[str]:
+        rel_path = os.path.relpath(dir_path, self.root_path)
+        if rel_path == os.curdir:
+            return ""
+        if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep):
+            return None
+        return rel_path.replace(os.sep, "/")
+
+    def lookup(
+        self, dir_path: str, mtime_ns: int, signature: Optional[str]
+    ) -> Optional[Tuple[List[Tuple[str, str]], List[str], List[str]]]:
+        """
+        Returns the cached (accepted files, subdirectories, pruned
+        subdirectories) of dir_path, with absolute paths, or None if there is
+        no valid entry.
+        """
+        key = self._key(dir_path)
+        entry = self.entries.get(key) if key is not None else None
+        with self._lock:
+            if (
+                entry is None
+                or entry.get("mtime") != mtime_ns
+                or entry.get("signature") != signature
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+        accepted = [
+            (os.path.join(dir_path, name), lang)
+            for lang, names in entry["files"].items()
+            for name in names
+        ]
+        subdirs = [os.path.join(dir_path, name) for name in entry["dirs"]]
+        pruned = [os.path.join(dir_path, name) for name in entry["pruned"]]
+        return accepted, subdirs, pruned
+
+    def store(
+        self,
+        dir_path: str,
+        mtime_ns: int,
+        signature: Optional[str],
+        accepted: List[Tuple[str, str]],
+        subdirs: List[str],
+        pruned: List[str],
+        listed_at_ns: Optional[int] = None,
+    ):
+        """Records a fresh listing of dir_path."""
+        key = self._key(dir_path)
+        if key is None:
+            return
+        listed_at_ns = listed_at_ns or time.time_ns()
+        if mtime_ns >= listed_at_ns - RACY_WINDOW_NS:
+            # * Too recent to trust, drop any entry and re-list next time
+            with self._lock:
+                if self.entries.pop(key, None) is not None:
+                    self.dirty = True
+            return
+
+        files: Dict[str, List[str]] = {}
+        for file_path, lang in accepted:
+            files.setdefault(lang, []).append(os.path.basename(file_path))
+        dirs = sorted(os.path.basename(d) for d in subdirs)
+
+        with self._lock:
+            previous = self.entries.get(key)
+            if previous is not None:
+                self._forget_removed_subdirs(key, previous.get("dirs", []), dirs)
+            self.entries[key] = {
+                "mtime": mtime_ns,
+                "signature": signature,
+                "dirs": dirs,
+                "pruned": sorted(os.path.basename(d) for d in pruned),
+                "files": files,
+            }
+            self.dirty = True
+
+    def _forget_removed_subdirs(
+        self, key: str, old_dirs: List[str], new_dirs: List[str]
+    ):
+        removed = set(old_dirs) - set(new_dirs)
+        if not removed:
+            return
+        prefixes = tuple(f"{key}/{name}" if key else name for name in removed)
+        for entry_key in list(self.entries):
+            for prefix in prefixes:
+                if entry_key == prefix or entry_key.startswith(prefix + "/"):
+                    del self.entries[entry_key]
+                    break
+
+    def save(self):
+        """Writes the inventory if it changed, replacing the file atomically."""
+        if not self.dirty:
+            return
+        data = {
+            "version": INVENTORY_VERSION,
+            "fingerprint": self.fingerprint,
+            "directories": self.entries,
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            # * The inventory is only a cache, a failed write is not fatal
+            pass
@@ -0,0 +1,125 @@
+import os
+import re
+import signal
+import subprocess
+from typing import Callable, NamedTuple, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    # * Windows has no rlimits
+    resource = None
+
+# * Seconds of CPU time a tool gets after SIGXCPU before the kernel kills it
+CPU_KILL_GRACE_SECONDS = 5
+
+# * Messages of runtimes that failed to allocate under an address space limit
+_OUT_OF_MEMORY = re.compile(
+    r"MemoryError|out of memory|OutOfMemoryError|bad_alloc"
+    r"|Cannot allocate memory|Could not reserve enough space",
+    re.IGNORECASE,
+)
+
+
+class ResourceLimitExceeded(subprocess.SubprocessError):
+    """Raised by run_command when a tool was stopped by its resource limits."""
+
+
+class ResourceLimits(NamedTuple):
+    """
+    Resource policy of the commands of one tool, applied in the child
+    process before the tool starts.
+
+    ``nice`` is added to the niceness, ``max_memory_mb`` bounds the address
+    space (RLIMIT_AS) and ``max_cpu_seconds`` the CPU time (RLIMIT_CPU) of
+    each process, and ``cpus`` restricts it to those CPU indices. A value of
+    0 or None leaves that resource alone. Limits are only applied on POSIX;
+    affinity also needs ``os.sched_setaffinity`` (Linux).
+    """
+
+    nice: int = 0
+    max_memory_mb: int = 0
+    max_cpu_seconds: int = 0
+    cpus: Optional[Tuple[int, ...]] = None
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[dict], tool: str
+    ) -> Optional["ResourceLimits"]:
+        """
+        Returns the limits of tool from the "resource_limits" config key,
+        where its entry overrides the "default" one, or None if it has none.
+        """
+        policies = (config or {}).get("resource_limits", {})
+        policy = {**policies.get("default", {}), **policies.get(tool, {})}
+        limits = cls(
+            nice=policy.get("nice", 0),
+            max_memory_mb=policy.get("max_memory_mb", 0),
+            max_cpu_seconds=policy.get("max_cpu_seconds", 0),
+            cpus=tuple(policy["cpus"]) if policy.get("cpus") else None,
+        )
+        return limits if any(limits) else None
+
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """Returns the function that applies the limits in the child, if supported."""
+        if os.name != "posix":
+            return None
+        return self._apply
+
+    def _apply(self):
+        # ! Runs in the forked child: only plain system calls, and a limit
+        # that cannot be applied must not keep the tool from running
+        try:
+            if self.nice:
+                os.nice(self.nice)
+            if resource is not None and self.max_memory_mb:
+                _set_rlimit(resource.RLIMIT_AS, self.max_memory_mb * 1024 * 1024)
+            if resource is not None and self.max_cpu_seconds:
+                _set_rlimit(
+                    resource.RLIMIT_CPU,
+                    self.max_cpu_seconds,
+                    self.max_cpu_seconds + CPU_KILL_GRACE_SECONDS,
+                )
+            if self.cpus and hasattr(os, "sched_setaffinity"):
+                cpus = set(self.cpus) & os.sched_getaffinity(0)
+                if cpus:
+                    os.sched_setaffinity(0, cpus)
+        except (OSError, ValueError):
+            pass
+
+    def check(self, cmd_str: str, returncode: Optional[int], stderr: str):
+        """
+        Raises ResourceLimitExceeded if a finished process hit one of the limits.
+
+        Only called for processes the Enforcer did not kill itself: commands
+        it stops on a timeout or cancellation raise TimeoutExpired or
+        CommandCancelled first, so their SIGKILL is never blamed on a limit.
+        """
+        if not returncode or os.name != "posix":
+            return
+        # * SIGKILL comes from the RLIMIT_CPU hard limit once a tool ignored
+        # SIGXCPU; RLIMIT_AS only makes allocations fail, so a SIGKILL under a
+        # memory limit alone is the system's OOM killer or someone else
+        if self.max_cpu_seconds and returncode in (-signal.SIGXCPU, -signal.SIGKILL):
+            raise ResourceLimitExceeded(
+                f"Command exceeded its CPU time limit of {self.max_cpu_seconds}s "
+                f"(resource_limits): {cmd_str}"
+            )
+        if self.max_memory_mb and (
+            returncode in (-signal.SIGABRT, -signal.SIGSEGV)
+            or _OUT_OF_MEMORY.search(stderr or "")
+        ):
+            raise ResourceLimitExceeded(
+                f"Command ran out of memory under its limit of {self.max_memory_mb} MB "
+                f"(resource_limits): {cmd_str}"
+            )
+
+
+def _set_rlimit(which: int, soft: int, hard: Optional[int] = None):
+    _, current_hard = resource.getrlimit(which)
+    hard = soft if hard is None else hard
+    if current_hard != resource.RLIM_INFINITY:
+        # * An unprivileged process cannot raise its hard limit
+        hard = min(hard, current_hard)
+        soft = min(soft, hard)
+    resource.setrlimit(which, (soft, hard))
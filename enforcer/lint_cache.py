@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+CACHE_DIRNAME = "cache"
+
+# * Default bound of the cache directory, evicted least recently used first
+DEFAULT_MAX_SIZE_MB = 64
+
+
+def scope_key(*parts) -> str:
+    """Returns a digest of everything besides file content that results depend on."""
+    data = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+class LintCache:
+    """
+    Per-file lint results stored under .enforcer/cache/.
+
+    An entry holds the parsed issues of one file and is keyed by the file's
+    path, its content digest and a scope key covering the Enforcer version,
+    tool versions and configuration (see ``scope_key``). Entries are never
+    invalidated explicitly: any change produces a different key, and stale
+    entries age out through size-bounded LRU eviction in ``prune``. A hit
+    refreshes the entry's mtime, which eviction uses as its recency.
+    """
+
+    def __init__(
+        self, directory: str, max_size_mb: int = DEFAULT_MAX_SIZE_MB, enabled=True
+    ):
+        self.directory = directory
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, root_path: str, config: Optional[dict]) -> "LintCache":
+        config = config or {}
+        return cls(
+            os.path.join(root_path, ".enforcer", CACHE_DIRNAME),
+            max_size_mb=config.get("lint_cache_size_mb", DEFAULT_MAX_SIZE_MB),
+            enabled=config.get("lint_cache", True),
+        )
+
+    def _path(self, scope: str, file_key: str, digest: str) -> str:
+        key = hashlib.sha1(f"{scope}\0{file_key}\0{digest}".encode("utf-8"))
+        name = key.hexdigest()
+        return os.path.join(self.directory, name[:2], f"{name}.json")
+
+    def get(self, scope: str, file_key: str, digest: str) -> Optional[dict]:
+        """Returns the cached issues of a file, or None on a miss."""
+        path = self._path(scope, file_key, digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, scope: str, file_key: str, digest: str, issues: dict):
+        """Stores the issues of a file, replacing the entry atomically."""
+        path = self._path(scope, file_key, digest)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(issues, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError:
+            # * The cache only saves time, a failed write is not fatal
+            pass
+
+    def prune(self):
+        """Evicts least recently used entries until the cache fits its bound."""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.directory) as buckets:
+                for bucket in buckets:
+                    if not bucket.is_dir():
+                        continue
+                    with os.scandir(bucket.path) as it:
+                        for entry in it:
+                            st = entry.stat()
+                            entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                            total += st.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
@@ -4,6 +4,7 @@ import sys
 
 from .config import load_config, save_config
 from .core import Enforcer
+from .profiles import get_profile
 from .utils import get_git_modified_files
 
 import importlib.metadata
@@ -24,6 +25,8 @@ Examples:
   agent-enforcer --ignore python:E501,js_ts:no-console  # Disable multiple rules
   agent-enforcer --verbose       # Show all issues in detail
   agent-enforcer --modified      # Check only files modified in git status
+  agent-enforcer --fail-fast     # Stop as soon as any error is found
+  agent-enforcer --profile full  # Also build and run the tests
 """
         ),
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -77,6 +80,25 @@ Examples:
         action="store_true",
         help="Check only files modified in git status.",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error and cancel the tools that are still running.",
+    )
+    parser.add_argument(
+        "--max-issues",
+        type=int,
+        metavar="N",
+        help="Stop once N issues have been found and cancel the remaining tools.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="NAME",
+        help=(
+            "Tool profile to run: fast, standard (default), full, "
+            "or one defined in config.json."
+        ),
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -156,6 +178,17 @@ Examples:
                 disabled.setdefault(lang, []).append(r)
             else:
                 disabled.setdefault("global", []).append(rule)
+    if args.fail_fast:
+        config["fail_fast"] = True
+    if args.max_issues:
+        config["max_issues"] = args.max_issues
+    if args.profile:
+        config["profile"] = args.profile
+    try:
+        get_profile(config)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
     enforcer = Enforcer(root_path, target_paths, config, verbose=args.verbose)
     result_output = enforcer.run_checks()
     if result_output:
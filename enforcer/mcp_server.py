@@ -1,14 +1,15 @@
+import asyncio
 import json
 import os
 import platform
 import re
+import time
 import urllib.parse
 import urllib.request
 import ntpath
 import posixpath
 from typing import Any, List, Optional
 
-import anyio
 from fastmcp import FastMCP
 from fastmcp.exceptions import NotFoundError
 from fastmcp.prompts.prompt import FunctionPrompt, Message
@@ -22,8 +23,13 @@ from pydantic import AnyUrl, Field
 
 from .config import load_config
 from .core import Enforcer
+from .profiles import DEFAULT_AGENT_PROFILE, get_profile
 from .utils import get_git_modified_files, get_git_root
 
+# ! Enforcer changes the working directory of the process, which its tools
+# run in, so the checks of concurrent requests must not overlap
+_check_lock = asyncio.Lock()
+
 
 def _uri_to_path(uri: str) -> str:
     """
@@ -55,6 +61,9 @@ async def check_code_dynamic(
     timeout_seconds: int = 0,
     debug: bool = False,
     root: Optional[str] = None,
+    fail_fast: bool = False,
+    max_issues: int = 0,
+    profile: Optional[str] = None,
 ) -> dict:
     """Runs a quality check on the specified files with dynamic config loading.
 
@@ -62,9 +71,12 @@ async def check_code_dynamic(
         resource_uris (Optional[List[str]], optional): A list of file URIs to check. If omitted, the entire repository is checked. Ex: ["file:///G:/path/to/file.py"]. Defaults to None.
         check_git_modified_files (bool, optional): If true, ignores resource_uris and checks only the files modified in git. Defaults to False.
         verbose (bool, optional): If true, provides a detailed, file-by-file list of every issue. Essential for seeing specific error messages. Defaults to False.
-        timeout_seconds (int, optional): The timeout for the check in seconds. Set to 0 to disable the timeout entirely. Defaults to 0.
+        timeout_seconds (int, optional): The timeout for the check in seconds. When it is reached, the results completed so far are returned with "partial": true and the tools that did not run under "skipped_steps". Set to 0 to disable the timeout entirely. Defaults to 0.
         debug (bool, optional): If true, enables debug mode for more verbose logs. Defaults to False.
         root (Optional[str], optional): The absolute path to the repository root. If omitted, attempts to auto-detect via git. If detection fails (e.g., not in a git repo), an error is returned requiring the parameter. Defaults to None.
+        fail_fast (bool, optional): If true, stops at the first error and cancels the tools still running. Use it when you only need to know whether any error exists. Results are then incomplete. Defaults to False.
+        max_issues (int, optional): If above 0, stops once this many issues have been found and cancels the remaining tools. Defaults to 0.
+        profile (Optional[str], optional): The tool profile to run: "fast" (formatters, flake8/eslint/ktlint and the syntax check), "standard" (all linters and type checkers) or "full" (also builds and runs the tests), or a profile defined in config.json. Defaults to the "agent_profile" config key, which defaults to "fast".
 
     Returns:
         dict: A dictionary containing the results of the check, with keys like 'errors', 'warnings', and 'messages'.
@@ -78,6 +90,12 @@ async def check_code_dynamic(
 
         - Check only the files I've changed:
           {"check_git_modified_files": true, "verbose": true}
+
+        - Only find out whether the changed files have any error:
+          {"check_git_modified_files": true, "fail_fast": true}
+
+        - Run every linter and type checker, as CI does:
+          {"check_git_modified_files": true, "profile": "standard"}
     """
     try:
         # Determine root first to load config
@@ -91,7 +109,7 @@ async def check_code_dynamic(
                 pass
 
             if not root:
-                git_root = get_git_root(timeout=5)
+                git_root = await asyncio.to_thread(get_git_root, timeout=5)
                 if git_root and os.path.isdir(git_root):
                     root = git_root
                 else:
@@ -112,6 +130,9 @@ async def check_code_dynamic(
                 timeout_seconds=timeout_seconds,
                 debug=debug,  # Pass through the debug parameter
                 root=root,
+                fail_fast=fail_fast,
+                max_issues=max_issues,
+                profile=profile,
             )
         else:
             return await check_code_no_debug(
@@ -120,6 +141,9 @@ async def check_code_dynamic(
                 verbose=verbose,
                 timeout_seconds=timeout_seconds,
                 root=root,
+                fail_fast=fail_fast,
+                max_issues=max_issues,
+                profile=profile,
             )
     except Exception as e:
         import traceback
@@ -136,6 +160,9 @@ async def check_code_no_debug(
     verbose: bool = False,
     timeout_seconds: int = 0,
     root: Optional[str] = None,
+    fail_fast: bool = False,
+    max_issues: int = 0,
+    profile: Optional[str] = None,
 ) -> dict:
     """Runs a quality check on the specified files (production version without debug).
 
@@ -143,8 +170,11 @@ async def check_code_no_debug(
         resource_uris (Optional[List[str]], optional): A list of file URIs to check. If omitted, the entire repository is checked. Ex: ["file:///G:/path/to/file.py"]. Defaults to None.
         check_git_modified_files (bool, optional): If true, ignores resource_uris and checks only the files modified in git. Defaults to False.
         verbose (bool, optional): If true, provides a detailed, file-by-file list of every issue. Essential for seeing specific error messages. Defaults to False.
-        timeout_seconds (int, optional): The timeout for the check in seconds. Set to 0 to disable the timeout entirely. Defaults to 0.
+        timeout_seconds (int, optional): The timeout for the check in seconds. When it is reached, the results completed so far are returned with "partial": true and the tools that did not run under "skipped_steps". Set to 0 to disable the timeout entirely. Defaults to 0.
         root (Optional[str], optional): The absolute path to the repository root. If omitted, attempts to auto-detect via git. If detection fails (e.g., not in a git repo), an error is returned requiring the parameter. Defaults to None.
+        fail_fast (bool, optional): If true, stops at the first error and cancels the tools still running. Use it when you only need to know whether any error exists. Results are then incomplete. Defaults to False.
+        max_issues (int, optional): If above 0, stops once this many issues have been found and cancels the remaining tools. Defaults to 0.
+        profile (Optional[str], optional): The tool profile to run: "fast" (formatters, flake8/eslint/ktlint and the syntax check), "standard" (all linters and type checkers) or "full" (also builds and runs the tests), or a profile defined in config.json. Defaults to the "agent_profile" config key, which defaults to "fast".
 
     Returns:
         dict: A dictionary containing the results of the check, with keys like 'errors', 'warnings', and 'messages'.
@@ -158,6 +188,12 @@ async def check_code_no_debug(
 
         - Check only the files I've changed:
           {"check_git_modified_files": true, "verbose": true}
+
+        - Only find out whether the changed files have any error:
+          {"check_git_modified_files": true, "fail_fast": true}
+
+        - Run every linter and type checker, as CI does:
+          {"check_git_modified_files": true, "profile": "standard"}
     """
     return await check_code(
         resource_uris=resource_uris,
@@ -166,6 +202,9 @@ async def check_code_no_debug(
         timeout_seconds=timeout_seconds,
         debug=False,
         root=root,
+        fail_fast=fail_fast,
+        max_issues=max_issues,
+        profile=profile,
     )
 
 
@@ -194,6 +233,9 @@ async def check_code(
     timeout_seconds: int = 0,
     debug: bool = False,
     root: Optional[str] = None,
+    fail_fast: bool = False,
+    max_issues: int = 0,
+    profile: Optional[str] = None,
 ) -> dict:
     """Runs a quality check on the specified files.
 
@@ -204,6 +246,9 @@ async def check_code(
         timeout_seconds (int, optional): The timeout for the check in seconds. 0 means no timeout. Defaults to 0.
         debug (bool, optional): If true, enables debug mode for more verbose logs. Defaults to False.
         root (Optional[str], optional): The absolute path to the repository root. If not provided, it's auto-detected. Defaults to None.
+        fail_fast (bool, optional): If true, cancels the check at the first error. Defaults to False.
+        max_issues (int, optional): If above 0, cancels the check once this many issues are found. Defaults to 0.
+        profile (Optional[str], optional): The tool profile to run. Defaults to the "agent_profile" config key.
     """
     try:
         # Determine root
@@ -218,7 +263,7 @@ async def check_code(
                 pass
 
             if not root:
-                git_root = get_git_root(timeout=5)
+                git_root = await asyncio.to_thread(get_git_root, timeout=5)
                 if git_root and os.path.isdir(git_root):
                     root = git_root
                 else:
@@ -235,29 +280,39 @@ async def check_code(
             git_timeout = (
                 15 if timeout_seconds == 0 or timeout_seconds > 15 else timeout_seconds
             )
-            target_paths = get_git_modified_files(cwd=root, timeout=git_timeout)
+            # * Off the loop thread, so other requests are served meanwhile
+            target_paths = await asyncio.to_thread(
+                get_git_modified_files, cwd=root, timeout=git_timeout
+            )
             if not target_paths:
                 return {"messages": ["No modified files to check."]}
         elif resource_uris:
             target_paths = [str(uri).removeprefix("file:///") for uri in resource_uris]
 
         config = load_config(root)
-        enforcer = Enforcer(
-            root_path=root,
-            target_paths=target_paths,
-            config=config,
-            verbose=verbose,
+        if fail_fast:
+            config["fail_fast"] = True
+        if max_issues:
+            config["max_issues"] = max_issues
+        config["profile"] = profile or config.get(
+            "agent_profile", DEFAULT_AGENT_PROFILE
         )
-
-        # If timeout, run with anyio timeout
-        if timeout_seconds > 0:
-            try:
-                with anyio.fail_after(timeout_seconds):
-                    return enforcer.run_checks_structured()
-            except TimeoutError:
-                return {"error": f"Check timed out after {timeout_seconds} seconds."}
-        else:
-            return enforcer.run_checks_structured()
+        try:
+            get_profile(config)
+        except ValueError as e:
+            return {"error": str(e)}
+        # * The orchestrator enforces the timeout itself and returns the
+        # results completed by then, flagged as partial. Time spent waiting
+        # for another check counts towards it.
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds > 0 else None
+        async with _check_lock:
+            enforcer = Enforcer(
+                root_path=root,
+                target_paths=target_paths,
+                config=config,
+                verbose=verbose,
+            )
+            return await enforcer.run_checks_structured_async(deadline=deadline)
     except Exception as e:
         import traceback
 
@@ -349,8 +404,9 @@ class AgentEnforcerMCP(FastMCP[dict]):
             return []
 
         config = load_config(root_path)
-        enforcer = Enforcer(root_path=root_path, config=config)
-        files_by_lang, _ = enforcer.scan_files()
+        async with _check_lock:
+            enforcer = Enforcer(root_path=root_path, config=config)
+            files_by_lang, _ = enforcer.scan_files()
 
         for lang, files in files_by_lang.items():
             for file_path in files:
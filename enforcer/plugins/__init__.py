@@ -10,3 +10,21 @@ def load_plugins():
             plugin = module.Plugin()
             plugins[plugin.language] = plugin
     return plugins
+
+
+def build_language_maps(plugins):
+    """
+    Builds the lookup tables used for language detection.
+
+    Returns a tuple of (extension -> language, interpreter -> language).
+    Interpreters come from an optional ``interpreters`` attribute on each
+    plugin and are matched against shebang lines of extensionless scripts.
+    """
+    extensions = {}
+    interpreters = {}
+    for plugin in plugins.values():
+        for ext in plugin.extensions:
+            extensions.setdefault(ext.lower(), plugin.language)
+        for name in getattr(plugin, "interpreters", ()):
+            interpreters.setdefault(name, plugin.language)
+    return extensions, interpreters
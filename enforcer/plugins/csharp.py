@@ -2,15 +2,19 @@ import json
 import os
 import re
 import subprocess
+from functools import partial
 from multiprocessing import Queue
 from typing import List, Optional
 
-from ..utils import run_command
+from ..steps import ToolStep, run_steps
+from ..utils import job_weight, run_command
 
 
 class Plugin:
     language = "csharp"
     extensions = [".cs"]
+    # * Checked by the syntax pre-gate, see enforcer.syntax
+    syntax_dialect = "csharp"
 
     def get_required_commands(self):
         return ["dotnet"]
@@ -21,11 +25,22 @@ class Plugin:
         tool_configs: Optional[dict] = None,
     ):
         try:
-            run_command(["dotnet", "format"], return_output=False)
+            with job_weight(cores=2, memory_mb=1024):
+                run_command(["dotnet", "format"], return_output=False)
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         return {"changed_count": 0}
 
+    def lint_steps(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: Optional[dict] = None,
+        root_path: Optional[str] = None,
+    ) -> List[ToolStep]:
+        # * The build reports compiler and analyzer diagnostics in one run
+        return [ToolStep("dotnet-build", partial(self._run_build, root_path))]
+
     def lint(
         self,
         files: List[str],
@@ -33,7 +48,9 @@ class Plugin:
         tool_configs: Optional[dict] = None,
         root_path: Optional[str] = None,
     ):
-        return self._run_build(root_path)
+        return run_steps(
+            self.lint_steps(files, disabled_rules, tool_configs, root_path)
+        )
 
     def compile(self, files: List[str]):
         return []
@@ -60,7 +77,9 @@ class Plugin:
         )
 
         try:
-            result = run_command(["dotnet", "build"], return_output=True)
+            # * MSBuild builds projects in parallel across cores
+            with job_weight(cores=4, memory_mb=2048):
+                result = run_command(["dotnet", "build"], return_output=True)
             output = result.stdout + result.stderr
 
             for line in output.splitlines():
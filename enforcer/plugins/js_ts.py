@@ -2,31 +2,125 @@ import json
 import os
 import re
 import subprocess
+from functools import partial
 from multiprocessing import Queue
 from typing import List, Optional
 
+from ..shards import run_sharded
+from ..steps import ToolStep, run_steps
 from ..utils import run_command
 
 
 class Plugin:
     language = "js_ts"
     extensions = [".js", ".ts", ".jsx", ".tsx"]
+    interpreters = ["node", "nodejs", "deno", "bun", "ts-node", "tsx"]
+    # * Checked by the syntax pre-gate, see enforcer.syntax
+    syntax_dialect = "javascript"
+    # * Project files whose contents change lint results, see tool_versions
+    config_files = [
+        "package.json",
+        "tsconfig.json",
+        ".eslintrc",
+        ".eslintrc.js",
+        ".eslintrc.cjs",
+        ".eslintrc.json",
+        ".eslintrc.yml",
+        "eslint.config.js",
+        "eslint.config.mjs",
+        "eslint.config.cjs",
+    ]
 
     def get_required_commands(self):
         return ["npx"]
 
+    def tool_versions(self, root_path: Optional[str] = None):
+        """
+        Returns the versions of the lint tools for the lint result cache, or
+        None when eslint is not installed in the project. npx would then run
+        whatever version it resolves, so results must not be cached.
+        """
+        versions = {}
+        for package in ("eslint", "typescript"):
+            manifest = os.path.join(
+                root_path or os.getcwd(), "node_modules", package, "package.json"
+            )
+            try:
+                with open(manifest, "r", encoding="utf-8") as f:
+                    versions[package] = json.load(f).get("version")
+            except (OSError, ValueError):
+                versions[package] = None
+        if versions["eslint"] is None:
+            return None
+        return versions
+
     def autofix_style(
         self,
         files: List[str],
         tool_configs: Optional[dict] = None,
     ):
+        run_sharded(
+            "prettier", ["npx", "prettier", "--write"], files, self._run_prettier
+        )
+        return {"changed_count": 0}
+
+    def _run_prettier(self, files: List[str]):
         try:
             cmd = ["npx", "prettier", "--write"]
             cmd.extend(files)
             run_command(cmd, return_output=False)
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
-        return {"changed_count": 0}
+        return {}
+
+    def lint_steps(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: Optional[dict] = None,
+        root_path: Optional[str] = None,
+    ) -> List[ToolStep]:
+        # ! Type-aware eslint rules read the files a file imports, so where a
+        # tsconfig.json lets eslint load type information its results are not
+        # purely per-file
+        steps = [
+            ToolStep(
+                "eslint",
+                partial(self._run_eslint_sharded, files, root_path),
+                memory_mb=512,
+                whole_program=self._has_tsconfig(files, root_path),
+            )
+        ]
+        # * tsc checks the whole project, so it only runs where one is configured
+        if root_path and os.path.isfile(os.path.join(root_path, "tsconfig.json")):
+            steps.append(
+                ToolStep(
+                    "tsc",
+                    partial(self._run_tsc, root_path),
+                    memory_mb=1024,
+                    whole_program=True,
+                )
+            )
+        return steps
+
+    def _has_tsconfig(self, files: List[str], root_path: Optional[str]) -> bool:
+        """Checks for a tsconfig.json at the root or above any of the files."""
+        if not root_path:
+            return False
+        root_path = os.path.abspath(root_path)
+        seen = set()
+        for directory in [root_path] + [
+            os.path.dirname(os.path.abspath(f)) for f in files
+        ]:
+            while directory not in seen:
+                seen.add(directory)
+                if os.path.isfile(os.path.join(directory, "tsconfig.json")):
+                    return True
+                parent = os.path.dirname(directory)
+                if directory == root_path or parent == directory:
+                    break
+                directory = parent
+        return False
 
     def lint(
         self,
@@ -35,6 +129,20 @@ class Plugin:
         tool_configs: Optional[dict] = None,
         root_path: Optional[str] = None,
     ):
+        return run_steps(
+            self.lint_steps(files, disabled_rules, tool_configs, root_path)
+        )
+
+    def _run_eslint_sharded(self, files: List[str], root_path: Optional[str]):
+        return run_sharded(
+            "eslint",
+            ["npx", "eslint", "--format", "json"],
+            files,
+            lambda shard: self._run_eslint(shard, root_path),
+            root_path,
+        )
+
+    def _run_eslint(self, files: List[str], root_path: Optional[str]):
         errors = []
         warnings = []
 
@@ -91,15 +199,46 @@ class Plugin:
 
         return {"errors": errors, "warnings": warnings}
 
-    def compile(self, files: List[str]):
+    def _run_tsc(self, root_path: str):
+        errors = []
+        warnings = []
+
         try:
-            # Run tsc on the project
             result = run_command(
-                ["npx", "tsc"], return_output=True
-            )  # Assumes tsconfig.json
-            return result.stdout.splitlines() if result.returncode != 0 else []
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return ["TSC command timed out or was not found."]
+                ["npx", "tsc", "--noEmit", "--pretty", "false"], return_output=True
+            )
+            for line in result.stdout.splitlines():
+                # e.g. src/app.ts(3,7): error TS2322: Type 'string' is not ...
+                match = re.match(
+                    r"(.+)\((\d+),(\d+)\): (error|warning) (TS\d+): (.+)", line
+                )
+                if match:
+                    file_path = match.group(1)
+                    if os.path.isabs(file_path):
+                        file_path = os.path.relpath(file_path, root_path)
+                    issue = {
+                        "tool": "tsc",
+                        "file": file_path,
+                        "line": int(match.group(2)),
+                        "col": int(match.group(3)),
+                        "message": match.group(6).strip(),
+                        "rule": match.group(5),
+                    }
+                    if match.group(4) == "error":
+                        errors.append(issue)
+                    else:
+                        warnings.append(issue)
+        except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+            errors.append(
+                {"tool": "tsc", "file": "unknown", "line": 0, "message": str(e)}
+            )
+
+        return {"errors": errors, "warnings": warnings}
+
+    def compile(self, files: List[str]):
+        # * Type checking is the whole build, and the tsc lint step already
+        # runs it with --noEmit wherever a tsconfig.json exists
+        return []
 
     def test(self, root_path: str):
         try:
@@ -1,15 +1,19 @@
 import os
 import re
 import subprocess
+from functools import partial
 from multiprocessing import Queue
 from typing import List, Optional
 
-from ..utils import run_command
+from ..steps import ToolStep, run_steps
+from ..utils import job_weight, run_command
 
 
 class Plugin:
     language = "kotlin"
     extensions = [".kt", ".kts"]
+    # * Checked by the syntax pre-gate, see enforcer.syntax
+    syntax_dialect = "kotlin"
 
     def get_required_commands(self):
         return ["./gradlew"]
@@ -20,14 +24,32 @@ class Plugin:
         tool_configs: Optional[dict] = None,
     ):
         try:
-            run_command(
-                ["./gradlew", "ktlintFormat", "--quiet"],
-                return_output=False,
-            )
+            with job_weight(cores=2, memory_mb=1024):
+                run_command(
+                    ["./gradlew", "ktlintFormat", "--quiet"],
+                    return_output=False,
+                )
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         return {"changed_count": 0}
 
+    def lint_steps(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: Optional[dict] = None,
+        root_path: Optional[str] = None,
+    ) -> List[ToolStep]:
+        # * Each step is a Gradle build with its own worker pool
+        return [
+            ToolStep(
+                "ktlint", partial(self._run_ktlint, root_path), cores=2, memory_mb=1024
+            ),
+            ToolStep(
+                "detekt", partial(self._run_detekt, root_path), cores=2, memory_mb=1024
+            ),
+        ]
+
     def lint(
         self,
         files: List[str],
@@ -35,6 +57,11 @@ class Plugin:
         tool_configs: Optional[dict] = None,
         root_path: Optional[str] = None,
     ):
+        return run_steps(
+            self.lint_steps(files, disabled_rules, tool_configs, root_path)
+        )
+
+    def _run_ktlint(self, root_path: Optional[str]):
         errors = []
         warnings = []
 
@@ -72,6 +99,12 @@ class Plugin:
                 }
             )
 
+        return {"errors": errors, "warnings": warnings}
+
+    def _run_detekt(self, root_path: Optional[str]):
+        errors = []
+        warnings = []
+
         # detekt
         try:
             detekt_result = run_command(
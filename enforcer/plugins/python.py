@@ -3,19 +3,50 @@ import os
 import re
 import subprocess
 import sys
+from functools import partial
+from importlib import metadata
 from multiprocessing import Queue
 from typing import List, Optional
 
+from ..shards import run_sharded
+from ..steps import ToolStep, run_steps
 from ..utils import run_command
 
 
 class Plugin:
     language = "python"
     extensions = [".py"]
+    interpreters = ["python", "pypy"]
+    # * Checked by the syntax pre-gate, see enforcer.syntax
+    syntax_dialect = "python"
+    # * Project files whose contents change lint results, see tool_versions
+    config_files = [
+        "pyproject.toml",
+        "setup.cfg",
+        "tox.ini",
+        ".flake8",
+        "mypy.ini",
+        "pyrightconfig.json",
+    ]
 
     def get_required_commands(self):
         return ["python"]
 
+    def tool_versions(self, root_path: Optional[str] = None):
+        """
+        Returns the versions of the lint tools for the lint result cache.
+
+        They are read from package metadata of the interpreter that runs the
+        tools, so no subprocess is started.
+        """
+        versions = {}
+        for tool in ("pyright", "flake8", "mypy"):
+            try:
+                versions[tool] = metadata.version(tool)
+            except metadata.PackageNotFoundError:
+                versions[tool] = None
+        return versions
+
     def autofix_style(
         self,
         files: List[str],
@@ -24,32 +55,84 @@ class Plugin:
         tool_configs = tool_configs or {}
         changed_files = set()
 
+        # * black and isort handle each file on its own, so large file lists
+        # are sharded over concurrent runs
         # Run black
-        try:
-            black_cmd = [sys.executable, "-m", "black", "--quiet"]
-            if "black" in tool_configs:
-                black_cmd.extend(["--config", tool_configs["black"]])
-            black_cmd.extend(files)
-            black_res = run_command(black_cmd, return_output=True)
-            if black_res.stderr:
-                changed_files.update(re.findall(r"reformatted (.+)", black_res.stderr))
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # Errors are handled by run_command's logging, just pass
-            pass
+        black_cmd = [sys.executable, "-m", "black", "--quiet"]
+        if "black" in tool_configs:
+            black_cmd.extend(["--config", tool_configs["black"]])
+        black_res = run_sharded(
+            "black",
+            black_cmd,
+            files,
+            partial(self._run_formatter, black_cmd, r"reformatted (.+)"),
+        )
+        changed_files.update(black_res.get("changed", []))
 
         # Run isort
+        isort_cmd = [sys.executable, "-m", "isort", "--quiet"]
+        if "isort" in tool_configs:
+            isort_cmd.extend(["--settings-path", tool_configs["isort"]])
+        isort_res = run_sharded(
+            "isort",
+            isort_cmd,
+            files,
+            partial(self._run_formatter, isort_cmd, r"Fixing (.+)"),
+        )
+        changed_files.update(isort_res.get("changed", []))
+
+        return {"changed_count": len(changed_files)}
+
+    def _run_formatter(
+        self, command: List[str], changed_pattern: str, files: List[str]
+    ):
         try:
-            isort_cmd = [sys.executable, "-m", "isort", "--quiet"]
-            if "isort" in tool_configs:
-                isort_cmd.extend(["--settings-path", tool_configs["isort"]])
-            isort_cmd.extend(files)
-            isort_res = run_command(isort_cmd, return_output=True)
-            if isort_res.stderr:
-                changed_files.update(re.findall(r"Fixing (.+)", isort_res.stderr))
+            res = run_command(command + files, return_output=True)
+            if res.stderr:
+                return {"changed": re.findall(changed_pattern, res.stderr)}
         except (subprocess.TimeoutExpired, FileNotFoundError):
+            # Errors are handled by run_command's logging, just pass
             pass
+        return {"changed": []}
 
-        return {"changed_count": len(changed_files)}
+    def lint_steps(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: Optional[dict] = None,
+        root_path: Optional[str] = None,
+    ) -> List[ToolStep]:
+        # * The linters are independent of each other, so the core may run
+        # these steps concurrently once autofix_style has finished
+        tool_configs = tool_configs or {}
+        return [
+            ToolStep(
+                "pyright",
+                partial(self._run_pyright, files, root_path),
+                cores=2,
+                memory_mb=1024,
+                whole_program=True,
+            ),
+            ToolStep(
+                "flake8",
+                partial(
+                    self._run_flake8_sharded,
+                    files,
+                    disabled_rules,
+                    tool_configs,
+                    root_path,
+                ),
+                # flake8 spreads files over several processes by default
+                cores=2,
+                memory_mb=256,
+            ),
+            ToolStep(
+                "mypy",
+                partial(self._run_mypy, files, tool_configs, root_path),
+                memory_mb=1024,
+                whole_program=True,
+            ),
+        ]
 
     def lint(
         self,
@@ -58,7 +141,11 @@ class Plugin:
         tool_configs: Optional[dict] = None,
         root_path: Optional[str] = None,
     ):
-        tool_configs = tool_configs or {}
+        return run_steps(
+            self.lint_steps(files, disabled_rules, tool_configs, root_path)
+        )
+
+    def _run_pyright(self, files: List[str], root_path: Optional[str]):
         errors = []
         warnings = []
 
@@ -102,6 +189,44 @@ class Plugin:
                 {"tool": "pyright", "file": "unknown", "line": 0, "message": str(e)}
             )
 
+        return {"errors": errors, "warnings": warnings}
+
+    def _run_flake8_sharded(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: dict,
+        root_path: Optional[str],
+    ):
+        # * Only used to keep each shard's command line within ARG_MAX
+        command = [
+            sys.executable,
+            "-m",
+            "flake8",
+            f'--ignore={",".join(disabled_rules)}',
+        ]
+        if "flake8" in tool_configs:
+            command.extend(["--config", tool_configs["flake8"]])
+        return run_sharded(
+            "flake8",
+            command,
+            files,
+            lambda shard: self._run_flake8(
+                shard, disabled_rules, tool_configs, root_path
+            ),
+            root_path,
+        )
+
+    def _run_flake8(
+        self,
+        files: List[str],
+        disabled_rules: List[str],
+        tool_configs: dict,
+        root_path: Optional[str],
+    ):
+        errors = []
+        warnings = []
+
         # flake8
         try:
             flake8_cmd = [
@@ -138,6 +263,12 @@ class Plugin:
                 {"tool": "flake8", "file": "unknown", "line": 0, "message": str(e)}
             )
 
+        return {"errors": errors, "warnings": warnings}
+
+    def _run_mypy(self, files: List[str], tool_configs: dict, root_path: Optional[str]):
+        errors = []
+        warnings = []
+
         # mypy - all are errors
         try:
             mypy_cmd = [sys.executable, "-m", "mypy"]
@@ -0,0 +1,54 @@
+from typing import Optional
+
+# * Profile of CLI runs, which CI relies on for full lint coverage
+DEFAULT_PROFILE = "standard"
+
+# * Profile of MCP calls, where an agent waits on the result
+DEFAULT_AGENT_PROFILE = "fast"
+
+# * A profile chooses the lint tools of each language by the names of their
+# ToolSteps (languages it does not mention run all of them), and whether
+# plugins' project-wide compile and test runs are added. The syntax gate and
+# the auto-fixers run in every profile.
+BUILTIN_PROFILES = {
+    "fast": {
+        "tools": {
+            "python": ["flake8"],
+            "js_ts": ["eslint"],
+            "kotlin": ["ktlint"],
+            "csharp": [],
+        },
+    },
+    "standard": {},
+    "full": {"compile": True, "test": True},
+}
+
+
+def get_profile(config: Optional[dict], name: Optional[str] = None) -> dict:
+    """
+    Returns the profile called name, or the one selected by the "profile"
+    config key.
+
+    Profiles defined under "profiles" in config.json are added to the
+    built-in ones. Keys they set override those of a built-in profile of the
+    same name, and "tools" is overridden per language. Raises ValueError
+    for an unknown profile.
+    """
+    config = config or {}
+    name = name or config.get("profile") or DEFAULT_PROFILE
+    profiles = {key: dict(value) for key, value in BUILTIN_PROFILES.items()}
+    for key, value in config.get("profiles", {}).items():
+        profile = profiles.setdefault(key, {})
+        tools = {**profile.get("tools", {}), **value.get("tools", {})}
+        profile.update(value)
+        if tools:
+            profile["tools"] = tools
+    if name not in profiles:
+        known = ", ".join(sorted(profiles))
+        raise ValueError(f"Unknown profile '{name}'. Available profiles: {known}.")
+    return profiles[name]
+
+
+def tool_enabled(profile: dict, lang: str, tool: str) -> bool:
+    tools = profile.get("tools", {})
+    return lang not in tools or tool in tools[lang]
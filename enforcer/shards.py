@@ -0,0 +1,147 @@
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Sequence
+
+from .history import ToolHistory
+from .utils import CommandCancelled, bind_thread_context, current_cancel_token
+
+# * Shard size used for a tool that has no recorded per-file cost yet
+DEFAULT_MIN_SHARD_FILES = 50
+
+# * With a known per-file cost, shards are made at least this long so
+# process startup does not dominate
+TARGET_SHARD_SECONDS = 2.0
+
+# * Headroom left in the argument budget for the environment and the loader
+ARGV_HEADROOM = 4096
+
+
+def argv_budget() -> int:
+    """
+    Returns the number of bytes a command line may safely use.
+
+    On Windows, npx and friends are .cmd shims that go through cmd.exe,
+    whose limit is 8191 characters. Elsewhere ARG_MAX is shared with the
+    environment, so its size is subtracted.
+    """
+    if os.name == "nt":
+        return 8000
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = 128 * 1024
+    env_size = sum(len(k) + len(v) + 2 + 8 for k, v in os.environ.items())
+    return max(4096, arg_max - env_size - ARGV_HEADROOM)
+
+
+def _arg_size(arg: str) -> int:
+    # * The string, its terminator and its pointer in argv
+    return len(os.fsencode(arg)) + 1 + 8
+
+
+def plan_shards(
+    tool: str,
+    command: Sequence[str],
+    files: Sequence[str],
+    history: Optional[ToolHistory] = None,
+    workers: Optional[int] = None,
+) -> List[List[str]]:
+    """
+    Splits files into shards for separate runs of command.
+
+    Shards are sized to keep every worker busy without making runs so small
+    that startup dominates: at least TARGET_SHARD_SECONDS of historical
+    per-file cost, or DEFAULT_MIN_SHARD_FILES when the tool has no history.
+    Independently, no shard makes the command line exceed argv_budget().
+    """
+    files = list(files)
+    if not files:
+        return [files]
+    workers = workers or os.cpu_count() or 1
+    cost = history.cost(tool) if history is not None else None
+    if cost:
+        min_size = max(1, math.ceil(TARGET_SHARD_SECONDS / cost))
+    else:
+        min_size = DEFAULT_MIN_SHARD_FILES
+    size = max(min_size, math.ceil(len(files) / workers))
+
+    budget = argv_budget() - sum(_arg_size(arg) for arg in command)
+    shards: List[List[str]] = []
+    shard: List[str] = []
+    used = 0
+    for file_path in files:
+        arg_size = _arg_size(file_path)
+        if shard and (len(shard) >= size or used + arg_size > budget):
+            shards.append(shard)
+            shard, used = [], 0
+        shard.append(file_path)
+        used += arg_size
+    shards.append(shard)
+    return shards
+
+
+def _merge(results: List[dict]) -> dict:
+    merged: dict = {}
+    for result in results:
+        for key, value in result.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+            else:
+                merged.setdefault(key, value)
+    return merged
+
+
+def run_sharded(
+    tool: str,
+    command: Sequence[str],
+    files: Sequence[str],
+    run: Callable[[List[str]], dict],
+    root_path: Optional[str] = None,
+) -> dict:
+    """
+    Runs a per-file tool over shards of files and merges the parsed results.
+
+    ``run`` receives one shard, runs the tool on it and returns a dict;
+    list values of all shards are concatenated and numbers are summed.
+    ``command`` is the argument list placed before the files, used to keep
+    each command line within ARG_MAX. Shards run concurrently; every
+    command still waits for a slot from the job scheduler, with the job
+    weight and cancel token of the calling thread; cancelled shards
+    contribute nothing. The per-file cost of each run is recorded
+    in the tool history of root_path (the working directory by default),
+    which tunes future shard sizes.
+
+    Whole-program tools such as pyright and mypy must not be sharded, since
+    they need to see every file in a single run.
+    """
+    history = ToolHistory.for_root(root_path or os.getcwd())
+    shards = plan_shards(tool, command, files, history)
+
+    def run_shard(shard):
+        started = time.monotonic()
+        try:
+            result = run(shard)
+        except CommandCancelled:
+            result = {}
+        return result, time.monotonic() - started
+
+    if len(shards) == 1:
+        outcomes = [run_shard(shards[0])]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=len(shards), thread_name_prefix=f"enforcer-{tool}"
+        ) as pool:
+            run_bound = bind_thread_context(run_shard)
+            futures = [pool.submit(run_bound, shard) for shard in shards]
+            wait(futures)
+        outcomes = [future.result() for future in futures]
+
+    token = current_cancel_token()
+    if token is None or not token.cancelled:
+        # * Summed shard durations measure the cost per file, not wall time
+        history.record(tool, len(files), sum(seconds for _, seconds in outcomes))
+    return _merge([result for result, _ in outcomes])
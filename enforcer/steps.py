@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .utils import (
+    CommandCancelled,
+    bind_thread_context,
+    current_cancel_token,
+    job_weight,
+)
+
+
+class ToolStep(NamedTuple):
+    """
+    One independent tool run of a plugin's lint phase.
+
+    ``run`` takes no arguments and returns ``{"errors": [...], "warnings": [...]}``.
+    It is responsible for turning its own tool's timeouts and missing
+    executables into issues, so steps never affect each other.
+
+    ``cores`` and ``memory_mb`` are the weight the job scheduler reserves
+    for each command the step runs. ``whole_program`` marks type checkers
+    whose issues in a file depend on the files it imports, so they cannot be
+    cached by that file's content alone.
+    """
+
+    tool: str
+    run: Callable[[], dict]
+    cores: int = 1
+    memory_mb: int = 0
+    whole_program: bool = False
+
+
+def _run_weighted(step: ToolStep, on_result=None) -> dict:
+    token = current_cancel_token()
+    if token is not None and token.cancelled:
+        # * The check was cancelled, so steps not yet started are skipped
+        return {}
+    try:
+        with job_weight(step.cores, step.memory_mb):
+            result = step.run()
+    except CommandCancelled:
+        return {}
+    if on_result is not None:
+        on_result(result)
+    return result
+
+
+def run_steps(
+    steps: Iterable[ToolStep],
+    max_workers: Optional[int] = 1,
+    on_result: Optional[Callable[[dict], None]] = None,
+    priority: Optional[Callable[[ToolStep], float]] = None,
+) -> dict:
+    """
+    Runs lint steps and merges their issues in declaration order.
+
+    With max_workers above 1 (or None for one thread per step) the steps run
+    concurrently. All steps are always allowed to finish; an unexpected
+    exception is re-raised afterwards, the first one in declaration order.
+
+    Steps start in ascending order of priority(step) when it is given, e.g.
+    cheapest first; results are still merged in declaration order.
+
+    on_result is called with each step's result as soon as the step ends.
+    Once the check is cancelled (see utils.CancelToken), remaining steps are
+    skipped and cancelled steps contribute no issues.
+    """
+    steps = list(steps)
+    if max_workers is None:
+        max_workers = len(steps)
+    order = list(range(len(steps)))
+    if priority is not None:
+        order.sort(key=lambda i: priority(steps[i]))
+    results: List[dict] = [{}] * len(steps)
+    if max_workers <= 1 or len(steps) <= 1:
+        for i in order:
+            results[i] = _run_weighted(steps[i], on_result)
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(steps)), thread_name_prefix="enforcer-tool"
+        ) as pool:
+            run = bind_thread_context(_run_weighted)
+            futures = {i: pool.submit(run, steps[i], on_result) for i in order}
+            wait(futures.values())
+        results = [futures[i].result() for i in range(len(steps))]
+
+    errors = []
+    warnings = []
+    for result in results:
+        errors.extend(result.get("errors", []))
+        warnings.extend(result.get("warnings", []))
+    return {"errors": errors, "warnings": warnings}
@@ -0,0 +1,306 @@
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+# * Below this many files the gate runs in-process, since starting the
+# worker processes would cost more than parsing
+POOL_MIN_FILES = 256
+
+# * Files sent to a worker at a time
+POOL_CHUNK_SIZE = 32
+
+SYNTAX_TOOL = "syntax"
+
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+_CLOSERS = {v: k for k, v in _OPENERS.items()}
+_NAMES = {
+    "(": "parenthesis",
+    ")": "parenthesis",
+    "[": "bracket",
+    "]": "bracket",
+    "{": "brace",
+    "}": "brace",
+}
+
+# * Keywords after which an expression, and so a regex literal or JSX, starts
+_JS_EXPRESSION_KEYWORDS = {
+    "return",
+    "typeof",
+    "instanceof",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "case",
+    "do",
+    "else",
+    "yield",
+    "await",
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class _Unsupported(Exception):
+    """The source uses a construct the brace scanner does not model."""
+
+
+def _issue(file_path, line, col, message, rule):
+    return {
+        "tool": SYNTAX_TOOL,
+        "file": file_path,
+        "line": line or 1,
+        "col": col or 0,
+        "message": message,
+        "rule": rule,
+    }
+
+
+def python_syntax_error(file_path: str) -> Optional[dict]:
+    """Compiles a Python file and returns its first syntax error, if any."""
+    try:
+        with open(file_path, "rb") as f:
+            source = f.read()
+    except OSError:
+        return None
+    try:
+        with warnings.catch_warnings():
+            # * Invalid escape sequences and the like are the linters' business
+            warnings.simplefilter("ignore")
+            compile(source, file_path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return _issue(file_path, e.lineno, e.offset, e.msg, "E999")
+    except ValueError as e:
+        # * Null bytes in the source
+        return _issue(file_path, 1, 0, str(e), "E999")
+    return None
+
+
+def _starts_expression(source: str, last: str, last_pos: int) -> bool:
+    """Tells whether a JS expression may start after the token ending in last."""
+    if not last:
+        return True
+    if last in ")]}\"'":
+        return False
+    if not (last.isalnum() or last in "_$"):
+        return True
+    start = last_pos
+    while start > 0 and (source[start - 1].isalnum() or source[start - 1] in "_$"):
+        start -= 1
+    return source[start : last_pos + 1] in _JS_EXPRESSION_KEYWORDS
+
+
+def _scan_braces(source: str, dialect: str):
+    """
+    Scans a C-family source for unbalanced delimiters, unterminated strings
+    and unterminated block comments. Returns (line, col, message) of the
+    first problem, or None.
+
+    Comments and ordinary string literals are skipped. Raises _Unsupported on
+    constructs whose extent cannot be found without a real parser (template
+    and raw strings, string interpolation, JS regex literals and JSX,
+    preprocessor branches), so the gate never reports an error it is not
+    sure of.
+    """
+    stack: List[Tuple[str, int, int]] = []
+    line = 1
+    line_start = 0
+    last = ""
+    last_pos = -1
+    i = 0
+    n = len(source)
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ""
+        col = i - line_start + 1
+        if c == "\n":
+            line += 1
+            line_start = i + 1
+            i += 1
+            continue
+        if c in " \t\r\f\v":
+            i += 1
+            continue
+        if c == "/" and nxt == "/":
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if c == "/" and nxt == "*":
+            depth = 1
+            j = i + 2
+            start_line = line
+            while depth:
+                if j >= n:
+                    return start_line, col, "unterminated comment"
+                if source.startswith("*/", j):
+                    depth -= 1
+                    j += 2
+                elif dialect == "kotlin" and source.startswith("/*", j):
+                    # * Kotlin block comments nest
+                    depth += 1
+                    j += 2
+                else:
+                    if source[j] == "\n":
+                        line += 1
+                        line_start = j + 1
+                    j += 1
+            i = j
+            continue
+        if c in "\"'" or (dialect == "kotlin" and c == "`"):
+            if dialect in ("kotlin", "csharp") and source.startswith('"""', i):
+                # * Raw strings may hold lone quotes and braces
+                raise _Unsupported()
+            if dialect == "csharp" and last in ("@", "$"):
+                raise _Unsupported()
+            j = i + 1
+            while True:
+                if j >= n or source[j] == "\n":
+                    return line, col, "unterminated string literal"
+                if source[j] == "\\":
+                    if source.startswith("\n", j + 1):
+                        # * Line continuation
+                        line += 1
+                        line_start = j + 2
+                    j += 2
+                    continue
+                if source[j] == c:
+                    break
+                if dialect == "kotlin" and source.startswith("${", j):
+                    raise _Unsupported()
+                j += 1
+            i = j + 1
+            last, last_pos = c, j
+            continue
+        if dialect == "javascript":
+            if c == "`":
+                raise _Unsupported()
+            # * A slash there opens a regex, and a "<" a JSX element
+            if c in "/<" and _starts_expression(source, last, last_pos):
+                raise _Unsupported()
+            # ! After ")" or "}" a slash divides or opens a regex, as in
+            # "if (x) /re/.test(y)", and only a parser can tell which
+            if c == "/" and last in ")}":
+                raise _Unsupported()
+        if dialect == "csharp" and c == "#" and not source[line_start:i].strip():
+            # * Branches of #if may legitimately hold unbalanced braces
+            raise _Unsupported()
+        if c in _OPENERS:
+            stack.append((c, line, col))
+        elif c in _CLOSERS:
+            if not stack:
+                return line, col, f"unmatched '{c}'"
+            opener, open_line, _ = stack.pop()
+            if opener != _CLOSERS[c]:
+                where = f" on line {open_line}" if open_line != line else ""
+                return (
+                    line,
+                    col,
+                    f"closing {_NAMES[c]} '{c}' does not match opening "
+                    f"{_NAMES[opener]} '{opener}'{where}",
+                )
+        last, last_pos = c, i
+        i += 1
+    if stack:
+        opener, open_line, open_col = stack[-1]
+        return open_line, open_col, f"'{opener}' was never closed"
+    return None
+
+
+def brace_syntax_error(file_path: str, dialect: str) -> Optional[dict]:
+    """
+    Returns the first delimiter or literal error of a JS/TS, Kotlin or C#
+    file, or None when it has none or cannot be checked cheaply.
+    """
+    if file_path.endswith((".jsx", ".tsx")):
+        # * JSX text may hold quotes and braces that are not code
+        return None
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+            source = f.read()
+    except OSError:
+        return None
+    try:
+        problem = _scan_braces(source, dialect)
+    except _Unsupported:
+        return None
+    if problem is None:
+        return None
+    line, col, message = problem
+    return _issue(file_path, line, col, message, "syntax")
+
+
+def check_file(dialect: str, file_path: str) -> Optional[dict]:
+    """Returns the syntax error of file_path in the given dialect, if any."""
+    if dialect == "python":
+        return python_syntax_error(file_path)
+    if dialect in ("javascript", "kotlin", "csharp"):
+        return brace_syntax_error(file_path, dialect)
+    return None
+
+
+def _check_chunk(dialect: str, file_paths: List[str]) -> List[Optional[dict]]:
+    return [check_file(dialect, file_path) for file_path in file_paths]
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # * Forking a process that runs tool threads can deadlock the child
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=context
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def check_files(
+    dialect: str, file_paths: List[str], pool_min_files: int = POOL_MIN_FILES
+) -> Dict[str, dict]:
+    """
+    Checks the syntax of file_paths, returning the first error of each
+    broken file by path.
+
+    Large batches are spread across a shared process pool, since Python's
+    compiler holds the GIL. If the pool cannot be used, the files are
+    checked in-process instead.
+    """
+    results: List[Optional[dict]] = []
+    if len(file_paths) >= pool_min_files:
+        chunks = [
+            file_paths[i : i + POOL_CHUNK_SIZE]
+            for i in range(0, len(file_paths), POOL_CHUNK_SIZE)
+        ]
+        try:
+            pool = _get_pool()
+            futures = [pool.submit(_check_chunk, dialect, chunk) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+        except (BrokenProcessPool, OSError, RuntimeError):
+            _reset_pool()
+            results = []
+    if len(results) != len(file_paths):
+        results = _check_chunk(dialect, file_paths)
+    return {
+        file_path: issue
+        for file_path, issue in zip(file_paths, results)
+        if issue is not None
+    }
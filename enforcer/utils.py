@@ -1,8 +1,211 @@
+import asyncio
 import os
 import subprocess
 import threading
+from contextlib import contextmanager, nullcontext
 from multiprocessing import Queue
-from typing import List, Optional
+from typing import List, Optional, Tuple
+
+from .limits import ResourceLimits
+
+# * Process-wide scheduler every command waits on for a job slot, see
+# core.JobScheduler. None runs commands without any limit.
+_job_scheduler = None
+
+# * Weight (cores, memory in MB) of the tool step running on this thread
+_job_weight = threading.local()
+
+
+def set_job_scheduler(scheduler) -> None:
+    """Installs the scheduler that run_command acquires job slots from."""
+    global _job_scheduler
+    _job_scheduler = scheduler
+
+
+def current_job_weight() -> Tuple[int, int]:
+    """Returns the (cores, memory_mb) weight declared for the current thread."""
+    return getattr(_job_weight, "value", None) or (1, 0)
+
+
+@contextmanager
+def job_weight(cores: int = 1, memory_mb: int = 0):
+    """Declares the weight of commands run by the current thread in this block."""
+    previous = getattr(_job_weight, "value", None)
+    _job_weight.value = (cores, memory_mb)
+    try:
+        yield
+    finally:
+        _job_weight.value = previous
+
+
+# * Seconds a cancelled tool gets to exit after SIGTERM before it is killed
+CANCEL_GRACE_SECONDS = 2.0
+
+
+class CommandCancelled(Exception):
+    """Raised by run_command when the check it belongs to has been cancelled."""
+
+
+class CancelToken:
+    """
+    Cancellation handle of one check run.
+
+    run_command registers every process it starts with the token of its
+    thread (see cancel_scope), so ``cancel`` can terminate the tools that
+    are already running; commands started afterwards fail immediately with
+    CommandCancelled.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self.reason: Optional[str] = None
+        self._processes: set = set()
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: Optional[str] = None):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            self.reason = reason
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.terminate()
+            except (OSError, RuntimeError):
+                # * asyncio processes whose loop has already closed
+                pass
+        if processes:
+            # * Tools that ignore SIGTERM are killed after a grace period
+            timer = threading.Timer(CANCEL_GRACE_SECONDS, self._kill, [processes])
+            timer.daemon = True
+            timer.start()
+
+    @staticmethod
+    def _kill(processes):
+        for process in processes:
+            # * Popen objects update returncode on poll(), asyncio ones by themselves
+            if getattr(process, "poll", lambda: process.returncode)() is None:
+                try:
+                    process.kill()
+                except (OSError, RuntimeError):
+                    pass
+
+    def register(self, process) -> bool:
+        """Tracks a started process, or returns False if already cancelled."""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._processes.add(process)
+            return True
+
+    def unregister(self, process):
+        with self._lock:
+            self._processes.discard(process)
+
+
+# * Cancel token of the check running on this thread
+_cancel = threading.local()
+
+
+def current_cancel_token() -> Optional[CancelToken]:
+    return getattr(_cancel, "token", None)
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancelToken]):
+    """Makes commands run by the current thread in this block cancellable by token."""
+    previous = getattr(_cancel, "token", None)
+    _cancel.token = token
+    try:
+        yield
+    finally:
+        _cancel.token = previous
+
+
+# * Event loop that commands of the check running on this thread are started
+# on, see command_loop
+_command_loop = threading.local()
+
+
+def current_command_loop() -> Optional[asyncio.AbstractEventLoop]:
+    return getattr(_command_loop, "loop", None)
+
+
+@contextmanager
+def command_loop(loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Makes run_command start processes in this block on loop, through
+    run_command_async, while the calling thread waits for the result. The
+    async orchestrator uses it so every tool is a child of its event loop.
+    """
+    previous = getattr(_command_loop, "loop", None)
+    _command_loop.loop = loop
+    try:
+        yield
+    finally:
+        _command_loop.loop = previous
+
+
+# * Timeout of commands run by the tool step running on this thread
+_command_timeout = threading.local()
+
+
+def current_command_timeout() -> Optional[float]:
+    return getattr(_command_timeout, "seconds", None)
+
+
+@contextmanager
+def command_timeout(seconds: Optional[float]):
+    """
+    Sets the timeout of commands run by the current thread in this block
+    that do not pass one to run_command themselves.
+    """
+    previous = getattr(_command_timeout, "seconds", None)
+    _command_timeout.seconds = seconds
+    try:
+        yield
+    finally:
+        _command_timeout.seconds = previous
+
+
+# * Resource limits of commands run by the tool step running on this thread
+_resource_limits = threading.local()
+
+
+def current_resource_limits() -> Optional[ResourceLimits]:
+    return getattr(_resource_limits, "limits", None)
+
+
+@contextmanager
+def resource_limits(limits: Optional[ResourceLimits]):
+    """Applies limits to the commands run by the current thread in this block."""
+    previous = getattr(_resource_limits, "limits", None)
+    _resource_limits.limits = limits
+    try:
+        yield
+    finally:
+        _resource_limits.limits = previous
+
+
+def bind_thread_context(func):
+    """
+    Wraps func so it runs with the job weight, cancel token, command loop,
+    command timeout and resource limits of the calling thread, for handing
+    work to a thread pool.
+    """
+    weight = current_job_weight()
+    token = current_cancel_token()
+    loop = current_command_loop()
+    timeout = current_command_timeout()
+    limits = current_resource_limits()
+
+    def run(*args, **kwargs):
+        with job_weight(*weight), cancel_scope(token), command_loop(loop):
+            with command_timeout(timeout), resource_limits(limits):
+                return func(*args, **kwargs)
+
+    return run
 
 
 def get_git_root(
@@ -96,6 +299,166 @@ def run_command(
     if log_queue:
         log_queue.put(f"Running command: {cmd_str}")
 
+    token = current_cancel_token()
+    if token is not None and token.cancelled:
+        raise CommandCancelled(cmd_str)
+    if timeout is None:
+        timeout = current_command_timeout()
+    limits = current_resource_limits()
+
+    loop = current_command_loop()
+    scheduler = _job_scheduler
+    if _in_running_loop():
+        # ! Never wait for a slot on an event loop thread: the slots may be
+        # held by worker threads that wait for this very loop to run their
+        # commands. Short calls made from the loop run unscheduled.
+        scheduler = None
+    with scheduler.slot(*current_job_weight()) if scheduler else nullcontext():
+        if loop is not None and not loop.is_closed() and not _on_loop_thread(loop):
+            future = asyncio.run_coroutine_threadsafe(
+                run_command_async(
+                    command,
+                    return_output,
+                    check,
+                    cwd,
+                    timeout,
+                    log_queue,
+                    token,
+                    limits,
+                ),
+                loop,
+            )
+            try:
+                return future.result()
+            except NotImplementedError:
+                # * The loop cannot start subprocesses, e.g. a selector loop
+                # on Windows
+                pass
+        return _run_command(
+            command,
+            cmd_str,
+            return_output,
+            check,
+            cwd,
+            timeout,
+            log_queue,
+            token,
+            limits,
+        )
+
+
+def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _in_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+async def run_command_async(
+    command: List[str],
+    return_output: bool = False,
+    check: bool = False,
+    cwd: Optional[str] = None,
+    timeout: Optional[int] = None,
+    log_queue: Optional[Queue] = None,
+    token: Optional[CancelToken] = None,
+    limits: Optional[ResourceLimits] = None,
+) -> subprocess.CompletedProcess:
+    """
+    Coroutine counterpart of run_command, built on asyncio.create_subprocess_exec.
+
+    It raises the same exceptions as run_command. When the awaiting task is
+    cancelled, the child process is killed before CancelledError propagates.
+    Job slots are not acquired here; run_command does that before it hands a
+    command to the event loop.
+    """
+    cmd_str = " ".join(command)
+    if token is not None and token.cancelled:
+        raise CommandCancelled(cmd_str)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            preexec_fn=limits.preexec_fn() if limits else None,
+        )
+    except FileNotFoundError as e:
+        if log_queue:
+            log_queue.put(f"Command not found: {command[0]}")
+        raise FileNotFoundError(f"Command not found: {command[0]}") from e
+
+    if token is not None and not token.register(process):
+        process.kill()
+        await process.communicate()
+        raise CommandCancelled(cmd_str)
+    try:
+        try:
+            out, err = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            if log_queue:
+                log_queue.put(f"Command timed out after {timeout}s: {cmd_str}")
+            process.kill()
+            out, err = await process.communicate()
+            raise subprocess.TimeoutExpired(
+                cmd=command, timeout=timeout, output=_decode(out), stderr=_decode(err)
+            )
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+    finally:
+        if token is not None:
+            token.unregister(process)
+
+    if token is not None and token.cancelled:
+        if log_queue:
+            log_queue.put(f"Command cancelled: {cmd_str}")
+        raise CommandCancelled(cmd_str)
+    if log_queue:
+        log_queue.put(f"Command finished with code {process.returncode}: {cmd_str}")
+
+    stdout, stderr = _decode(out), _decode(err)
+    if limits is not None:
+        limits.check(cmd_str, process.returncode, stderr)
+    if check and process.returncode != 0:
+        if log_queue:
+            log_queue.put(f"Command failed with code {process.returncode}: {cmd_str}")
+        raise subprocess.CalledProcessError(
+            process.returncode, command, output=stdout, stderr=stderr
+        )
+    if not return_output:
+        stdout, stderr = "", ""
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def _decode(data: Optional[bytes]) -> str:
+    # * Same text as Popen(text=True) gives, including universal newlines
+    text = (data or b"").decode("utf-8", errors="ignore")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _run_command(
+    command: List[str],
+    cmd_str: str,
+    return_output: bool,
+    check: bool,
+    cwd: Optional[str],
+    timeout: Optional[int],
+    log_queue: Optional[Queue],
+    token: Optional[CancelToken] = None,
+    limits: Optional[ResourceLimits] = None,
+) -> subprocess.CompletedProcess:
     try:
         # * Use Popen and communicate to avoid deadlocks from full pipes.
         # * Use DEVNULL for stdin to prevent processes from hanging while waiting for input.
@@ -108,10 +471,21 @@ def run_command(
             cwd=cwd,
             encoding="utf-8",
             errors="ignore",
+            preexec_fn=limits.preexec_fn() if limits else None,
         )
 
+        # * A cancelled check terminates the process, which ends communicate()
+        if token is not None and not token.register(process):
+            process.kill()
+            process.communicate()
+            raise CommandCancelled(cmd_str)
+
         try:
             stdout, stderr = process.communicate(timeout=timeout)
+            if token is not None and token.cancelled:
+                if log_queue:
+                    log_queue.put(f"Command cancelled: {cmd_str}")
+                raise CommandCancelled(cmd_str)
             if log_queue:
                 log_queue.put(
                     f"Command finished with code {process.returncode}: {cmd_str}"
@@ -126,7 +500,12 @@ def run_command(
             raise subprocess.TimeoutExpired(
                 cmd=e.cmd, timeout=e.timeout, output=stdout, stderr=stderr
             ) from e
+        finally:
+            if token is not None:
+                token.unregister(process)
 
+        if limits is not None:
+            limits.check(cmd_str, process.returncode, stderr)
         if check and process.returncode != 0:
             raise subprocess.CalledProcessError(
                 process.returncode, command, output=stdout, stderr=stderr
@@ -0,0 +1,107 @@
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+# * Directory names that only ever hold vendored dependencies, caches or tool output
+VENDOR_DIRECTORY_NAMES = (
+    # JavaScript/TypeScript packages
+    "node_modules",
+    "bower_components",
+    "jspm_packages",
+    # Python environments and caches
+    ".venv",
+    "__pycache__",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    # Gradle caches
+    ".gradle",
+)
+
+# * Files whose presence marks a directory as vendored or generated
+VENDOR_MARKER_FILES = (
+    # Python virtual environments (venv, virtualenv, uv)
+    "pyvenv.cfg",
+    # npm, yarn and pnpm write these into the root of node_modules
+    ".package-lock.json",
+    ".yarn-integrity",
+    ".modules.yaml",
+    # NuGet restore output inside obj/
+    "project.assets.json",
+    # Cache directory tagging standard (cargo, pip, many others)
+    "CACHEDIR.TAG",
+)
+
+# * Build output directories, pruned only when their parent holds a project
+# file of the build tool that produces them
+BUILD_OUTPUT_DIRECTORIES = {
+    "bin": (".csproj", ".fsproj", ".vbproj"),
+    "obj": (".csproj", ".fsproj", ".vbproj"),
+    "build": ("build.gradle", "build.gradle.kts"),
+}
+
+
+class VendorDetector:
+    """
+    Recognizes vendored dependency and build output directories that are not
+    covered by .gitignore, so a walk never enters them.
+
+    Names are checked first and cost nothing; marker files cost one stat
+    each; build output names consult a cached listing of their parent.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        directories: Iterable[str] = VENDOR_DIRECTORY_NAMES,
+        markers: Iterable[str] = VENDOR_MARKER_FILES,
+    ):
+        # * When disabled (check_vendor=True), nothing is pruned
+        self.enabled = enabled
+        self._names = frozenset(directories)
+        self._markers = tuple(markers)
+        self._project_files: Dict[str, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[dict]) -> "VendorDetector":
+        config = config or {}
+        patterns = config.get("vendor_patterns", {})
+        return cls(
+            enabled=not config.get("check_vendor", False),
+            directories=patterns.get("directories", VENDOR_DIRECTORY_NAMES),
+            markers=patterns.get("markers", VENDOR_MARKER_FILES),
+        )
+
+    def _parent_files(self, parent_path: str) -> Tuple[str, ...]:
+        files = self._project_files.get(parent_path)
+        if files is None:
+            try:
+                with os.scandir(parent_path) as it:
+                    files = tuple(e.name for e in it if e.is_file())
+            except OSError:
+                files = ()
+            self._project_files[parent_path] = files
+        return files
+
+    def reason(self, parent_path: str, dirname: str) -> Optional[str]:
+        """
+        Returns why parent_path/dirname is a vendored or build output
+        directory, or None if it should be walked.
+        """
+        if not self.enabled:
+            return None
+        if dirname in self._names:
+            return "well-known name"
+
+        dir_path = os.path.join(parent_path, dirname)
+        for marker in self._markers:
+            if os.path.isfile(os.path.join(dir_path, marker)):
+                return f"contains {marker}"
+
+        project_suffixes = BUILD_OUTPUT_DIRECTORIES.get(dirname)
+        if project_suffixes:
+            for name in self._parent_files(parent_path):
+                if name.endswith(project_suffixes):
+                    return f"build output of {name}"
+        return None
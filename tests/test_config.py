@@ -154,3 +154,13 @@ def test_backward_compatibility_with_missing_keys(tmp_path):
 
     # * Should preserve existing settings
     assert config["disabled_rules"]["python"] == ["E501"]
+
+
+def test_state_files_are_not_tool_configs(tmp_path):
+    os.makedirs(tmp_path / ".enforcer")
+    (tmp_path / ".enforcer" / "flake8.json").write_text('{"max-line-length": 100}')
+    (tmp_path / ".enforcer" / "fingerprints.json").write_text('{"files": {}}')
+
+    config = load_config(str(tmp_path))
+
+    assert config["tool_configs"] == {"flake8": {"max-line-length": 100}}
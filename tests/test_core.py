@@ -338,3 +338,399 @@ def test_scan_files_includes_fixtures_when_enabled(tmp_path):
         # Should include both main and fixture files
         assert any("main.py" in f for f in python_files)
         assert any("broken.py" in f for f in python_files)
+
+
+def test_get_language_uses_extension_map(enforcer):
+    assert enforcer.extension_map[".py"] == "python"
+    assert enforcer.get_language("pkg/Module.PY") == "python"
+    assert enforcer.get_language("app.tsx") == "js_ts"
+    # * Lookup must not mutate shared plugin state
+    assert not hasattr(enforcer.plugins["python"], "relative_path")
+
+
+def test_get_language_shebang_detection(tmp_path):
+    script = tmp_path / "manage"
+    script.write_text("#!/usr/bin/env python3\nprint('hi')\n")
+    node_script = tmp_path / "serve"
+    node_script.write_text("#!/usr/local/bin/node\n")
+
+    assert Enforcer(str(tmp_path)).get_language(str(script)) is None
+
+    enforcer = Enforcer(str(tmp_path), config={"detect_shebang": True})
+    assert enforcer.get_language(str(script)) == "python"
+    assert enforcer.get_language(str(node_script)) == "js_ts"
+
+
+def _checked_enforcer(tmp_path, plugins, config=None, files=None):
+    """Returns an Enforcer that checks files with plugins, all tools present."""
+    enforcer = Enforcer(str(tmp_path), config=config)
+    enforcer.plugins = plugins
+    files = files or {"python": ["a.py"]}
+    enforcer.scan_files = MagicMock(return_value=(files, []))
+    enforcer.check_tools = MagicMock(return_value=True)
+    return enforcer
+
+
+def _without_logging(target):
+    """Patches setup_logging of an Enforcer or its class to write nothing."""
+    return patch.object(
+        target, "setup_logging", return_value=(MagicMock(), MagicMock())
+    )
+
+
+def test_languages_run_concurrently_in_deterministic_order(tmp_path):
+    import threading
+
+    js_started = threading.Event()
+
+    def make_plugin(lang, on_lint):
+        plugin = MagicMock()
+        plugin.autofix_style.return_value = {"changed_count": 0}
+
+        def lint(files, *args, **kwargs):
+            on_lint()
+            return {"errors": [{"file": files[0], "rule": lang}], "warnings": []}
+
+        plugin.lint.side_effect = lint
+        return plugin
+
+    # * python only finishes once js_ts has started, which needs two workers
+    enforcer = _checked_enforcer(
+        tmp_path,
+        {
+            "python": make_plugin("python", lambda: js_started.wait(5)),
+            "js_ts": make_plugin("js_ts", js_started.set),
+        },
+        config={"language_workers": 2},
+        files={"python": ["a.py"], "js_ts": ["b.ts"]},
+    )
+
+    with _without_logging(enforcer):
+        result = enforcer.run_checks_structured()
+        output = enforcer.run_checks()
+
+    assert js_started.is_set()
+    assert [e["rule"] for e in result["errors"]] == ["python", "js_ts"]
+    assert output.index("Language: python") < output.index("Language: js_ts")
+
+
+def _max_concurrency(scheduler, weights):
+    import threading
+    import time
+
+    lock = threading.Lock()
+    state = {"running": 0, "max": 0}
+
+    def job(cores):
+        with scheduler.slot(cores):
+            with lock:
+                state["running"] += 1
+                state["max"] = max(state["max"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+
+    threads = [threading.Thread(target=job, args=(w,)) for w in weights]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return state["max"]
+
+
+def test_job_scheduler_limits_slots_by_weight():
+    from enforcer.core import JobScheduler
+
+    scheduler = JobScheduler(slots=2, adaptive=False)
+    assert _max_concurrency(scheduler, [1, 1, 1, 1]) == 2
+    # * A two-core job fills every slot, but is never starved
+    assert _max_concurrency(scheduler, [2, 2, 5]) == 1
+    assert scheduler.in_use == 0
+
+
+def test_job_scheduler_backs_off_under_external_load():
+    from enforcer.core import JobScheduler
+
+    scheduler = JobScheduler(slots=4, adaptive=True)
+    with patch("os.getloadavg", return_value=(1000.0, 0, 0)), patch(
+        "enforcer.core._available_memory_mb", return_value=None
+    ):
+        assert scheduler.capacity() == 1
+        assert _max_concurrency(scheduler, [1, 1, 1]) == 1
+
+    scheduler = JobScheduler(slots=4, adaptive=True)
+    with patch("os.getloadavg", return_value=(0.0, 0, 0)), patch(
+        "os.cpu_count", return_value=8
+    ), patch("enforcer.core._available_memory_mb", return_value=1500):
+        assert scheduler.capacity() == 4
+        with scheduler.slot(1, memory_mb=1000):
+            # * A second 1000 MB job does not fit into the remaining memory
+            assert not scheduler._fits(1, 1000)
+            assert scheduler._fits(1, 400)
+
+
+def test_fail_fast_cancels_running_tools(tmp_path):
+    import sys
+    import time
+
+    from enforcer.steps import ToolStep
+    from enforcer.utils import run_command
+
+    class SlowPlugin:
+        def autofix_style(self, files, tool_configs=None):
+            return {"changed_count": 0}
+
+        def lint_steps(self, files, disabled_rules, tool_configs=None, root_path=None):
+            def fail():
+                return {"errors": [{"file": "a.py", "rule": "E1"}], "warnings": []}
+
+            def slow():
+                run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+                return {"errors": [{"file": "a.py", "rule": "slow"}], "warnings": []}
+
+            return [ToolStep("slow", slow), ToolStep("fail", fail)]
+
+    enforcer = _checked_enforcer(
+        tmp_path, {"python": SlowPlugin()}, config={"fail_fast": True}
+    )
+
+    started = time.monotonic()
+    with _without_logging(enforcer):
+        result = enforcer.run_checks_structured()
+
+    assert time.monotonic() - started < 10
+    assert [e["rule"] for e in result["errors"]] == ["E1"]
+    assert "Check stopped early (fail_fast)" in result["messages"][-1]
+
+
+def _steps_plugin(steps):
+    class StepsPlugin:
+        def autofix_style(self, files, tool_configs=None):
+            return {"changed_count": 0}
+
+        def lint_steps(self, files, disabled_rules, tool_configs=None, root_path=None):
+            return steps
+
+    return StepsPlugin()
+
+
+def test_deadline_runs_cheap_steps_first_and_skips_slow_ones(tmp_path):
+    import time
+
+    from enforcer.steps import ToolStep
+
+    order = []
+
+    def step(name):
+        def run():
+            order.append(name)
+            return {"errors": [{"file": "a.py", "rule": name}], "warnings": []}
+
+        return ToolStep(name, run)
+
+    enforcer = _checked_enforcer(
+        tmp_path,
+        {"python": _steps_plugin([step("slow"), step("new"), step("cheap")])},
+        config={"tool_workers": 1},
+    )
+    enforcer.history.record_step("slow", 1, 600.0)
+    enforcer.history.record_step("cheap", 1, 0.1)
+
+    with _without_logging(enforcer):
+        result = enforcer.run_checks_structured(deadline=time.monotonic() + 60)
+
+    assert order == ["cheap", "new"]
+    assert [e["rule"] for e in result["errors"]] == ["new", "cheap"]
+    assert result["partial"] is True
+    assert result["skipped_steps"] == [
+        {"language": "python", "tool": "slow", "reason": "deadline"}
+    ]
+
+
+def test_deadline_terminates_running_tools(tmp_path):
+    import sys
+    import time
+
+    from enforcer.steps import ToolStep
+    from enforcer.utils import run_command
+
+    def slow():
+        run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+        return {"errors": [{"file": "a.py", "rule": "slow"}], "warnings": []}
+
+    def fast():
+        return {"errors": [{"file": "a.py", "rule": "fast"}], "warnings": []}
+
+    enforcer = _checked_enforcer(
+        tmp_path,
+        {"python": _steps_plugin([ToolStep("slow", slow), ToolStep("fast", fast)])},
+    )
+
+    started = time.monotonic()
+    with _without_logging(enforcer):
+        result = enforcer.run_checks_structured(deadline=started + 0.5)
+
+    assert time.monotonic() - started < 10
+    assert [e["rule"] for e in result["errors"]] == ["fast"]
+    assert result["partial"] is True
+    assert result["skipped_steps"] == [
+        {"language": "python", "tool": "slow", "reason": "deadline"}
+    ]
+
+
+def test_cancelling_async_check_kills_tools_and_keeps_loop_responsive(tmp_path):
+    import asyncio
+    import sys
+
+    from enforcer.steps import ToolStep
+    from enforcer.utils import run_command
+
+    def slow():
+        run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+        return {"errors": [], "warnings": []}
+
+    enforcer = _checked_enforcer(
+        tmp_path, {"python": _steps_plugin([ToolStep("slow", slow)])}
+    )
+
+    async def scenario():
+        task = asyncio.create_task(enforcer.run_checks_structured_async())
+        ticks = 0
+        while not enforcer.cancel_token._processes and ticks < 1000:
+            await asyncio.sleep(0.01)
+            ticks += 1
+        processes = list(enforcer.cancel_token._processes)
+        # * The tool is a child of this loop, which keeps serving other work
+        assert [type(p).__module__ for p in processes] == ["asyncio.subprocess"]
+        assert ticks < 1000
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 10)
+        return processes
+
+    with _without_logging(enforcer):
+        processes = asyncio.run(scenario())
+
+    assert processes[0].returncode is not None
+    assert enforcer.cancel_token.reason == "cancelled"
+
+
+def test_sync_checks_run_inside_a_running_event_loop(tmp_path):
+    import asyncio
+
+    enforcer = _checked_enforcer(tmp_path, {"python": _steps_plugin([])})
+
+    async def scenario():
+        # * Callers that already run a loop cannot use asyncio.run
+        return enforcer.run_checks_structured()
+
+    with _without_logging(enforcer):
+        result = asyncio.run(scenario())
+
+    assert result["errors"] == []
+
+
+def test_concurrent_async_checks_share_one_job_slot_with_the_loop(tmp_path):
+    import asyncio
+    import sys
+    import threading
+
+    from enforcer.core import JOB_SCHEDULER
+    from enforcer.steps import ToolStep
+    from enforcer.utils import run_command
+
+    def tool():
+        run_command([sys.executable, "-c", "import time; time.sleep(0.3)"])
+        return {"errors": [{"file": "a.py", "rule": "done"}], "warnings": []}
+
+    enforcers = [
+        _checked_enforcer(
+            tmp_path,
+            {"python": _steps_plugin([ToolStep("tool", tool)])},
+            config={"job_slots": 1, "adaptive_jobs": False},
+        )
+        for _ in range(2)
+    ]
+
+    async def scenario():
+        tasks = [
+            asyncio.create_task(enforcer.run_checks_structured_async())
+            for enforcer in enforcers
+        ]
+        while JOB_SCHEDULER.running == 0:
+            await asyncio.sleep(0.01)
+        # * A command run from the loop, like the MCP server's git calls,
+        # must not wait for the slot the running tool holds
+        run_command([sys.executable, "-c", "pass"])
+        return await asyncio.gather(*tasks)
+
+    results = []
+    runner = threading.Thread(
+        target=lambda: results.append(asyncio.run(scenario())), daemon=True
+    )
+    with _without_logging(Enforcer):
+        runner.start()
+        runner.join(20)
+    JOB_SCHEDULER.configure()
+
+    assert not runner.is_alive()
+    assert [[e["rule"] for e in r["errors"]] for r in results[0]] == [
+        ["done"],
+        ["done"],
+    ]
+
+
+def test_history_orders_steps_times_them_out_and_flags_regressions(tmp_path):
+    import subprocess
+    import sys
+    import time
+
+    from enforcer.steps import ToolStep
+    from enforcer.utils import run_command
+
+    order = []
+
+    def step(name, command=None, sleep=0):
+        def run():
+            order.append(name)
+            time.sleep(sleep)
+            if command:
+                try:
+                    run_command(command)
+                except subprocess.TimeoutExpired:
+                    return {"errors": [{"file": "unknown", "rule": "timeout"}]}
+            return {"errors": [], "warnings": []}
+
+        return ToolStep(name, run)
+
+    hang = [sys.executable, "-c", "import time; time.sleep(30)"]
+    steps = [
+        step("cheap"),
+        step("regressed", sleep=1.1),
+        step("hung", hang),
+        step("new"),
+    ]
+    enforcer = _checked_enforcer(
+        tmp_path,
+        {"python": _steps_plugin(steps)},
+        config={"tool_workers": 1, "tool_timeout": 0.5},
+    )
+    for _ in range(5):
+        enforcer.history.record_step("cheap", 1, 0.001)
+        enforcer.history.record_step("regressed", 1, 0.2)
+    enforcer.history.record_step("hung", 1, 0.1)
+
+    with _without_logging(enforcer):
+        result = enforcer.run_checks_structured()
+
+    # * Longest first, and steps without history before all others
+    assert order == ["new", "regressed", "hung", "cheap"]
+    assert [e["rule"] for e in result["errors"]] == ["timeout"]
+    # * The timed out run is not recorded as a usual duration
+    assert enforcer.history.step_percentile("hung", 1, 100) == 0.1
+    assert [s["tool"] for s in enforcer.slow_steps] == ["regressed"]
+    assert any(
+        m.startswith("python/regressed took 1.1s, more than 2x its usual 0.2s")
+        for m in result["messages"]
+    )
@@ -0,0 +1,145 @@
+import os
+
+from enforcer.core import Enforcer
+from enforcer.depgraph import DependencyGraph, js_imports
+
+
+class RecordingPlugin:
+    language = "python"
+
+    def __init__(self):
+        self.linted = []
+
+    def tool_versions(self, root_path=None):
+        return {"checker": "1.0"}
+
+    def autofix_style(self, files, tool_configs=None):
+        return {"changed_count": 0}
+
+    def lint(self, files, disabled_rules, tool_configs=None, root_path=None):
+        self.linted.append(sorted(os.path.relpath(f, root_path) for f in files))
+        return {"errors": [], "warnings": []}
+
+
+def _write(tmp_path, files):
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_python_imports_resolve_to_project_files(tmp_path):
+    _write(
+        tmp_path,
+        {
+            "app/__init__.py": "",
+            "app/main.py": "import os\nfrom . import util\nfrom .models import User\n",
+            "app/util.py": "from app.models import base\n",
+            "app/models/__init__.py": "from .base import Base\n",
+            "app/models/base.py": "",
+            "scripts/run.py": "import app.main\nimport helper\n",
+            "scripts/helper.py": "",
+        },
+    )
+    graph = DependencyGraph(str(tmp_path), str(tmp_path / "imports.json"))
+    paths = [str(p) for p in tmp_path.rglob("*.py")]
+    graph.update({p: "digest" for p in paths})
+
+    assert graph.files["app/main.py"][1] == [
+        "app/__init__.py",
+        "app/models/__init__.py",
+        "app/util.py",
+    ]
+    assert graph.files["app/util.py"][1] == [
+        "app/models/__init__.py",
+        "app/models/base.py",
+    ]
+    assert graph.files["scripts/run.py"][1] == ["app/main.py", "scripts/helper.py"]
+    assert graph.dependents([str(tmp_path / "app/models/base.py")]) == [
+        str(tmp_path / "app/main.py"),
+        str(tmp_path / "app/models/__init__.py"),
+        str(tmp_path / "app/util.py"),
+        str(tmp_path / "scripts/run.py"),
+    ]
+
+
+def test_js_imports_and_resolution(tmp_path):
+    source = (
+        "import React from 'react';\n"
+        'import { a,\n  b } from "./lib/a.js";\n'
+        "import './side-effect';\n"
+        "export * from '../shared';\n"
+        "const c = require('./c');\n"
+        "const lazy = await import('./lazy');\n"
+    )
+    assert js_imports(source) == [
+        "react",
+        "./lib/a.js",
+        "./side-effect",
+        "../shared",
+        "./c",
+        "./lazy",
+    ]
+
+    _write(
+        tmp_path,
+        {"src/index.ts": source, "src/lib/a.ts": "", "src/c/index.js": ""},
+    )
+    graph = DependencyGraph(str(tmp_path), str(tmp_path / "imports.json"))
+    graph.update({str(tmp_path / "src/index.ts"): "digest"})
+    assert graph.files["src/index.ts"][1] == ["src/c/index.js", "src/lib/a.ts"]
+
+
+def test_incremental_mode_rechecks_reverse_dependencies(tmp_path):
+    _write(
+        tmp_path,
+        {
+            "models.py": "class User: ...\n",
+            "service.py": "from models import User\n",
+            "views.py": "import service\n",
+            "other.py": "x = 1\n",
+        },
+    )
+    enforcer = Enforcer(str(tmp_path), config={"incremental": True})
+    plugin = RecordingPlugin()
+    everything = [str(tmp_path / name) for name in sorted(os.listdir(tmp_path))]
+    everything = [p for p in everything if p.endswith(".py")]
+
+    enforcer._run_language(plugin, "python", everything)
+    enforcer._run_language(plugin, "python", everything)
+    assert plugin.linted == [["models.py", "other.py", "service.py", "views.py"]]
+
+    # * Like --modified: only the edited file is targeted
+    (tmp_path / "models.py").write_text("class Account: ...\n")
+    enforcer._run_language(plugin, "python", [str(tmp_path / "models.py")])
+    assert plugin.linted[-1] == ["models.py", "service.py", "views.py"]
+
+    enforcer._run_language(plugin, "python", everything)
+    assert len(plugin.linted) == 2
+
+
+def test_creating_a_missing_module_invalidates_importers(tmp_path):
+    _write(
+        tmp_path,
+        {"app.py": "import settings\n", "web/index.ts": "import './routes';\n"},
+    )
+    enforcer = Enforcer(str(tmp_path), config={"incremental": True})
+    plugin = RecordingPlugin()
+    app = [str(tmp_path / "app.py")]
+
+    enforcer._run_language(plugin, "python", app)
+    enforcer._run_language(plugin, "python", app)
+    assert plugin.linted == [["app.py"]]
+
+    # * The cached "cannot find module" result must not outlive the module
+    _write(tmp_path, {"settings.py": "DEBUG = 1\n"})
+    enforcer._run_language(plugin, "python", app)
+    assert plugin.linted[-1] == ["app.py"]
+    assert enforcer.dependency_graph.files["app.py"][1] == ["settings.py"]
+
+    graph = DependencyGraph(str(tmp_path), str(tmp_path / "imports.json"))
+    index = str(tmp_path / "web/index.ts")
+    graph.update({index: "digest"})
+    before = graph.closure_digest(index, lambda path: "digest")
+    _write(tmp_path, {"web/routes/index.ts": ""})
+    assert graph.closure_digest(index, lambda path: "digest") != before
@@ -0,0 +1,305 @@
+import os
+import shutil
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.discovery import (
+    ParallelWalker,
+    SubmoduleIndex,
+    git_ls_files,
+    read_shebang_interpreter,
+)
+
+
+def _write(path, text="x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / ".gitignore", "build/\n*.log\n")
+    _write(root / "main.py")
+    _write(root / "app.log")
+    _write(root / "src" / "core.py")
+    _write(root / "src" / "web" / "index.ts")
+    _write(root / "src" / "build" / "out.py")
+    _write(root / "tests" / "test_main.py")
+    _write(root / "tests" / "fixtures" / "broken.py")
+    for i in range(30):
+        _write(root / "wide" / f"pkg{i}" / f"mod{i}.py")
+    return root
+
+
+def test_parallel_walker_prunes_and_sorts(tmp_path):
+    _write(tmp_path / "b.py")
+    _write(tmp_path / "a.py")
+    _write(tmp_path / "skip" / "c.py")
+    _write(tmp_path / "keep" / "d.py")
+    _write(tmp_path / "keep" / "notes.txt")
+
+    walker = ParallelWalker(
+        prune_dir=lambda root, name: name == "skip",
+        classify_file=lambda path: "python" if path.endswith(".py") else None,
+        max_workers=4,
+    )
+    result = walker.walk(str(tmp_path))
+
+    assert [os.path.relpath(p, tmp_path) for p, _ in result] == [
+        "a.py",
+        "b.py",
+        os.path.join("keep", "d.py"),
+    ]
+    assert {lang for _, lang in result} == {"python"}
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks unsupported")
+def test_parallel_walker_does_not_follow_directory_symlinks(tmp_path):
+    _write(tmp_path / "real" / "a.py")
+    try:
+        os.symlink(tmp_path / "real", tmp_path / "link", target_is_directory=True)
+    except OSError:
+        pytest.skip("cannot create symlinks")
+
+    walker = ParallelWalker(lambda root, name: False, lambda path: "python")
+    result = walker.walk(str(tmp_path))
+
+    assert [os.path.relpath(p, tmp_path) for p, _ in result] == [
+        os.path.join("real", "a.py")
+    ]
+
+
+def test_scandir_mode_matches_walk_mode(tree):
+    walk_result, walk_messages = Enforcer(
+        str(tree), config={"discovery_mode": "walk"}
+    ).scan_files()
+    scandir_result, scandir_messages = Enforcer(
+        str(tree), config={"discovery_mode": "scandir", "discovery_workers": 4}
+    ).scan_files()
+
+    assert scandir_result == walk_result
+    assert scandir_messages == walk_messages
+    assert not any("out.py" in f or "broken.py" in f for f in walk_result["python"])
+    assert len(walk_result["python"]) == 33
+
+
+def test_unknown_discovery_mode_falls_back_to_walk(tree):
+    files_by_lang, messages = Enforcer(
+        str(tree), config={"discovery_mode": "bogus"}
+    ).scan_files()
+
+    assert len(files_by_lang["python"]) == 33
+    assert messages == ["Unknown discovery_mode 'bogus', falling back to 'walk'."]
+
+
+def test_scan_files_iter_yields_bounded_batches(tree):
+    expected, _ = Enforcer(str(tree)).scan_files()
+
+    messages = []
+    batches = list(Enforcer(str(tree)).scan_files_iter(messages, batch_size=10))
+
+    assert all(len(files) <= 10 for _, files in batches)
+    assert len([b for b in batches if b[0] == "python"]) > 1
+    for lang, files in expected.items():
+        streamed = [
+            f for batch_lang, batch in batches if batch_lang == lang for f in batch
+        ]
+        assert sorted(streamed) == files
+    assert messages == []
+
+
+def test_streamed_checks_run_tools_per_batch(tree):
+    enforcer = Enforcer(str(tree), config={"stream_batch_size": 10})
+    expected, _ = enforcer.scan_files()
+    plugins = {}
+    for lang in ("python", "js_ts"):
+        plugin = MagicMock()
+        plugin.autofix_style.return_value = {"changed_count": 1}
+        plugin.lint.return_value = {
+            "errors": [{"file": str(tree / "main.py"), "line": 1}],
+            "warnings": [],
+        }
+        plugins[lang] = plugin
+    enforcer.plugins = plugins
+    enforcer.check_tools = MagicMock(return_value=True)
+
+    with patch.object(
+        enforcer, "setup_logging", return_value=(MagicMock(), MagicMock())
+    ):
+        result = enforcer.run_checks_structured()
+
+    python_calls = plugins["python"].lint.call_args_list
+    assert len(python_calls) > 1
+    linted = sorted(f for call in python_calls for f in call.args[0])
+    assert linted == expected["python"]
+    calls = len(python_calls) + plugins["js_ts"].lint.call_count
+    assert result["formatted_files"] == calls
+    assert len(result["errors"]) == calls
+    assert result["errors"][0]["file"] == "main.py"
+
+
+def test_scan_stats_count_visits_prunes_and_languages(tree):
+    for mode in ("walk", "scandir"):
+        enforcer = Enforcer(str(tree), config={"discovery_mode": mode})
+        enforcer.scan_files()
+        stats = enforcer.scan_stats.as_dict()
+
+        # * repo, .enforcer, src, src/web, tests, wide and its 30 packages
+        assert stats["directories_visited"] == 36
+        assert stats["directories_pruned"] == {"gitignore": 1, "fixture": 1}
+        # * app.log is ignored and .gitignore has no supported language
+        assert stats["files_excluded"] == {"gitignore": 1, "language": 1}
+        assert stats["files_by_language"] == {"js_ts": 1, "python": 33}
+        assert set(stats["filter_time_ms"]) == {
+            "fixture",
+            "gitignore",
+            "guard",
+            "language",
+            "submodule",
+            "vendor",
+        }
+
+
+def test_structured_result_includes_scan_stats(tree):
+    enforcer = Enforcer(str(tree), target_paths=["src"])
+    plugin = MagicMock()
+    plugin.autofix_style.return_value = {"changed_count": 0}
+    plugin.lint.return_value = {"errors": [], "warnings": []}
+    enforcer.plugins = {"python": plugin, "js_ts": plugin}
+    enforcer.check_tools = MagicMock(return_value=True)
+
+    result = enforcer.run_checks_structured()
+
+    assert result["scan_stats"]["files_by_language"] == {"js_ts": 1, "python": 1}
+    with open(enforcer.stats_log_path, encoding="utf-8") as f:
+        assert "scan_stats: " in f.read()
+
+
+def _git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def git_tree(tree):
+    if not shutil.which("git"):
+        pytest.skip("git is not installed")
+    _git(tree, "init", "-q")
+    _git(tree, "add", ".")
+    _git(tree, "commit", "-q", "-m", "init")
+    return tree
+
+
+def test_git_ls_files_lists_tracked_and_untracked(git_tree):
+    _write(git_tree / "new.py")
+    _write(git_tree / "ignored.log")
+    os.remove(git_tree / "main.py")
+
+    listed = {os.path.relpath(p, git_tree) for p in git_ls_files(str(git_tree))}
+
+    assert "new.py" in listed
+    assert os.path.join("src", "core.py") in listed
+    assert "main.py" not in listed
+    assert "ignored.log" not in listed
+    assert os.path.join("src", "build", "out.py") not in listed
+
+
+def test_git_ls_files_outside_git_returns_none(tmp_path):
+    with patch("enforcer.discovery.get_git_root", return_value=None):
+        assert git_ls_files(str(tmp_path)) is None
+
+
+def test_git_mode_matches_walk_mode(git_tree):
+    walk_result, _ = Enforcer(str(git_tree)).scan_files()
+    git_result, messages = Enforcer(
+        str(git_tree), config={"discovery_mode": "git"}
+    ).scan_files()
+
+    assert git_result == walk_result
+    assert not messages
+
+
+def test_git_mode_excludes_submodules(git_tree):
+    enforcer = Enforcer(str(git_tree), config={"discovery_mode": "git"})
+    enforcer.submodule_index = SubmoduleIndex([str(git_tree / "src")])
+
+    files_by_lang, _ = enforcer.scan_files()
+
+    assert not any(os.sep + "src" + os.sep in f for f in files_by_lang["python"])
+
+
+def test_git_mode_falls_back_to_walk_outside_git(tree):
+    with patch("enforcer.discovery.get_git_root", return_value=None):
+        git_result, _ = Enforcer(
+            str(tree), config={"discovery_mode": "git"}
+        ).scan_files()
+    walk_result, _ = Enforcer(str(tree)).scan_files()
+
+    assert git_result == walk_result
+
+
+def test_submodule_index_lookups(tmp_path):
+    index = SubmoduleIndex([str(tmp_path / "libs" / f"mod{i}") for i in range(64)])
+
+    assert index.contains(str(tmp_path / "libs" / "mod7"))
+    assert index.contains(str(tmp_path / "libs" / "mod7" / "src" / "a.py"))
+    assert not index.contains(str(tmp_path / "libs"))
+    assert not index.contains(str(tmp_path / "libs" / "mod7x" / "a.py"))
+    assert index.is_root(str(tmp_path / "libs" / "mod63"))
+    assert not index.is_root(str(tmp_path / "libs" / "mod63" / "a.py"))
+    assert not SubmoduleIndex()
+
+
+def test_scan_files_prunes_submodules_from_gitmodules(tree):
+    _write(tree / "vendor" / "lib" / "dep.py")
+    _write(tree / ".gitmodules", '[submodule "lib"]\n\tpath = vendor/lib\n')
+    enforcer = Enforcer(str(tree))
+
+    with patch.object(
+        enforcer, "_classify_file", wraps=enforcer._classify_file
+    ) as classify:
+        files_by_lang, _ = enforcer.scan_files()
+
+    assert not any("dep.py" in f for f in files_by_lang["python"])
+    # * Files inside the submodule are never enumerated
+    assert not any("dep.py" in call.args[0] for call in classify.call_args_list)
+
+
+def test_scan_files_skips_target_inside_submodule(tree):
+    _write(tree / "vendor" / "lib" / "dep.py")
+    _write(tree / ".gitmodules", '[submodule "lib"]\n\tpath = vendor/lib\n')
+    enforcer = Enforcer(str(tree), target_paths=["vendor/lib"])
+
+    files_by_lang, messages = enforcer.scan_files()
+
+    assert files_by_lang == {}
+    assert messages == [f"No supported files in directory: {tree / 'vendor' / 'lib'}"]
+
+
+@pytest.mark.parametrize(
+    "head, expected",
+    [
+        ("#!/usr/bin/python3.11\n", "python"),
+        ("#!/usr/bin/env python3 -u\n", "python"),
+        ("#!/usr/bin/env -S FOO=1 node --harmony\n", "node"),
+        ("#! /bin/sh\n", "sh"),
+        ("print('no shebang')\n", None),
+        ("#!\n", None),
+    ],
+)
+def test_read_shebang_interpreter(tmp_path, head, expected):
+    script = tmp_path / "script"
+    script.write_text(head + "x" * 10000)
+    assert read_shebang_interpreter(str(script)) == expected
+
+
+def test_read_shebang_interpreter_missing_file(tmp_path):
+    assert read_shebang_interpreter(str(tmp_path / "missing")) is None
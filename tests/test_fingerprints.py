@@ -0,0 +1,67 @@
+import hashlib
+import os
+
+from enforcer.core import Enforcer
+from enforcer.fingerprints import FingerprintIndex, hash_file
+
+
+def _age(path, seconds=60):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_hash_file_matches_sha1(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"x = 1\n")
+    empty = tmp_path / "empty.py"
+    empty.write_bytes(b"")
+
+    assert hash_file(str(path)) == hashlib.sha1(b"x = 1\n").hexdigest()
+    assert hash_file(str(empty)) == hashlib.sha1(b"").hexdigest()
+    assert hash_file(str(tmp_path / "missing.py")) is None
+
+
+def test_unchanged_files_are_not_rehashed(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"m{i}.py"
+        path.write_text(f"x = {i}\n")
+        _age(path)
+        paths.append(str(path))
+    index_path = str(tmp_path / "fingerprints.json")
+
+    index = FingerprintIndex(str(tmp_path), index_path)
+    first = index.fingerprints(paths)
+    assert index.hashed == 5
+    index.save()
+
+    reloaded = FingerprintIndex(str(tmp_path), index_path)
+    assert reloaded.fingerprints(paths) == first
+    assert reloaded.hashed == 0
+
+    # * A changed stat tuple triggers a rehash of that file only
+    (tmp_path / "m0.py").write_text("x = 100\n")
+    _age(tmp_path / "m0.py")
+    updated = reloaded.fingerprints(paths)
+    assert reloaded.hashed == 1
+    assert updated[paths[0]] != first[paths[0]]
+    assert updated[paths[1]] == first[paths[1]]
+
+
+def test_racily_clean_files_are_always_rehashed(tmp_path):
+    path = tmp_path / "fresh.py"
+    path.write_text("x = 1\n")
+    index = FingerprintIndex(str(tmp_path), str(tmp_path / "fingerprints.json"))
+
+    index.fingerprint(str(path))
+    index.fingerprint(str(path))
+    assert index.hashed == 2
+    assert index.entries == {}
+
+
+def test_enforcer_and_plugins_share_the_index(tmp_path):
+    enforcer = Enforcer(str(tmp_path))
+    assert enforcer.fingerprints is FingerprintIndex.for_root(str(tmp_path))
+    assert enforcer.fingerprints.path == os.path.join(
+        str(tmp_path), ".enforcer", "fingerprints.json"
+    )
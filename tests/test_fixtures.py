@@ -0,0 +1,48 @@
+import os
+
+from enforcer.fixtures import FixtureClassifier
+
+
+def test_from_config_defaults():
+    classifier = FixtureClassifier.from_config({})
+    assert classifier.enabled is True
+    assert classifier.is_fixture_directory("fixtures", "src") is True
+    assert classifier.is_fixture_directory("core", "src") is False
+
+
+def test_from_config_check_fixtures_disables_detection():
+    classifier = FixtureClassifier.from_config({"check_fixtures": True})
+    assert classifier.is_fixture_directory("fixtures", "tests") is False
+    assert (
+        classifier.is_fixture_file(os.path.join("tests", "fixtures", "a.py")) is False
+    )
+
+
+def test_custom_patterns():
+    classifier = FixtureClassifier(
+        custom_directories=["Golden"], custom_files=["recorded"]
+    )
+    assert classifier.is_fixture_directory("golden", "src") is True
+    assert classifier.is_fixture_file("recorded_api.py") is True
+    # * Test files are never fixtures, even when they match a pattern
+    assert classifier.is_fixture_file("test_recorded_api.py") is False
+
+
+def test_nested_fragments_only_apply_inside_test_directories():
+    classifier = FixtureClassifier()
+    assert (
+        classifier.is_fixture_directory("userdata", os.path.join("app", "specs"))
+        is True
+    )
+    assert (
+        classifier.is_fixture_directory("userdata", os.path.join("app", "src")) is False
+    )
+
+
+def test_directory_decisions_are_cached():
+    classifier = FixtureClassifier()
+    classifier.is_fixture_file(os.path.join("tests", "fixtures", "a.py"))
+    classifier.is_fixture_file(os.path.join("tests", "fixtures", "b.py"))
+
+    assert classifier._directory_cache == {("fixtures", "tests"): True}
+    assert classifier._parent_cache == {os.path.join("tests", "fixtures"): True}
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.guard import GUARD_READ_BYTES, FileGuard
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        (b"x = 1\ny = 2\n", None),
+        (b"/*! lib v1 | MIT */\n" + b"var a=1;" * 2000, "minified"),
+        (b"x = 1\n" + b"s = '" + b"a" * 3000 + b"'\n" + b"y = 2\n" * 50, None),
+        (
+            b"# Generated by the protocol buffer compiler.  DO NOT EDIT!\nx = 1\n",
+            "generated",
+        ),
+        (b"// Code generated by go generate; DO NOT EDIT.\n", "generated"),
+        (b"\n" * 10 + b"# generated by hand\n", None),
+        (
+            b"// <auto-generated>\n//   This code was generated by a tool.\n",
+            "generated",
+        ),
+        (b'"""Relay artifacts."""\n\n# @generated SignedSource<<1a2b>>\n', "generated"),
+        (b'"""Helpers for code generated by the parser generator."""\n', None),
+        (b"# Do not edit this list without updating docs\n", None),
+        (b"# auto-generated ids start here\nIDS = []\n", None),
+        (b'MSG = "Code generated by tool. DO NOT EDIT."\n', None),
+    ],
+)
+def test_guard_reasons(tmp_path, content, expected):
+    path = tmp_path / "sample.py"
+    path.write_bytes(content)
+    assert FileGuard().reason(str(path)) == expected
+
+
+def test_guard_size_limit_and_bounded_read(tmp_path):
+    path = tmp_path / "big.py"
+    path.write_bytes(b"x = 1\n" * 100_000)
+
+    assert FileGuard(max_size=1000).reason(str(path)) == "larger than 1000 bytes"
+
+    reads = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        real_read = f.read
+        f.read = lambda n=-1: reads.append(n) or real_read(n)
+        return f
+
+    guard = FileGuard(max_size=0)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("builtins.open", tracking_open)
+        assert guard.reason(str(path)) is None
+    assert reads == [GUARD_READ_BYTES]
+
+
+def test_guard_from_config():
+    guard = FileGuard.from_config(
+        {"max_file_size": 0, "max_line_length": 0, "check_generated": True}
+    )
+    assert not guard
+
+
+def test_scan_files_reports_guarded_files(tmp_path):
+    (tmp_path / "main.py").write_text("x = 1\n")
+    (tmp_path / "bundle.min.js").write_text("var a=1;" * 2000)
+    (tmp_path / "api_pb2.py").write_text("# Generated by protoc. DO NOT EDIT!\n")
+
+    files_by_lang, messages = Enforcer(str(tmp_path)).scan_files()
+
+    assert files_by_lang == {"python": [os.path.join(str(tmp_path), "main.py")]}
+    assert sorted(messages) == [
+        "Skipped file: api_pb2.py (generated)",
+        "Skipped file: bundle.min.js (minified)",
+    ]
+
+    files_by_lang, messages = Enforcer(
+        str(tmp_path), config={"check_generated": True, "max_line_length": 0}
+    ).scan_files()
+    assert len(files_by_lang["python"]) == 2
+    assert files_by_lang["js_ts"] == [os.path.join(str(tmp_path), "bundle.min.js")]
@@ -0,0 +1,58 @@
+from enforcer.history import MIN_TIMEOUT_SECONDS, ToolHistory, percentile
+
+
+def test_percentiles_prefer_runs_of_a_comparable_size(tmp_path):
+    history = ToolHistory(str(tmp_path / "history.json"))
+    assert history.estimate("mypy", 10) is None
+    assert percentile([5, 1, 4, 2, 3], 50) == 3
+    assert percentile([5, 1, 4, 2, 3], 95) == 5
+
+    # * Small runs cost more per file than full ones
+    for seconds in (1.0, 1.0, 1.0, 1.0, 2.0):
+        history.record_step("mypy", 1, seconds)
+    for _ in range(5):
+        history.record_step("mypy", 100, 10.0)
+    assert history.estimate("mypy", 2) == 2.0
+    assert history.estimate("mypy", 200) == 20.0
+
+    history.save()
+    reloaded = ToolHistory(str(tmp_path / "history.json"))
+    assert reloaded.step_percentile("mypy", 1, 95) == 2.0
+
+
+def test_adaptive_timeout_and_regressions(tmp_path):
+    history = ToolHistory(str(tmp_path / "history.json"))
+    for _ in range(4):
+        assert history.record_step("pyright", 10, 30.0) is None
+    assert history.timeout("pyright", 10) is None
+
+    assert history.record_step("pyright", 10, 40.0) is None
+    assert history.timeout("pyright", 10) == 160.0
+    assert history.timeout("pyright", 10, factor=1) == MIN_TIMEOUT_SECONDS
+
+    assert history.record_step("pyright", 10, 70.0) is None
+    assert history.record_step("pyright", 10, 150.0) == 70.0
+    # * Quick tools are not flagged for noise
+    for _ in range(5):
+        history.record_step("flake8", 10, 0.1)
+    assert history.record_step("flake8", 10, 0.5) is None
+
+
+def test_whole_program_steps_are_not_scaled_by_file_count(tmp_path):
+    history = ToolHistory(str(tmp_path / "history.json"))
+    for _ in range(5):
+        history.record_step("mypy", 2000, 120.0, whole_program=True)
+
+    # * A --modified run over a few files still checks the whole program
+    assert history.estimate("mypy", 3, whole_program=True) == 120.0
+    assert history.estimate("mypy", 2000, whole_program=True) == 120.0
+    # * Without comparable runs, "tool_timeout" applies and nothing is flagged
+    assert history.timeout("mypy", 3, whole_program=True) is None
+    assert history.record_step("mypy", 3, 30.0, whole_program=True) is None
+    assert history.timeout("mypy", 2000, whole_program=True) == 480.0
+
+    # * Per-file tools still scale their estimates, but not their timeouts
+    for _ in range(5):
+        history.record_step("flake8", 2000, 20.0)
+    assert history.estimate("flake8", 3) == 0.03
+    assert history.timeout("flake8", 3) is None
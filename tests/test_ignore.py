@@ -0,0 +1,123 @@
+import os
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.ignore import IgnoreMatcher, parse_rule
+
+
+def _write(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def test_parse_rule_skips_comments_and_blank_lines():
+    assert parse_rule("") is None
+    assert parse_rule("   \n") is None
+    assert parse_rule("# comment") is None
+    assert parse_rule("\\#file")[0].endswith("\\#file")
+
+
+def test_parse_rule_flags():
+    _, negated, dir_only = parse_rule("!build/")
+    assert negated is True
+    assert dir_only is True
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.log", "a/b/debug.log", False, True),
+        ("*.log", "debug.txt", False, False),
+        ("/build", "build", True, True),
+        ("/build", "src/build", True, False),
+        ("build/", "src/build", True, True),
+        ("build/", "src/build", False, False),
+        ("doc/*.txt", "doc/notes.txt", False, True),
+        ("doc/*.txt", "doc/server/arch.txt", False, False),
+        ("**/logs", "deep/down/logs", True, True),
+        ("a/**/b", "a/b", True, True),
+        ("a/**/b", "a/x/y/b", True, True),
+        ("abc/**", "abc/x/y.py", False, True),
+        ("file?.py", "file1.py", False, True),
+        ("file[0-9].py", "file7.py", False, True),
+        ("file[!0-9].py", "file7.py", False, False),
+    ],
+)
+def test_pattern_semantics(tmp_path, pattern, path, is_dir, expected):
+    _write(tmp_path / ".gitignore", pattern + "\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / path), is_dir=is_dir) is expected
+
+
+def test_negation_last_rule_wins(tmp_path):
+    _write(tmp_path / ".gitignore", "*.py\n!keep.py\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "drop.py"), is_dir=False) is True
+    assert matcher(str(tmp_path / "keep.py"), is_dir=False) is False
+
+
+def test_ignored_directory_cannot_be_reincluded(tmp_path):
+    _write(tmp_path / ".gitignore", "out/\n!out/keep.py\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "out" / "keep.py"), is_dir=False) is True
+
+
+def test_nested_gitignore_overrides_parent(tmp_path):
+    _write(tmp_path / ".gitignore", "*.gen.py\n")
+    _write(tmp_path / "pkg" / ".gitignore", "!*.gen.py\nlocal.py\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "a.gen.py"), is_dir=False) is True
+    assert matcher(str(tmp_path / "pkg" / "a.gen.py"), is_dir=False) is False
+    assert matcher(str(tmp_path / "pkg" / "local.py"), is_dir=False) is True
+    # * Nested rules do not leak to siblings
+    assert matcher(str(tmp_path / "local.py"), is_dir=False) is False
+
+
+def test_nested_anchored_pattern_is_relative_to_its_directory(tmp_path):
+    _write(tmp_path / "pkg" / ".gitignore", "/gen\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "pkg" / "gen"), is_dir=True) is True
+    assert matcher(str(tmp_path / "gen"), is_dir=True) is False
+
+
+def test_info_exclude_has_lowest_precedence(tmp_path):
+    _write(tmp_path / ".git" / "info" / "exclude", "*.tmp.py\nscratch.py\n")
+    _write(tmp_path / ".gitignore", "!scratch.py\n")
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "x.tmp.py"), is_dir=False) is True
+    assert matcher(str(tmp_path / "scratch.py"), is_dir=False) is False
+
+
+def test_git_directory_is_always_ignored(tmp_path):
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / ".git"), is_dir=True) is True
+    assert matcher(str(tmp_path / ".git" / "hooks" / "x.py"), is_dir=False) is True
+
+
+def test_paths_outside_root_are_not_ignored(tmp_path):
+    _write(tmp_path / "repo" / ".gitignore", "*.py\n")
+    matcher = IgnoreMatcher(str(tmp_path / "repo"))
+    assert matcher(str(tmp_path / "other.py"), is_dir=False) is False
+
+
+def test_is_dir_detected_when_omitted(tmp_path):
+    _write(tmp_path / ".gitignore", "cache/\n")
+    (tmp_path / "cache").mkdir()
+    matcher = IgnoreMatcher(str(tmp_path))
+    assert matcher(str(tmp_path / "cache")) is True
+
+
+def test_scan_files_prunes_nested_ignored_directories(tmp_path):
+    _write(tmp_path / "main.py", "x = 1\n")
+    _write(tmp_path / "pkg" / ".gitignore", "generated/\n")
+    _write(tmp_path / "pkg" / "mod.py", "x = 1\n")
+    _write(tmp_path / "pkg" / "generated" / "out.py", "x = 1\n")
+    _write(tmp_path / ".git" / "hooks" / "hook.py", "x = 1\n")
+
+    enforcer = Enforcer(str(tmp_path))
+    files_by_lang, _ = enforcer.scan_files()
+
+    python_files = [os.path.relpath(f, tmp_path) for f in files_by_lang["python"]]
+    assert sorted(python_files) == ["main.py", os.path.join("pkg", "mod.py")]
@@ -0,0 +1,141 @@
+import os
+import time
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.inventory import INVENTORY_FILENAME, DirectoryInventory
+
+OLD_NS = (time.time_ns() // 10**9 - 3600) * 10**9
+
+
+def _write(path, text="x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def _age(root):
+    """Move every mtime under root an hour back, out of the racy window."""
+    for current, dirs, files in os.walk(root):
+        for name in files:
+            os.utime(os.path.join(current, name), ns=(OLD_NS, OLD_NS))
+        os.utime(current, ns=(OLD_NS, OLD_NS))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / "main.py")
+    _write(root / "src" / "core.py")
+    _write(root / "src" / "gen" / "out.py")
+    _write(root / "web" / "app.py")
+    _age(root)
+    return root
+
+
+def _scan(root, **config):
+    enforcer = Enforcer(str(root), config={"inventory_cache": True, **config})
+    files_by_lang, _ = enforcer.scan_files()
+    rel = {
+        lang: sorted(os.path.relpath(f, root) for f in files)
+        for lang, files in files_by_lang.items()
+    }
+    return rel, enforcer.inventory
+
+
+def test_store_and_lookup_roundtrip(tmp_path):
+    path = str(tmp_path / INVENTORY_FILENAME)
+    inventory = DirectoryInventory(str(tmp_path), path, "fp")
+    src = str(tmp_path / "src")
+    inventory.store(src, OLD_NS, "sig", [(os.path.join(src, "a.py"), "python")], [], [])
+    inventory.save()
+
+    loaded = DirectoryInventory.load(str(tmp_path), path, "fp")
+    assert loaded.lookup(src, OLD_NS, "sig") == (
+        [(os.path.join(src, "a.py"), "python")],
+        [],
+        [],
+    )
+    assert loaded.lookup(src, OLD_NS + 1, "sig") is None
+    assert loaded.lookup(src, OLD_NS, "other") is None
+    assert DirectoryInventory.load(str(tmp_path), path, "new-fp").entries == {}
+
+
+def test_racy_directories_are_not_cached(tmp_path):
+    inventory = DirectoryInventory(str(tmp_path), str(tmp_path / "inv.json"), "fp")
+    now = time.time_ns()
+    inventory.store(str(tmp_path), now, None, [], [], [], listed_at_ns=now)
+    assert inventory.entries == {}
+
+
+def test_unchanged_directories_are_reused(repo):
+    first, inventory = _scan(repo)
+    assert inventory.hits == 0
+    assert os.path.exists(repo / ".enforcer" / INVENTORY_FILENAME)
+
+    # * The first run created .enforcer/, so the root is only cached by the second
+    _age(repo)
+    _scan(repo)
+    _age(repo)
+    third, inventory = _scan(repo)
+
+    assert third == first
+    assert inventory.misses == 0
+    assert inventory.hits == 5
+
+
+def test_changed_directory_is_relisted(repo):
+    _scan(repo)
+    _write(repo / "src" / "new.py")
+    _age(repo)
+    os.utime(repo / "src", ns=(OLD_NS + 10**9, OLD_NS + 10**9))
+
+    result, _ = _scan(repo)
+    assert os.path.join("src", "new.py") in result["python"]
+
+
+def test_nested_gitignore_edit_invalidates_listing(repo):
+    _write(repo / "src" / ".gitignore", "# nothing yet\n")
+    _age(repo)
+    first, _ = _scan(repo)
+    assert os.path.join("src", "gen", "out.py") in first["python"]
+
+    # * Edit in place, keeping every directory mtime unchanged
+    _write(repo / "src" / ".gitignore", "gen/\n")
+    _age(repo)
+    os.utime(repo / "src" / ".gitignore", ns=(OLD_NS + 10**9, OLD_NS + 10**9))
+
+    second, _ = _scan(repo)
+    assert os.path.join("src", "gen", "out.py") not in second["python"]
+
+
+def test_vendor_markers_are_rechecked_in_cached_listings(repo):
+    _scan(repo)
+    _age(repo)
+    _scan(repo)
+
+    # * Creating a marker only changes the mtime of the marked directory
+    _write(repo / "web" / "pyvenv.cfg", "home = /usr/bin\n")
+    _age(repo)
+    result, inventory = _scan(repo)
+    assert inventory.hits > 0
+    assert os.path.join("web", "app.py") not in result["python"]
+
+    os.remove(repo / "web" / "pyvenv.cfg")
+    _age(repo)
+    result, _ = _scan(repo)
+    assert os.path.join("web", "app.py") in result["python"]
+
+
+def test_fixture_config_change_invalidates_inventory(repo):
+    _scan(repo)
+    result, inventory = _scan(
+        repo, custom_fixture_patterns={"directories": ["gen"], "files": []}
+    )
+    assert inventory.hits == 0
+    assert os.path.join("src", "gen", "out.py") not in result["python"]
+
+
+def test_inventory_disabled_by_default(repo):
+    Enforcer(str(repo)).scan_files()
+    assert not os.path.exists(repo / ".enforcer" / INVENTORY_FILENAME)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.limits import ResourceLimitExceeded, ResourceLimits
+from enforcer.steps import ToolStep
+from enforcer.utils import (
+    CancelToken,
+    CommandCancelled,
+    cancel_scope,
+    resource_limits,
+    run_command,
+    run_command_async,
+)
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="rlimits are POSIX only")
+
+BURN_CPU = [sys.executable, "-c", "while True: pass"]
+
+
+class LimitedPlugin:
+    language = "python"
+
+    def autofix_style(self, files, tool_configs=None):
+        return {"changed_count": 0}
+
+    def lint_steps(self, files, disabled_rules, tool_configs=None, root_path=None):
+        def burn():
+            run_command(BURN_CPU)
+            return {"errors": [], "warnings": []}
+
+        return [ToolStep("burner", burn)]
+
+
+def _python(code, limits):
+    with resource_limits(limits):
+        return run_command([sys.executable, "-c", code], return_output=True)
+
+
+def test_limits_come_from_config_per_tool():
+    config = {
+        "resource_limits": {
+            "default": {"nice": 5},
+            "pyright": {"max_memory_mb": 2048, "cpus": [0, 1]},
+        }
+    }
+    assert ResourceLimits.from_config(config, "pyright") == ResourceLimits(
+        nice=5, max_memory_mb=2048, cpus=(0, 1)
+    )
+    assert ResourceLimits.from_config(config, "mypy") == ResourceLimits(nice=5)
+    assert ResourceLimits.from_config({}, "mypy") is None
+
+
+def test_nice_and_affinity_are_applied_to_the_child():
+    limits = ResourceLimits(nice=3, cpus=(0,))
+    code = "import os; print(os.nice(0), sorted(os.sched_getaffinity(0)))"
+    result = _python(code, limits)
+    assert result.stdout.split(" ", 1) == [str(os.nice(0) + 3), "[0]\n"]
+
+    async def scenario():
+        return await run_command_async(
+            [sys.executable, "-c", "import os; print(os.nice(0))"],
+            return_output=True,
+            limits=limits,
+        )
+
+    assert asyncio.run(scenario()).stdout == f"{os.nice(0) + 3}\n"
+
+
+def test_exceeded_limits_raise():
+    with pytest.raises(ResourceLimitExceeded, match="CPU time limit of 1s"):
+        with resource_limits(ResourceLimits(max_cpu_seconds=1)):
+            run_command(BURN_CPU)
+    with pytest.raises(ResourceLimitExceeded, match="limit of 200 MB"):
+        _python("x = bytearray(400 * 1024 * 1024)", ResourceLimits(max_memory_mb=200))
+    assert _python("print('ok')", ResourceLimits(max_memory_mb=200)).stdout == "ok\n"
+
+
+def test_processes_killed_by_the_enforcer_are_not_blamed_on_limits(monkeypatch):
+    limits = ResourceLimits(max_memory_mb=1024, max_cpu_seconds=60)
+    # * Someone else's SIGKILL, e.g. the OOM killer, is no address-space breach
+    ResourceLimits(max_memory_mb=1024).check("tool", -signal.SIGKILL, "")
+
+    sleep = [sys.executable, "-c", "import time; time.sleep(30)"]
+    with pytest.raises(subprocess.TimeoutExpired):
+        with resource_limits(limits):
+            run_command(sleep, timeout=0.5)
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_command_async(sleep, timeout=0.5, limits=limits))
+
+    # * Ignores SIGTERM, so cancelling it ends in a SIGKILL
+    monkeypatch.setattr("enforcer.utils.CANCEL_GRACE_SECONDS", 0.1)
+    stubborn = [
+        sys.executable,
+        "-c",
+        "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+        "time.sleep(30)",
+    ]
+    token = CancelToken()
+    threading.Timer(0.5, token.cancel).start()
+    with pytest.raises(CommandCancelled):
+        with cancel_scope(token), resource_limits(limits):
+            run_command(stubborn)
+
+
+def test_exceeded_limit_is_reported_as_tool_failure(tmp_path):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    config = {"resource_limits": {"burner": {"max_cpu_seconds": 1}}}
+    enforcer = Enforcer(str(tmp_path), config=config)
+
+    errors, _, _ = enforcer._run_language(
+        LimitedPlugin(), "python", [str(tmp_path / "a.py")]
+    )
+    assert [(e["tool"], e["file"]) for e in errors] == [("burner", "unknown")]
+    assert "CPU time limit of 1s" in errors[0]["message"]
+    assert enforcer.history.estimate("burner", 1) is None
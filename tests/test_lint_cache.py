@@ -0,0 +1,152 @@
+import os
+from functools import partial
+
+from enforcer.core import Enforcer
+from enforcer.lint_cache import LintCache
+from enforcer.steps import ToolStep
+
+
+class CachingPlugin:
+    language = "python"
+    config_files = ["setup.cfg"]
+
+    def __init__(self):
+        self.linted = []
+        self.version = "1.0"
+
+    def tool_versions(self, root_path=None):
+        return {"linter": self.version}
+
+    def autofix_style(self, files, tool_configs=None):
+        return {"changed_count": 0}
+
+    def lint(self, files, disabled_rules, tool_configs=None, root_path=None):
+        self.linted.append(sorted(os.path.basename(f) for f in files))
+        errors = [
+            {"tool": "linter", "file": f, "line": 1, "message": "bad", "rule": "E1"}
+            for f in files
+            if "bad" in open(f).read()
+        ]
+        return {"errors": errors, "warnings": []}
+
+
+def _setup(tmp_path, config=None):
+    (tmp_path / "a.py").write_text("bad\n")
+    (tmp_path / "b.py").write_text("good\n")
+    enforcer = Enforcer(str(tmp_path), config=config)
+    files = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    return enforcer, CachingPlugin(), files
+
+
+def test_rerun_only_lints_cache_misses(tmp_path):
+    enforcer, plugin, files = _setup(tmp_path)
+
+    first = enforcer._run_language(plugin, "python", files)
+    second = enforcer._run_language(plugin, "python", files)
+    assert plugin.linted == [["a.py", "b.py"]]
+    assert second == first
+    assert [e["file"] for e in second[0]] == ["a.py"]
+
+    (tmp_path / "b.py").write_text("bad too\n")
+    errors, _, _ = enforcer._run_language(plugin, "python", files)
+    assert plugin.linted[-1] == ["b.py"]
+    assert sorted(e["file"] for e in errors) == ["a.py", "b.py"]
+
+
+def test_tool_version_config_and_rules_change_the_key(tmp_path):
+    enforcer, plugin, files = _setup(tmp_path)
+    enforcer._run_language(plugin, "python", files)
+
+    plugin.version = "2.0"
+    enforcer._run_language(plugin, "python", files)
+    (tmp_path / "setup.cfg").write_text("[flake8]\n")
+    enforcer._run_language(plugin, "python", files)
+    enforcer.config["disabled_rules"] = {"python": ["E1"]}
+    enforcer._run_language(plugin, "python", files)
+    assert len(plugin.linted) == 4
+
+
+def test_nested_config_files_change_the_key_of_files_below_them(tmp_path):
+    enforcer, plugin, files = _setup(tmp_path)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.py").write_text("good\n")
+    files.append(str(tmp_path / "sub" / "c.py"))
+    enforcer._run_language(plugin, "python", files)
+
+    (tmp_path / "sub" / "setup.cfg").write_text("[flake8]\n")
+    enforcer._run_language(plugin, "python", files)
+    (tmp_path / "sub" / "setup.cfg").write_text("[flake8]\nmax-line-length = 100\n")
+    enforcer._run_language(plugin, "python", files)
+    enforcer._run_language(plugin, "python", files)
+    assert plugin.linted == [["a.py", "b.py", "c.py"], ["c.py"], ["c.py"]]
+
+
+def test_failed_runs_and_disabled_cache_are_not_cached(tmp_path):
+    enforcer, plugin, files = _setup(tmp_path, config={"lint_cache": False})
+    enforcer._run_language(plugin, "python", files)
+    enforcer._run_language(plugin, "python", files)
+    assert len(plugin.linted) == 2
+
+    enforcer.lint_cache.enabled = True
+    failure = {"tool": "linter", "file": "unknown", "line": 0, "message": "timeout"}
+    plugin.lint = lambda files, *args, **kwargs: {"errors": [failure], "warnings": []}
+    enforcer._run_language(plugin, "python", files)
+    assert not os.path.isdir(enforcer.lint_cache.directory)
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    cache = LintCache(str(tmp_path / "cache"), max_size_mb=0)
+    cache.max_bytes = 150
+    issues = {"errors": [], "warnings": [{"message": "x" * 40}]}
+    for i, name in enumerate(["old.py", "mid.py", "new.py"]):
+        cache.put("scope", name, "digest", issues)
+        path = cache._path("scope", name, "digest")
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+
+    cache.prune()
+    assert cache.get("scope", "old.py", "digest") is None
+    assert cache.get("scope", "new.py", "digest") == issues
+
+
+class TypeCheckedPlugin(CachingPlugin):
+    """Runs a per-file linter and a type checker that only reports on its inputs."""
+
+    def __init__(self):
+        super().__init__()
+        self.checked = []
+
+    def _lint_files(self, files):
+        return CachingPlugin.lint(self, files, [])
+
+    def _type_check(self, files):
+        self.checked.append(sorted(os.path.basename(f) for f in files))
+        broken = "removed" in open(files[0]).read() if files else False
+        errors = [
+            {"tool": "mypy", "file": f, "line": 1, "message": "gone", "rule": "T1"}
+            for f in files
+            if broken and f.endswith("b.py")
+        ]
+        return {"errors": errors, "warnings": []}
+
+    def lint_steps(self, files, disabled_rules, tool_configs=None, root_path=None):
+        return [
+            ToolStep("linter", partial(self._lint_files, files)),
+            ToolStep("mypy", partial(self._type_check, files), whole_program=True),
+        ]
+
+
+def test_whole_program_steps_see_every_file_and_are_not_cached(tmp_path):
+    enforcer, _, files = _setup(tmp_path)
+    plugin = TypeCheckedPlugin()
+
+    enforcer._run_language(plugin, "python", files)
+    # * a.py is edited in a way that breaks b.py, which stays a cache hit
+    (tmp_path / "a.py").write_text("bad, removed\n")
+    errors, _, _ = enforcer._run_language(plugin, "python", files)
+
+    assert plugin.linted == [["a.py", "b.py"], ["a.py"]]
+    assert plugin.checked == [["a.py", "b.py"], ["a.py", "b.py"]]
+    assert sorted((e["tool"], e["file"]) for e in errors) == [
+        ("linter", "a.py"),
+        ("mypy", "b.py"),
+    ]
@@ -101,3 +101,38 @@ def test_main_with_ignore(capsys):
         assert "rule1" in config["disabled_rules"]["global"]
         captured = capsys.readouterr()
         assert "Output" in captured.out
+
+
+def test_main_with_fail_fast(capsys):
+    argv = ["agent-enforcer", "--fail-fast", "--max-issues", "5"]
+    with patch("sys.argv", argv), patch(
+        "enforcer.main.load_config", return_value={}
+    ), patch("enforcer.main.Enforcer") as mock_enforcer, patch(
+        "enforcer.main.os.getcwd", return_value="/root"
+    ):
+        mock_enforcer.return_value.run_checks.return_value = "Output"
+        main()
+        config = mock_enforcer.call_args[0][2]
+        assert config["fail_fast"] is True
+        assert config["max_issues"] == 5
+
+
+def test_main_with_profile(capsys):
+    argv = ["agent-enforcer", "--profile", "full"]
+    with patch("sys.argv", argv), patch(
+        "enforcer.main.load_config", return_value={}
+    ), patch("enforcer.main.Enforcer") as mock_enforcer, patch(
+        "enforcer.main.os.getcwd", return_value="/root"
+    ):
+        mock_enforcer.return_value.run_checks.return_value = "Output"
+        main()
+        assert mock_enforcer.call_args[0][2]["profile"] == "full"
+
+    argv = ["agent-enforcer", "--profile", "quick"]
+    with patch("sys.argv", argv), patch(
+        "enforcer.main.load_config", return_value={}
+    ), patch("enforcer.main.os.getcwd", return_value="/root"), pytest.raises(
+        SystemExit
+    ):
+        main()
+    assert "Unknown profile 'quick'" in capsys.readouterr().out
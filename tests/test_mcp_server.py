@@ -284,3 +284,36 @@ async def test_check_code_root_detection_error():
         result = await check_code()
         assert "error" in result
         assert "auto-detect" in result["error"]
+
+
+def test_concurrent_checks_do_not_overlap(tmp_path):
+    active = []
+    overlaps = []
+
+    class FakeEnforcer:
+        def __init__(self, root_path, **kwargs):
+            # * The real constructor changes the working directory
+            overlaps.append(bool(active))
+            active.append(root_path)
+
+        async def run_checks_structured_async(self, deadline=None):
+            await asyncio.sleep(0.05)
+            active.pop()
+            return {"errors": []}
+
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        root.mkdir()
+
+    async def scenario():
+        return await asyncio.gather(
+            *(check_code(root=str(root), profile="fast") for root in roots)
+        )
+
+    with patch("enforcer.mcp_server.Enforcer", FakeEnforcer), patch(
+        "enforcer.mcp_server.load_config", return_value={}
+    ):
+        results = asyncio.run(scenario())
+
+    assert results == [{"errors": []}, {"errors": []}]
+    assert overlaps == [False, False]
@@ -1,3 +1,4 @@
+import os
 import subprocess
 from unittest.mock import patch
 
@@ -74,22 +75,78 @@ def test_lint_timeout(tmp_path):
         assert "timed out" in result["errors"][0]["message"]
 
 
-def test_compile():
+def test_lint_steps_add_tsc_with_tsconfig(tmp_path):
     plugin = Plugin()
+    assert [s.tool for s in plugin.lint_steps([], [], root_path=str(tmp_path))] == [
+        "eslint"
+    ]
+
+    # * Type-aware eslint rules can only load type information with a tsconfig
+    (tmp_path / "web").mkdir()
+    (tmp_path / "web" / "tsconfig.json").write_text("{}")
+    app = str(tmp_path / "web" / "app.ts")
+    assert not plugin.lint_steps([], [], root_path=str(tmp_path))[0].whole_program
+    assert plugin.lint_steps([app], [], root_path=str(tmp_path))[0].whole_program
+
+    (tmp_path / "tsconfig.json").write_text("{}")
+    steps = plugin.lint_steps([], [], root_path=str(tmp_path))
+    assert [s.tool for s in steps] == ["eslint", "tsc"]
+    assert steps[0].whole_program
+
     with patch("enforcer.plugins.js_ts.run_command") as mock_run:
         mock_run.return_value = subprocess.CompletedProcess(
-            [], 1, stdout="error1\nerror2"
+            [],
+            2,
+            stdout="src/app.ts(3,7): error TS2322: Type 'string' is not assignable.\n",
         )
-        errors = plugin.compile(["file.js"])
-        assert errors == ["error1", "error2"]
+        result = steps[1].run()
+    assert result["errors"] == [
+        {
+            "tool": "tsc",
+            "file": "src/app.ts",
+            "line": 3,
+            "col": 7,
+            "message": "Type 'string' is not assignable.",
+            "rule": "TS2322",
+        }
+    ]
+
+
+def test_tsc(tmp_path):
+    plugin = Plugin()
+    stdout = (
+        f"{tmp_path / 'src' / 'app.ts'}(3,7): error TS2322: Type mismatch.\n"
+        "src/util.ts(1,1): warning TS6133: 'x' is declared but never used.\n"
+        "Found 2 errors.\n"
+    )
+    with patch("enforcer.plugins.js_ts.run_command") as mock_run:
+        mock_run.return_value = subprocess.CompletedProcess([], 2, stdout=stdout)
+        result = plugin._run_tsc(str(tmp_path))
+        mock_run.assert_called_once_with(
+            ["npx", "tsc", "--noEmit", "--pretty", "false"], return_output=True
+        )
+    assert [(e["file"], e["line"], e["rule"]) for e in result["errors"]] == [
+        (os.path.join("src", "app.ts"), 3, "TS2322")
+    ]
+    assert [(w["file"], w["rule"]) for w in result["warnings"]] == [
+        ("src/util.ts", "TS6133")
+    ]
 
 
-def test_compile_timeout():
+def test_tsc_timeout(tmp_path):
     plugin = Plugin()
     with patch("enforcer.plugins.js_ts.run_command") as mock_run:
-        mock_run.side_effect = subprocess.TimeoutExpired(["cmd"], 10)
-        errors = plugin.compile(["file.js"])
-        assert errors == ["TSC command timed out or was not found."]
+        mock_run.side_effect = subprocess.TimeoutExpired(["npx", "tsc"], 10)
+        result = plugin._run_tsc(str(tmp_path))
+    assert [(e["tool"], e["file"]) for e in result["errors"]] == [("tsc", "unknown")]
+    assert "timed out" in result["errors"][0]["message"]
+
+
+def test_compile_leaves_type_checking_to_the_tsc_step():
+    plugin = Plugin()
+    with patch("enforcer.plugins.js_ts.run_command") as mock_run:
+        assert plugin.compile(["file.js"]) == []
+        mock_run.assert_not_called()
 
 
 def test_test():
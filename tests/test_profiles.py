@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.profiles import get_profile, tool_enabled
+from enforcer.steps import ToolStep
+
+
+class ProfiledPlugin:
+    language = "python"
+
+    def __init__(self):
+        self.ran = []
+
+    def autofix_style(self, files, tool_configs=None):
+        return {"changed_count": 0}
+
+    def _step(self, tool):
+        def run():
+            self.ran.append(tool)
+            return {"errors": [], "warnings": []}
+
+        return ToolStep(tool, run)
+
+    def lint_steps(self, files, disabled_rules, tool_configs=None, root_path=None):
+        return [self._step(tool) for tool in ("pyright", "flake8", "mypy")]
+
+    def compile(self, files):
+        self.ran.append("compile")
+        return [{"tool": "build", "message": "Build failed."}]
+
+    def test(self, root_path):
+        self.ran.append("test")
+        return ["1 failed"]
+
+
+def test_config_profiles_extend_the_builtin_ones():
+    config = {
+        "profile": "fast",
+        "profiles": {
+            "fast": {"tools": {"python": ["flake8", "mypy"]}},
+            "types": {"tools": {"python": ["pyright"]}},
+        },
+    }
+    fast = get_profile(config)
+    assert tool_enabled(fast, "python", "mypy")
+    assert not tool_enabled(fast, "python", "pyright")
+    assert not tool_enabled(fast, "csharp", "dotnet-build")
+    assert tool_enabled(get_profile(config, "types"), "kotlin", "detekt")
+    assert get_profile({}) == {}
+
+    with pytest.raises(ValueError, match="fast, full, standard, types"):
+        get_profile(config, "slow")
+
+
+def _check(enforcer, plugin, batches):
+    enforcer.plugins = {"python": plugin}
+    enforcer.check_tools = MagicMock(return_value=True)
+    enforcer._iter_language_batches = MagicMock(return_value=iter(batches))
+    loggers = (MagicMock(), MagicMock())
+    with patch.object(enforcer, "setup_logging", return_value=loggers):
+        return enforcer.run_checks_structured()
+
+
+@pytest.mark.parametrize(
+    "profile, expected",
+    [
+        ("fast", ["flake8"]),
+        ("standard", ["pyright", "flake8", "mypy"]),
+        ("full", ["pyright", "flake8", "mypy", "compile", "test"]),
+    ],
+)
+def test_profile_selects_tools(tmp_path, profile, expected):
+    (tmp_path / "a.py").write_text("x = 1\n")
+    enforcer = Enforcer(str(tmp_path), config={"profile": profile})
+    plugin = ProfiledPlugin()
+
+    result = _check(enforcer, plugin, [("python", [str(tmp_path / "a.py")])])
+    assert plugin.ran == expected
+    if profile == "full":
+        errors = result["errors"]
+        assert [(e["tool"], e["file"], e["message"]) for e in errors] == [
+            ("build", "unknown", "Build failed."),
+            ("python-test", "unknown", "1 failed"),
+        ]
+
+
+def test_project_steps_run_once_after_all_batches(tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n")
+    enforcer = Enforcer(str(tmp_path), config={"profile": "full"})
+    plugin = ProfiledPlugin()
+    compiled = []
+    plugin.compile = lambda files: compiled.append(len(files)) or []
+
+    # * Like streamed discovery, which checks a language in several batches
+    batches = [("python", [str(tmp_path / name)]) for name in ("a.py", "b.py", "c.py")]
+    result = _check(enforcer, plugin, batches)
+
+    assert compiled == [3]
+    assert plugin.ran.count("flake8") == 3
+    assert plugin.ran[-1] == "test" and plugin.ran.count("test") == 1
+    assert [e["tool"] for e in result["errors"]] == ["python-test"]
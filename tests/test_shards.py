@@ -0,0 +1,70 @@
+import threading
+from unittest.mock import patch
+
+from enforcer.history import ToolHistory
+from enforcer.shards import (
+    DEFAULT_MIN_SHARD_FILES,
+    _arg_size,
+    plan_shards,
+    run_sharded,
+)
+from enforcer.utils import current_job_weight, job_weight
+
+
+def _files(count):
+    return [f"src/module_{i:03d}.py" for i in range(count)]
+
+
+def test_small_file_lists_are_not_sharded():
+    files = _files(DEFAULT_MIN_SHARD_FILES)
+    assert plan_shards("black", ["black"], files, workers=8) == [files]
+    assert plan_shards("black", ["black"], [], workers=8) == [[]]
+
+
+def test_shards_spread_over_workers_in_order():
+    files = _files(400)
+    shards = plan_shards("black", ["black"], files, workers=4)
+    assert [len(shard) for shard in shards] == [100, 100, 100, 100]
+    assert [f for shard in shards for f in shard] == files
+
+
+def test_shards_respect_the_argv_budget():
+    files = _files(40)
+    budget = 10 * _arg_size(files[0]) + _arg_size("black")
+    with patch("enforcer.shards.argv_budget", return_value=budget):
+        shards = plan_shards("black", ["black"], files, workers=1)
+    assert [len(shard) for shard in shards] == [10, 10, 10, 10]
+
+
+def test_history_tunes_the_minimum_shard_size(tmp_path):
+    history = ToolHistory(str(tmp_path / "history.json"))
+    files = _files(100)
+    assert len(plan_shards("flake8", [], files, history, workers=10)) == 2
+
+    # * At 0.1s per file a 2s shard holds 20 files
+    history.record("flake8", 10, 1.0)
+    assert len(plan_shards("flake8", [], files, history, workers=10)) == 5
+
+    history.save()
+    reloaded = ToolHistory(str(tmp_path / "history.json"))
+    assert reloaded.cost("flake8") == 0.1
+    assert reloaded.cost("black") is None
+
+
+def test_run_sharded_merges_results_and_keeps_job_weight(tmp_path):
+    files = _files(4)
+    weights = []
+    lock = threading.Lock()
+
+    def run(shard):
+        with lock:
+            weights.append(current_job_weight())
+        return {"errors": [f"{f}:E" for f in shard], "changed_count": len(shard)}
+
+    with patch("enforcer.shards.plan_shards", return_value=[files[:2], files[2:]]):
+        with job_weight(2, 256):
+            result = run_sharded("flake8", [], files, run, str(tmp_path))
+
+    assert result == {"errors": [f"{f}:E" for f in files], "changed_count": 4}
+    assert weights == [(2, 256), (2, 256)]
+    assert ToolHistory.for_root(str(tmp_path)).cost("flake8") is not None
@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from enforcer.plugins.kotlin import Plugin as KotlinPlugin
+from enforcer.plugins.python import Plugin as PythonPlugin
+from enforcer.steps import ToolStep, run_steps
+
+
+def _issues(tool):
+    return {"errors": [{"tool": tool}], "warnings": [{"tool": tool}]}
+
+
+def test_run_steps_merges_in_declaration_order():
+    steps = [ToolStep(tool, lambda tool=tool: _issues(tool)) for tool in "abc"]
+    for workers in (1, None):
+        result = run_steps(steps, max_workers=workers)
+        assert [e["tool"] for e in result["errors"]] == ["a", "b", "c"]
+        assert [w["tool"] for w in result["warnings"]] == ["a", "b", "c"]
+
+
+def test_run_steps_runs_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def step(tool):
+        # * Only passes if all three steps are running at the same time
+        barrier.wait()
+        return _issues(tool)
+
+    steps = [ToolStep(tool, lambda tool=tool: step(tool)) for tool in "abc"]
+    result = run_steps(steps, max_workers=None)
+    assert len(result["errors"]) == 3
+
+
+def test_run_steps_lets_every_step_finish_before_raising():
+    finished = []
+
+    def boom():
+        raise RuntimeError("boom")
+
+    def slow():
+        finished.append("slow")
+        return _issues("slow")
+
+    with pytest.raises(RuntimeError):
+        run_steps([ToolStep("boom", boom), ToolStep("slow", slow)], max_workers=2)
+    assert finished == ["slow"]
+
+
+def test_plugins_declare_lint_steps():
+    python_steps = PythonPlugin().lint_steps(["a.py"], [], {}, root_path=None)
+    assert [step.tool for step in python_steps] == ["pyright", "flake8", "mypy"]
+
+    kotlin_steps = KotlinPlugin().lint_steps(["a.kt"], [], {}, root_path=None)
+    assert [step.tool for step in kotlin_steps] == ["ktlint", "detekt"]
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.syntax import check_file, check_files
+
+
+class GatedPlugin:
+    language = "python"
+    syntax_dialect = "python"
+
+    def __init__(self):
+        self.fixed = []
+        self.linted = []
+
+    def autofix_style(self, files, tool_configs=None):
+        self.fixed.append(sorted(os.path.basename(f) for f in files))
+        return {"changed_count": 0}
+
+    def lint(self, files, disabled_rules, tool_configs=None, root_path=None):
+        self.linted.append(sorted(os.path.basename(f) for f in files))
+        return {"errors": [], "warnings": []}
+
+
+def _check(tmp_path, name, source, dialect):
+    path = tmp_path / name
+    path.write_text(source)
+    return check_file(dialect, str(path))
+
+
+def test_python_syntax_error_is_precise(tmp_path):
+    issue = _check(tmp_path, "a.py", "x = 1\ndef f(:\n    pass\n", "python")
+    assert (issue["tool"], issue["line"], issue["rule"]) == ("syntax", 2, "E999")
+    assert issue["col"] > 0
+    assert _check(tmp_path, "b.py", "x = '\\d'\n", "python") is None
+    assert _check(tmp_path, "c.py", "return 1\n", "python")["line"] == 1
+
+
+@pytest.mark.parametrize(
+    "name, source, dialect, expected",
+    [
+        ("a.ts", "function f() {\n  if (x) {\n}\n", "javascript", (1, 14)),
+        ("b.ts", "const a = [1, 2);\n", "javascript", (1, 16)),
+        ("c.js", "let s = 'abc;\nf();\n", "javascript", (1, 9)),
+        ("d.kt", "fun main() {\n  /* a /* b */ c\n}\n", "kotlin", (2, 3)),
+        ("e.cs", "class A { void M() { } } }\n", "csharp", (1, 26)),
+        ("f.js", "if (a < b) {\n  f(a <= b;\n}\n", "javascript", (3, 1)),
+    ],
+)
+def test_brace_languages_report_first_problem(
+    tmp_path, name, source, dialect, expected
+):
+    issue = _check(tmp_path, name, source, dialect)
+    assert (issue["line"], issue["col"]) == expected
+
+
+@pytest.mark.parametrize(
+    "name, source, dialect",
+    [
+        ("a.js", "const r = /[(]/;\nconst s = `${a}{`;\n", "javascript"),
+        ("b.ts", "return x / 2 + (y) / (z);\n// } (\n", "javascript"),
+        ("c.js", "function f() { return /}/.test(s); }\n", "javascript"),
+        ("d.jsx", "const a = <p>Don't {</p>;\n", "javascript"),
+        ("e.kt", 'val s = "${map["{"]}"\nval t = \'{\'\n', "kotlin"),
+        ("f.kt", "fun `handles (paren`() {}\n", "kotlin"),
+        ("g.cs", 'var s = @"C:\\{";\n#if DEBUG\n{\n#endif\n', "csharp"),
+        ("h.cs", 'string s = """\n  say "hi" {\n  """;\n', "csharp"),
+        ("i.js", "function A() {\n  return <p>Don't panic</p>;\n}\n", "javascript"),
+        ("j.js", "const A = () => <a href='x'>{b}'</a>;\n", "javascript"),
+        ("k.js", "if (x) /[(]/.test(y);\n", "javascript"),
+        ("l.js", "function f() {}\n/[{]/.test(y);\n", "javascript"),
+    ],
+)
+def test_brace_scanner_never_guesses(tmp_path, name, source, dialect):
+    assert _check(tmp_path, name, source, dialect) is None
+
+
+def test_large_batches_use_the_process_pool(tmp_path):
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"m{i}.py"
+        path.write_text("def f(:\n" if i % 10 == 0 else "x = 1\n")
+        paths.append(str(path))
+    errors = check_files("python", paths, pool_min_files=0)
+    assert sorted(errors) == [paths[0], paths[10], paths[20], paths[30]]
+    assert errors == check_files("python", paths)
+
+
+def test_broken_files_are_excluded_from_tools(tmp_path):
+    (tmp_path / "good.py").write_text("x = 1\n")
+    (tmp_path / "bad.py").write_text("if True\n    pass\n")
+    files = [str(tmp_path / "bad.py"), str(tmp_path / "good.py")]
+    enforcer = Enforcer(str(tmp_path))
+    plugin = GatedPlugin()
+
+    errors, warnings, _ = enforcer._run_language(plugin, "python", files)
+    assert plugin.fixed == [["good.py"]]
+    assert plugin.linted == [["good.py"]]
+    assert [(e["tool"], e["file"], e["line"]) for e in errors] == [
+        ("syntax", "bad.py", 1)
+    ]
+
+    enforcer.config["syntax_gate"] = False
+    enforcer._run_language(plugin, "python", files)
+    assert plugin.linted[-1] == ["bad.py", "good.py"]
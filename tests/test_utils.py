@@ -94,3 +94,107 @@ def test_run_command_called_process_error():
         mock_popen.return_value = mock_process
         with pytest.raises(subprocess.CalledProcessError):
             run_command(["cmd"], check=True)
+
+
+def test_run_command_acquires_weighted_job_slot():
+    from contextlib import contextmanager
+
+    from enforcer import utils
+
+    slots = []
+
+    class RecordingScheduler:
+        @contextmanager
+        def slot(self, cores=1, memory_mb=0):
+            slots.append((cores, memory_mb))
+            yield
+
+    previous = utils._job_scheduler
+    utils.set_job_scheduler(RecordingScheduler())
+    try:
+        with patch("subprocess.Popen") as mock_popen:
+            mock_process = Mock()
+            mock_process.communicate.return_value = ("out", "err")
+            mock_process.returncode = 0
+            mock_popen.return_value = mock_process
+            run_command(["echo", "test"])
+            with utils.job_weight(cores=2, memory_mb=512):
+                run_command(["echo", "test"])
+    finally:
+        utils.set_job_scheduler(previous)
+
+    assert slots == [(1, 0), (2, 512)]
+
+
+def test_cancel_terminates_running_command():
+    import sys
+    import threading
+    import time
+
+    from enforcer.utils import CancelToken, CommandCancelled, cancel_scope
+
+    token = CancelToken()
+    outcome = {}
+
+    def run():
+        with cancel_scope(token):
+            try:
+                run_command([sys.executable, "-c", "import time; time.sleep(30)"])
+            except CommandCancelled:
+                outcome["cancelled"] = True
+
+    thread = threading.Thread(target=run)
+    started = time.monotonic()
+    thread.start()
+    while not token._processes and time.monotonic() - started < 10:
+        time.sleep(0.01)
+    token.cancel("test")
+    thread.join(10)
+
+    assert outcome == {"cancelled": True}
+    assert time.monotonic() - started < 10
+
+    # * Commands started after cancellation never spawn a process
+    with cancel_scope(token), patch("subprocess.Popen") as mock_popen:
+        with pytest.raises(CommandCancelled):
+            run_command(["echo", "test"])
+        mock_popen.assert_not_called()
+
+
+def test_run_command_async():
+    import asyncio
+    import sys
+
+    from enforcer.utils import run_command_async
+
+    async def scenario():
+        ok = await run_command_async(
+            [sys.executable, "-c", "print('a', end='\\r\\n')"], return_output=True
+        )
+        assert (ok.returncode, ok.stdout) == (0, "a\n")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            await run_command_async([sys.executable, "-c", "exit(3)"], check=True)
+        with pytest.raises(subprocess.TimeoutExpired):
+            await run_command_async(
+                [sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2
+            )
+        with pytest.raises(FileNotFoundError):
+            await run_command_async(["definitely-not-a-command-xyz"])
+
+    asyncio.run(scenario())
+
+
+def test_run_command_uses_the_thread_timeout():
+    import sys
+
+    from enforcer.utils import bind_thread_context, command_timeout
+
+    sleep = [sys.executable, "-c", "import time; time.sleep(30)"]
+    with command_timeout(0.2):
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_command(sleep)
+        run = bind_thread_context(run_command)
+    with pytest.raises(subprocess.TimeoutExpired):
+        run(sleep)
+    assert run_command([sys.executable, "-c", "pass"]).returncode == 0
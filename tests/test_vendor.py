@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from enforcer.core import Enforcer
+from enforcer.vendor import VendorDetector
+
+
+def _write(path, text="x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    _write(root / "main.py")
+    _write(root / "web" / "node_modules" / "left-pad" / "index.js")
+    _write(root / "env" / "pyvenv.cfg", "home = /usr/bin\n")
+    _write(root / "env" / "lib" / "site.py")
+    _write(root / "App" / "App.csproj", "<Project />\n")
+    _write(root / "App" / "Program.cs", "class Program {}\n")
+    _write(root / "App" / "obj" / "Generated.cs", "class Generated {}\n")
+    # * A "bin" directory without a project file next to it is source
+    _write(root / "tools" / "bin" / "release.py")
+    return root
+
+
+def test_detector_reasons(tree):
+    detector = VendorDetector()
+    assert detector.reason(str(tree / "web"), "node_modules") == "well-known name"
+    assert detector.reason(str(tree), "env") == "contains pyvenv.cfg"
+    assert detector.reason(str(tree / "App"), "obj") == "build output of App.csproj"
+    assert detector.reason(str(tree / "tools"), "bin") is None
+    assert detector.reason(str(tree), "tools") is None
+
+
+def test_from_config_overrides_and_disables():
+    detector = VendorDetector.from_config(
+        {"vendor_patterns": {"directories": ["third_party"], "markers": []}}
+    )
+    assert detector.reason("src", "third_party") == "well-known name"
+    assert detector.reason("src", "node_modules") is None
+
+    detector = VendorDetector.from_config({"check_vendor": True})
+    assert detector.reason("src", "node_modules") is None
+
+
+@pytest.mark.parametrize("mode", ["walk", "scandir"])
+def test_scan_files_prunes_and_reports_vendor_directories(tree, mode):
+    enforcer = Enforcer(str(tree), config={"discovery_mode": mode})
+    files_by_lang, messages = enforcer.scan_files()
+
+    scanned = {
+        os.path.relpath(f, tree) for files in files_by_lang.values() for f in files
+    }
+    assert scanned == {
+        "main.py",
+        os.path.join("App", "Program.cs"),
+        os.path.join("tools", "bin", "release.py"),
+    }
+    assert messages == [
+        "Skipped vendored directory: "
+        f"{os.path.join('App', 'obj')} (build output of App.csproj)",
+        "Skipped vendored directory: env (contains pyvenv.cfg)",
+        "Skipped vendored directory: "
+        f"{os.path.join('web', 'node_modules')} (well-known name)",
+    ]
+
+
+def test_scan_files_check_vendor_includes_everything(tree):
+    enforcer = Enforcer(str(tree), config={"check_vendor": True})
+    files_by_lang, messages = enforcer.scan_files()
+
+    assert str(tree / "env" / "lib" / "site.py") in files_by_lang["python"]
+    assert messages == []